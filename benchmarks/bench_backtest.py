@@ -0,0 +1,49 @@
+"""Benchmark akurasi & kecepatan backtest rolling-origin untuk beberapa konfigurasi SARIMA.
+
+Contoh: python benchmarks/bench_backtest.py --data sales_data_data.csv --folds 24 --json hasil.json
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from revflux.backtest import backtest  # noqa: E402
+from revflux.preprocessing import preprocess_period_column  # noqa: E402
+
+CONFIGS = {
+    "default (1,1,1)(1,1,1,12)": {"order": (1, 1, 1), "seasonal_order": (1, 1, 1, 12)},
+    "airline (0,1,1)(0,1,1,12)": {"order": (0, 1, 1), "seasonal_order": (0, 1, 1, 12)},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(ROOT / "sales_data_data.csv"))
+    parser.add_argument("--folds", type=int, default=24)
+    parser.add_argument("--horizon", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", help="Simpan ringkasan semua konfigurasi ke file JSON.")
+    args = parser.parse_args()
+
+    y = preprocess_period_column(pd.read_csv(args.data))["Pemasukan"].to_numpy()
+    results = {}
+    for name, config in CONFIGS.items():
+        for warm_start in (False, True):
+            report = backtest(y, folds=args.folds, horizon=args.horizon, max_workers=args.workers,
+                              warm_start=warm_start, **config)
+            label = f"{name} {'warm' if warm_start else 'cold'}"
+            results[label] = report.summary()
+            s = results[label]
+            print(f"{label:<36} MAPE {s['mape_mean']:6.2f}%  wall {s['wall_time']:6.2f}s  "
+                  f"{s['fits_per_sec']:6.2f} fit/s  konvergen {s['converged_ratio']:.0%}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
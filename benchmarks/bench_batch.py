@@ -0,0 +1,47 @@
+"""Skalabilitas `forecast_many` terhadap jumlah worker pada deret bulanan sintetis.
+
+Contoh: python benchmarks/bench_batch.py --series 200 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from revflux.batch import forecast_many  # noqa: E402
+
+
+def make_table(n_series, n_months=120, seed=0):
+    rng = np.random.default_rng(seed)
+    periods = pd.date_range("2015-01-01", periods=n_months, freq="MS")
+    season = 1 + 0.2 * np.sin(2 * np.pi * np.arange(n_months) / 12)
+    frames = []
+    for i in range(n_series):
+        level = rng.uniform(5e7, 2e8) * np.cumprod(1 + rng.normal(0.003, 0.02, n_months))
+        frames.append(pd.DataFrame({"series": f"toko_{i:04d}", "Periode": periods,
+                                    "Pemasukan": level * season * rng.lognormal(0, 0.05, n_months)}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--series", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count()}))
+    args = parser.parse_args()
+
+    table = make_table(args.series)
+    baseline = None
+    print(f"{'workers':>8} {'wall_s':>8} {'series/s':>9} {'speedup':>8} {'failures':>9}")
+    for workers in args.workers:
+        result = forecast_many(table, max_workers=workers)
+        baseline = baseline or result.wall_time
+        print(f"{workers:>8} {result.wall_time:>8.2f} {args.series / result.wall_time:>9.1f} "
+              f"{baseline / result.wall_time:>7.2f}x {len(result.failures):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Throughput laporan massal: dek/detik terhadap jumlah worker untuk banyak dataset salinan.
+
+Satu model di-fit sekali lalu disalin ke setiap dataset sintetis di direktori
+sementara, sehingga yang diukur hanya forecast, render grafik, dan pembuatan dek.
+Tanpa Chrome/kaleido grafik diganti placeholder Pillow (lihat bench_export.py).
+
+Contoh: python benchmarks/bench_bulk_report.py --datasets 20 --workers 1 3 6
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from revflux.bulk_report import generate_reports  # noqa: E402
+from revflux.modeling import fit_sarimax, save_model  # noqa: E402
+from revflux.preprocessing import preprocess_period_column  # noqa: E402
+from revflux.report import ChartRenderer  # noqa: E402
+from revflux.storage import DatasetStore  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(ROOT / "sales_data_data.csv"))
+    parser.add_argument("--datasets", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 3, 6])
+    parser.add_argument("--zip", action="store_true", help="Tulis satu arsip .zip alih-alih file .pptx terpisah.")
+    args = parser.parse_args()
+
+    data = preprocess_period_column(pd.read_csv(args.data))
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DatasetStore(tmp)
+        names = [f"toko_{i:03d}" for i in range(args.datasets)]
+        for name in names:
+            store.save(name, data)
+        save_model(fit_sarimax(data["Pemasukan"].to_numpy()), store.model_path(names[0]))
+        for name in names[1:]:
+            shutil.copy(store.model_path(names[0]), store.model_path(name))
+
+        print(f"{'workers':>8} {'wall_s':>8} {'dek/s':>7} {'render_s':>9} {'MB':>7} {'gagal':>6}")
+        for workers in args.workers:
+            # Renderer baru per putaran supaya cache PNG dari putaran sebelumnya tidak ikut terukur.
+            output = Path(tmp) / (f"laporan_{workers}.zip" if args.zip else f"laporan_{workers}")
+            result = generate_reports(store, names, output, max_workers=workers, renderer=ChartRenderer())
+            s = result.summary()
+            print(f"{workers:>8} {s['wall_time']:>8.2f} {s['reports_per_sec']:>7.2f} "
+                  f"{s['render_seconds_total']:>9.2f} {s['size_bytes_total'] / 1e6:>7.1f} {s['failures']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Ukuran payload & waktu bangun grafik garis terhadap panjang histori, dengan dan tanpa downsampling.
+
+Contoh: python benchmarks/bench_chart_payload.py --rows 10000 100000 1000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from revflux.charts import MAX_HISTORY_POINTS, line_chart, line_chart_base  # noqa: E402
+
+
+def make_history(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    periods = pd.date_range("2000-01-01", periods=n_rows, freq="min")
+    return pd.DataFrame({"Periode": periods, "Pemasukan": 1e6 * np.exp(np.cumsum(rng.normal(0, 0.001, n_rows)))})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--max-points", type=int, default=MAX_HISTORY_POINTS)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'mode':>9} {'base_ms':>8} {'rerun_ms':>9} {'payload_KB':>11}")
+    for n_rows in args.rows:
+        hist = make_history(n_rows)
+        forecast = pd.DataFrame({"Periode": pd.date_range(hist["Periode"].iloc[-1], periods=24, freq="min"),
+                                 "Pemasukan": np.full(24, hist["Pemasukan"].iloc[-1])})
+        for label, max_points in (("penuh", n_rows), ("lttb", args.max_points)):
+            start = time.perf_counter()
+            base = line_chart_base(hist, "benchmark", max_points=max_points)
+            built = time.perf_counter()
+            fig = line_chart(hist, forecast, "benchmark", base=base)
+            rerun = time.perf_counter()
+            payload = len(fig.to_json())
+            print(f"{n_rows:>10} {label:>9} {(built - start) * 1000:>8.1f} {(rerun - built) * 1000:>9.1f} {payload / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
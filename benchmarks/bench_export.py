@@ -0,0 +1,50 @@
+"""Latensi ekspor PowerPoint: ekspor pertama (render dingin) vs ekspor ulang (PNG dari cache).
+
+Tanpa Chrome/kaleido yang berfungsi, grafik diganti placeholder Pillow dan angka
+render dingin tidak mewakili produksi; jalankan di mesin dengan Chrome terpasang.
+
+Contoh: python benchmarks/bench_export.py --repeat 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from revflux.report import ChartRenderer, build_report_pptx  # noqa: E402
+
+
+def build_charts(data):
+    import plotly.express as px
+
+    forecast = data.tail(12).assign(Periode=lambda d: d["Periode"] + pd.DateOffset(years=1))
+    return [
+        ("Grafik Aktual vs Prediksi", px.line(data, x="Periode", y="Pemasukan", markers=True)),
+        ("Grafik Rentang Keyakinan Prediksi", px.line(forecast, x="Periode", y="Pemasukan")),
+        ("Grafik Perbandingan Bulanan", px.bar(data.tail(12), x="Periode", y="Pemasukan")),
+    ], forecast
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(ROOT / "sales_data_data.csv"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.data, parse_dates=["Periode"])
+    charts, forecast = build_charts(data)
+    renderer = ChartRenderer()
+    for i in range(args.repeat):
+        start = time.perf_counter()
+        images = renderer.render_many(charts)
+        deck = build_report_pptx("benchmark", data, forecast, charts, images)
+        label = "dingin" if i == 0 else "ulang"
+        print(f"ekspor {i + 1} ({label:<6}) {(time.perf_counter() - start) * 1000:8.1f} ms  {len(deck) / 1024:7.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
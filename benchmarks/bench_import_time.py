@@ -0,0 +1,63 @@
+"""Laporan waktu impor (`python -X importtime`) untuk app Streamlit, CLI, dan dependensi berat.
+
+Target "index.py" menjalankan hanya pernyataan import tingkat atas di index.py,
+yaitu biaya yang dibayar setiap cold start sebelum halaman dirender.
+
+Contoh: python benchmarks/bench_import_time.py --top 10
+"""
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_TARGETS = ["index.py", "revflux.cli", "revflux.modeling", "revflux.storage",
+                   "statsmodels.api", "plotly.express", "pptx", "streamlit"]
+
+
+def index_import_source():
+    tree = ast.parse((ROOT / "index.py").read_text(encoding="utf-8"))
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in imports)
+
+
+def measure(target):
+    """Jalankan import di interpreter baru; kembalikan list (self_us, cumulative_us, nama_modul)."""
+    source = index_import_source() if target == "index.py" else f"import {target}"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", source],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--top", type=int, default=5, help="Tampilkan N modul dengan waktu kumulatif terbesar per target.")
+    args = parser.parse_args()
+
+    for target in args.targets:
+        try:
+            rows = measure(target)
+        except RuntimeError as e:
+            print(f"{target:<20} gagal diimpor: {e}")
+            continue
+        # Modul tingkat atas tidak diawali spasi pada kolom nama.
+        total_us = sum(cumulative for _, cumulative, name in rows if not name.startswith("  "))
+        heavy = {"statsmodels", "plotly", "pptx", "streamlit"}
+        loaded = sorted({name.strip().split(".")[0] for _, _, name in rows} & heavy)
+        print(f"{target:<20} {total_us / 1000:>9.1f} ms  {len(rows):>5} modul  berat: {', '.join(loaded) or '-'}")
+        for _, cumulative, name in sorted(rows, key=lambda r: -r[1])[:args.top]:
+            print(f"{'':<22}{cumulative / 1000:>9.1f} ms  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
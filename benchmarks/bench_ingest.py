@@ -0,0 +1,71 @@
+"""Ingest upload besar: baca penuh (`pd.read_csv` + normalisasi) vs streaming per potongan.
+
+CSV transaksi harian sintetis (plus kolom tambahan ala ekspor POS) dibuat di
+direktori sementara. Puncak alokasi diukur dengan tracemalloc untuk kedua cara.
+
+Contoh: python benchmarks/bench_ingest.py --rows 10000000 --chunksize 1000000 --freq W --aggregate
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from revflux.ingest import LATEST, SUM, stream_upload  # noqa: E402
+from revflux.preprocessing import aggregate_periods, latest_per_period, preprocess_period_column  # noqa: E402
+
+
+def write_transactions(path, n_rows, seed=0, block=1_000_000):
+    """Tulis transaksi acak (tanggal harian 2015-2024) ke CSV per blok agar pembuatan data juga hemat memori."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2015-01-01", "2024-12-31", freq="D").strftime("%Y-%m-%d").to_numpy()
+    for start in range(0, n_rows, block):
+        n = min(block, n_rows - start)
+        pd.DataFrame({
+            "Periode": days[rng.integers(0, len(days), n)],
+            "Kasir": rng.integers(1, 40, n),
+            "Keterangan": "penjualan tunai",
+            "Pemasukan": rng.lognormal(11, 1, n).round(),
+        }).to_csv(path, mode="a", header=start == 0, index=False)
+
+
+def full_read(path, freq, combine):
+    reduce = aggregate_periods if combine == SUM else latest_per_period
+    return reduce(preprocess_period_column(pd.read_csv(path), freq))
+
+
+def measure(label, fn, rows):
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<10} {elapsed:>8.2f} {rows / elapsed:>12,.0f} {peak / 2**20:>10,.0f} {len(data):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    parser.add_argument("--freq", choices=("M", "W"), default="M")
+    parser.add_argument("--aggregate", action="store_true", help="Jumlahkan per periode (bawaan: nilai terakhir).")
+    args = parser.parse_args()
+    combine = SUM if args.aggregate else LATEST
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "transaksi.csv"
+        write_transactions(path, args.rows)
+        print(f"{'cara':<10} {'detik':>8} {'baris/detik':>12} {'puncak_MB':>10} {'periode':>8}")
+        measure("penuh", lambda: full_read(path, args.freq, combine), args.rows)
+        measure("streaming", lambda: stream_upload(path, args.freq, combine, chunksize=args.chunksize).data, args.rows)
+
+
+if __name__ == "__main__":
+    main()
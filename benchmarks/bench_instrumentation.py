@@ -0,0 +1,41 @@
+"""Biaya `stage()` per panggilan: tanpa trace aktif, dengan trace, dan dengan tracemalloc.
+
+Angka ini yang menentukan apakah sebuah tahap boleh dibungkus di jalur panas
+(mis. per potongan ingest) atau hanya di tingkat fungsi besar.
+
+Contoh: python benchmarks/bench_instrumentation.py --calls 200000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from revflux.instrumentation import stage, start_trace  # noqa: E402
+
+
+def per_call(calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        with stage("bench"):
+            pass
+    return (time.perf_counter() - started) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'mode':<18} {'us/panggilan':>13}")
+    print(f"{'tanpa trace':<18} {per_call(args.calls) * 1e6:>13.2f}")
+    for label, track in (("trace", False), ("trace+tracemalloc", True)):
+        with start_trace("bench", track_allocations=track) as trace:
+            cost = per_call(args.calls)
+        assert trace.stages["bench"].calls == args.calls
+        print(f"{label:<18} {cost * 1e6:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Bandingkan pickle `SARIMAXResults` penuh vs artefak ringkas `.npz`: ukuran file dan waktu muat.
+
+Waktu muat pickle diukur setelah statsmodels sudah terimpor (kondisi terbaik untuk
+pickle); artefak ringkas sama sekali tidak membutuhkan statsmodels.
+
+Contoh: python benchmarks/bench_model_artifacts.py --lengths 60 168 1000 5000
+"""
+import argparse
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from revflux.modeling import fit_sarimax, forecast_frame, load_model, save_model  # noqa: E402
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[60, 168, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'nobs':>6} {'pkl_kb':>9} {'npz_kb':>8} {'pkl_load_ms':>12} {'npz_load_ms':>12} {'max_rel_diff':>13}")
+    with tempfile.TemporaryDirectory() as tmp, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for nobs in args.lengths:
+            t = np.arange(nobs)
+            y = 1e8 * np.exp(0.002 * t) * (1 + 0.2 * np.sin(2 * np.pi * t / 12)) * rng.lognormal(0, 0.05, nobs)
+            model = fit_sarimax(y)
+            pkl_path, npz_path = Path(tmp) / "m.pkl", Path(tmp) / "m.npz"
+            save_model(model, pkl_path)
+            save_model(model, npz_path)
+            pkl_s = best_of(lambda: load_model(pkl_path), args.repeat)
+            npz_s = best_of(lambda: load_model(npz_path), args.repeat)
+            full, compact = forecast_frame(model, 24), forecast_frame(load_model(npz_path), 24)
+            finite = np.isfinite(full.to_numpy())
+            diff = float(np.max(np.abs(full.to_numpy() - compact.to_numpy())[finite] / np.abs(full.to_numpy()[finite])))
+            print(f"{nobs:>6} {pkl_path.stat().st_size / 1024:>9.1f} {npz_path.stat().st_size / 1024:>8.1f} "
+                  f"{pkl_s * 1000:>12.2f} {npz_s * 1000:>12.2f} {diff:>13.2e}")
+
+
+if __name__ == "__main__":
+    main()
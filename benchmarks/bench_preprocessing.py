@@ -0,0 +1,57 @@
+"""Benchmark `preprocess_period_column` pada kolom periode campuran format.
+
+Contoh: python benchmarks/bench_preprocessing.py --rows 10000 1000000 10000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from revflux.preprocessing import preprocess_period_column  # noqa: E402
+
+
+def make_frame(n_rows, seed=0):
+    """Data harian 10 tahun: ~90% ISO, sisanya dd/mm/YYYY, YYYY-MM, dan nilai rusak."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2015-01-01", periods=3650, freq="D")
+    pool = np.concatenate([
+        days.strftime("%Y-%m-%d").to_numpy(dtype=object),
+        days.strftime("%d/%m/%Y").to_numpy(dtype=object),
+        days.strftime("%Y-%m").unique().to_numpy(dtype=object),
+        np.array(["bukan tanggal"], dtype=object),
+    ])
+    weights = np.concatenate([
+        np.full(3650, 0.90 / 3650),
+        np.full(3650, 0.08 / 3650),
+        np.full(len(pool) - 7301, 0.0199 / (len(pool) - 7301)),
+        [0.0001],
+    ])
+    idx = rng.choice(len(pool), size=n_rows, p=weights / weights.sum())
+    return pd.DataFrame({"Periode": pool[idx], "Pemasukan": rng.uniform(1e5, 1e7, n_rows)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'best_s':>9} {'rows/s':>14}  formats")
+    for n_rows in args.rows:
+        df = make_frame(n_rows)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = preprocess_period_column(df)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{n_rows:>12,} {best:>9.3f} {n_rows / best:>14,.0f}  {result.attrs['period_formats']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Load test layanan forecast (`python -m revflux serve`): latensi p50/p99 dan request/detik.
+
+Satu model di-fit sekali lalu disalin ke setiap dataset sintetis di direktori
+sementara. Server dijalankan sebagai proses terpisah; klien asyncio membuka
+`--concurrency` koneksi keep-alive dan meminta `GET /forecast` dengan dataset
+dan horizon acak (sebagian melewati horizon precomputed, sehingga ikut lewat
+micro-batching). Konfigurasi `tanpa cache` (`--cache-size 0`) memuat model dan
+dataset di setiap request, setara dengan membuka halaman Streamlit.
+
+Contoh: python benchmarks/bench_serving.py --datasets 20 --concurrency 1 16 64 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from revflux.modeling import fit_sarimax, save_model  # noqa: E402
+from revflux.preprocessing import preprocess_period_column  # noqa: E402
+from revflux.storage import DatasetStore  # noqa: E402
+
+HOST = "127.0.0.1"
+CONFIGS = {"tanpa cache": ["--cache-size", "0"], "cache": []}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+async def get(reader, writer, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode())
+    await writer.drain()
+    status = (await reader.readline()).split()[1]
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    return int(status), await reader.readexactly(length)
+
+
+async def client(port, paths, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            status, _ = await get(reader, writer, random.choice(paths))
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def load_test(port, paths, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, paths, deadline, latencies, errors) for _ in range(concurrency)))
+    return np.array(latencies), len(errors), time.perf_counter() - started
+
+
+async def health(port):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        return json.loads((await get(reader, writer, "/health"))[1])
+    finally:
+        writer.close()
+
+
+def wait_until_up(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server berhenti sebelum siap (uvicorn terpasang?)")
+        try:
+            return asyncio.run(health(port))
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server tidak merespons")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(ROOT / "sales_data_data.csv"))
+    parser.add_argument("--datasets", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--duration", type=float, default=10.0, help="Detik per putaran.")
+    parser.add_argument("--max-steps", type=int, default=36, help="Horizon acak 1..N (precomputed: 24).")
+    args = parser.parse_args()
+
+    data = preprocess_period_column(pd.read_csv(args.data))
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DatasetStore(tmp)
+        names = [f"toko_{i:03d}" for i in range(args.datasets)]
+        for name in names:
+            store.save(name, data)
+        save_model(fit_sarimax(data["Pemasukan"].to_numpy()), store.model_path(names[0]))
+        for name in names[1:]:
+            shutil.copy(store.model_path(names[0]), store.model_path(name))
+        paths = [f"/forecast?dataset={name}&steps={steps}" for name in names for steps in range(1, args.max_steps + 1)]
+
+        print(f"{'konfigurasi':<12} {'klien':>6} {'req/s':>9} {'p50_ms':>8} {'p99_ms':>8} {'error':>6} "
+              f"{'muat':>6} {'batch':>6}")
+        for label, options in CONFIGS.items():
+            port = free_port()
+            server = subprocess.Popen([sys.executable, "-m", "revflux", "--data-dir", tmp, "serve",
+                                       "--port", str(port), *options], cwd=ROOT)
+            try:
+                wait_until_up(port, server)
+                for concurrency in args.concurrency:
+                    before = asyncio.run(health(port))
+                    latencies, errors, wall = asyncio.run(load_test(port, paths, concurrency, args.duration))
+                    after = asyncio.run(health(port))
+                    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+                    print(f"{label:<12} {concurrency:>6} {len(latencies) / wall:>9,.0f} {p50:>8.2f} {p99:>8.2f} "
+                          f"{errors:>6} {after['model_loads'] - before['model_loads']:>6} "
+                          f"{after['batches'] - before['batches']:>6}")
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Bandingkan waktu muat dataset: CSV + `preprocess_period_column` vs Feather (memory-map).
+
+Contoh: python benchmarks/bench_storage.py --rows 168 1000000 5000000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from revflux.preprocessing import preprocess_period_column  # noqa: E402
+from revflux.storage import CSV_DATE_FORMAT, DatasetStore  # noqa: E402
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[168, 1_000_000, 5_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'csv_s':>9} {'feather_s':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DatasetStore(tmp)
+        csv_path = Path(tmp) / "bench.csv"
+        for n_rows in args.rows:
+            df = pd.DataFrame({
+                "Periode": pd.date_range("1990-01-01", periods=n_rows, freq="h"),
+                "Pemasukan": np.random.default_rng(0).uniform(1e5, 1e7, n_rows),
+            })
+            df.to_csv(csv_path, index=False, date_format=CSV_DATE_FORMAT)
+            store.save("bench", df)
+            csv_s = best_of(lambda: preprocess_period_column(pd.read_csv(csv_path)), args.repeat)
+            feather_s = best_of(lambda: store.load("bench"), args.repeat)
+            print(f"{n_rows:>12,} {csv_s:>9.3f} {feather_s:>10.4f} {csv_s / feather_s:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark `DatasetStore.upsert`: satu bulan data harian ke dataset kosong vs histori panjang.
+
+Contoh: python benchmarks/bench_upsert.py --history-years 0 1 10 30
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from revflux.storage import DatasetStore  # noqa: E402
+
+
+def daily_frame(start, days, seed=0):
+    return pd.DataFrame({
+        "Periode": pd.date_range(start, periods=days, freq="D"),
+        "Pemasukan": np.random.default_rng(seed).uniform(1e5, 1e7, days),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history-years", type=int, nargs="+", default=[0, 1, 10, 30])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    upload = daily_frame("2030-06-01", 30, seed=1)
+    print(f"{'history_rows':>12} {'best_ms':>9} {'inserted':>9} {'updated':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DatasetStore(tmp)
+        for years in args.history_years:
+            timings = []
+            for _ in range(args.repeat):
+                store.delete("bench")
+                if years:
+                    store.save("bench", daily_frame(pd.Timestamp("2030-06-01") - pd.DateOffset(years=years), 365 * years))
+                start = time.perf_counter()
+                result = store.upsert("bench", upload)
+                timings.append(time.perf_counter() - start)
+            print(f"{365 * years:>12,} {min(timings) * 1000:>9.2f} {result.inserted:>9} {result.updated:>8}")
+
+
+if __name__ == "__main__":
+    main()
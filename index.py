@@ -1,45 +1,124 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
-import statsmodels.api as sm
-import shutil
 import os
-import plotly.express as px
 import io
 import base64
+import hashlib
 from pathlib import Path
-from pptx import Presentation
-from pptx.util import Inches
-import tempfile
+from functools import partial
+
+from revflux.charts import bar_chart, ci_chart, ci_chart_base, line_chart, line_chart_base, report_charts
+from revflux.grid_search import CRITERIA, candidate_grid
+from revflux.ingest import LATEST, SUM, stream_upload
+from revflux.instrumentation import (CPROFILE, PERF_LOG_ENV, PROFILERS, PYINSTRUMENT, Profiler, configure_json_log,
+                                     current_rss, log_trace, max_rss, stage, start_trace)
+from revflux.jobs import ACTIVE_STATES, CANCELLED, DONE, QUEUED, TrainingJobRunner
+from revflux.modeling import forecast_frame, future_periods, load_model as read_model_file, seasonal_order_for
+from revflux.preprocessing import MONTHLY, WEEKLY
+from revflux.report import PPTX_MIME, ChartRenderer, build_report_pptx
+from revflux.registry import validate_dataset_name
+from revflux.storage import DatasetStore, require_periods
+
+
+@st.cache_resource(show_spinner=False)
+def perf_log_handler():
+    """Log JSON per rerun ke file di env `REVFLUX_PERF_LOG` (bila diisi); dipasang sekali per proses server."""
+    path = os.environ.get(PERF_LOG_ENV)
+    return configure_json_log(path) if path else None
+
+
+# Setiap rerun dicatat per tahap (lihat revflux.instrumentation); hasilnya di panel debug paling bawah.
+perf_log_handler()
+perf_trace = start_trace("rerun", track_allocations=st.session_state.get("perf_track_allocations", False))
+# Profiler dari rerun yang berhenti lebih awal (st.rerun/st.stop) dihentikan di sini agar tidak terus aktif
+leftover_profiler = st.session_state.pop("active_profiler", None)
+if leftover_profiler is not None and leftover_profiler.running:
+    leftover_profiler.stop()
+rerun_profiler = None
+profile_kind = st.session_state.pop("profile_next_rerun", None)
+if profile_kind:
+    try:
+        rerun_profiler = Profiler(profile_kind).start()
+        st.session_state["active_profiler"] = rerun_profiler
+    except RuntimeError as e:
+        st.session_state["last_profile_error"] = str(e)
+
+
+def file_cache_key(path):
+    """Kunci cache untuk sebuah file: (mtime_ns, ukuran). Berubah setiap kali file ditimpa."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+dataset_store = DatasetStore()
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def load_dataset(name, cache_key):
+    """Membaca dataset Feather sekali per versi data di registry (lihat `DatasetStore.version`)."""
+    return dataset_store.load(name)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_model(path, cache_key):
+    """Muat artefak ringkas `.npz` (fallback: pickle SARIMAX format lama) sekali per versi file; objek dibagi antar rerun (read-only)."""
+    return read_model_file(path)
+
+
+MAX_FORECAST_HORIZON = 24
+FREQUENCY_LABELS = {MONTHLY: "Bulanan", WEEKLY: "Mingguan"}
 
 
-def preprocess_period_column(df):
-    """Mempersiapkan kolom 'Periode' agar konsisten sebagai datetime (awal bulan)."""
-    df = df.copy()
-    if "Periode" not in df.columns:
-        raise ValueError("Kolom 'Periode' tidak ditemukan.")
-    # Parse ke datetime
-    df["Periode"] = pd.to_datetime(df["Periode"], errors="coerce", infer_datetime_format=True)
-    # Jika masih ada NaT, coba format-format umum (beberapa dataset menuliskan dd/mm/YYYY atau YYYY-MM)
-    if df["Periode"].isna().any():
-        for fmt in ("%d/%m/%Y", "%Y/%m/%d", "%Y-%m", "%Y-%m-%d", "%d-%m-%Y"):
-            parsed = pd.to_datetime(df["Periode"].astype(str), format=fmt, errors="coerce")
-            df["Periode"] = df["Periode"].fillna(parsed)
-            if df["Periode"].notna().all():
-                break
+def model_fingerprint(model):
+    """Sidik jari model terlatih (parameter + data latih); berubah otomatis setiap retrain."""
+    checksum = getattr(model, "checksum", None)
+    if checksum:
+        return checksum  # artefak ringkas sudah membawa checksum isi
+    h = hashlib.sha1()
+    h.update(np.asarray(model.params, dtype="float64").tobytes())
+    h.update(np.asarray(model.model.endog, dtype="float64").tobytes())
+    return h.hexdigest()
 
-    df = df.dropna(subset=["Periode"]).copy()
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def compute_forecast(_model, fingerprint, horizon=MAX_FORECAST_HORIZON):
+    """Forecast sekali di horizon maksimum (skala asli, expm1); pemanggil cukup memotong `n_periods` baris pertama."""
+    return forecast_frame(_model, horizon)
 
-    df["Periode"] = df["Periode"].dt.to_period("M").dt.to_timestamp()
 
-    if "Pemasukan" in df.columns:
-        df["Pemasukan"] = pd.to_numeric(df["Pemasukan"], errors="coerce")
-        df = df.dropna(subset=["Pemasukan"])
+@st.cache_resource(show_spinner=False, max_entries=8)
+def history_figures(name, cache_key):
+    """Figure dasar (histori aktual ter-downsample) per versi dataset; trace prediksi ditambahkan ke salinannya."""
+    hist_data = load_dataset(name, cache_key)
+    return line_chart_base(hist_data, name), ci_chart_base(hist_data)
 
-    df = df.sort_values("Periode").reset_index(drop=True)
-    return df
+
+@st.cache_resource
+def get_training_runner():
+    """Satu runner training per proses server, dipakai bersama semua sesi."""
+    return TrainingJobRunner()
+
+
+@st.fragment(run_every=1.0)
+def training_progress_panel(job_id):
+    """Polling status training tanpa menjalankan ulang seluruh halaman; rerun penuh saat job selesai."""
+    runner = get_training_runner()
+    job_status = runner.status(job_id)
+    if job_status.state not in ACTIVE_STATES:
+        load_model.clear()
+        st.rerun()
+    label = "Menunggu antrean training..." if job_status.state == QUEUED else "Sedang melatih model... 🧠"
+    st.progress(job_status.progress, text=f"{label} ({job_status.elapsed:.0f} detik)")
+    if st.button("⛔ Batalkan Training", key=f"cancel_{job_id}"):
+        runner.cancel(job_id)
+
+
+def invalidate_file_caches():
+    """Kosongkan cache dataset & model setelah file ditimpa, direset, atau dikembalikan."""
+    load_dataset.clear()
+    load_model.clear()
+    history_figures.clear()
 
 
 
@@ -48,13 +127,23 @@ def preprocess_period_column(df):
 # ============================================================
 st.set_page_config(page_title="RevFlux", page_icon="Logo.png", layout="wide")
 
-logo_path = Path("Logo.png")
-if logo_path.exists():
-    with open(logo_path, "rb") as f:
-        logo_base64 = base64.b64encode(f.read()).decode()
-    logo_html = f'<img src="data:image/png;base64,{logo_base64}" style="width:28px;height:28px;margin-right:10px;">'
-else:
-    logo_html = "<div style='width:28px;height:28px;background:#ccc;border-radius:50%;margin-right:10px;'></div>"
+
+@st.cache_resource
+def get_chart_renderer():
+    """Renderer grafik bersama: server kaleido tetap hangat dan PNG di-cache per isi figure."""
+    return ChartRenderer()
+
+
+@st.cache_resource
+def build_logo_html():
+    """Logo sebagai <img> base64; dibaca & di-encode sekali per proses, bukan setiap rerun."""
+    logo_path = Path("Logo.png")
+    if logo_path.exists():
+        with open(logo_path, "rb") as f:
+            logo_base64 = base64.b64encode(f.read()).decode()
+        return f'<img src="data:image/png;base64,{logo_base64}" style="width:28px;height:28px;margin-right:10px;">'
+    return "<div style='width:28px;height:28px;background:#ccc;border-radius:50%;margin-right:10px;'></div>"
+
 
 navbar_css = """
 <style>
@@ -88,7 +177,7 @@ div.stButton>button:has(span:contains('Kembalikan Model')) {
 """
 st.markdown(navbar_css, unsafe_allow_html=True)
 
-navbar_html = f"<div class='navbar'>{logo_html}<span>RevFlux</span></div>"
+navbar_html = f"<div class='navbar'>{build_logo_html()}<span>RevFlux</span></div>"
 st.markdown(navbar_html, unsafe_allow_html=True)
 
 
@@ -115,16 +204,37 @@ contoh_data.to_csv(csv_buffer, index=False)
 st.download_button("⬇️ Download Contoh Data (CSV)", csv_buffer.getvalue(), "contoh_data.csv", "text/csv")
 
 
-active_dataset = None
-if os.path.exists("active_dataset.txt"):
-    with open("active_dataset.txt") as f:
-        active_dataset = f.read().strip()
+# Dataset aktif disimpan per tab browser (query param `?dataset=`), bukan di file bersama,
+# sehingga sesi yang berbeda tidak saling menimpa pilihan dataset.
+NEW_DATASET = "➕ Dataset baru (nama dari file upload)"
+dataset_options = dataset_store.known_datasets() + [NEW_DATASET]
+requested_dataset = st.query_params.get("dataset")
+selected_dataset = st.selectbox(
+    "Dataset aktif:", dataset_options,
+    index=dataset_options.index(requested_dataset) if requested_dataset in dataset_options else 0,
+    format_func=lambda name: name if name == NEW_DATASET or dataset_store.exists(name) else f"{name} (direset)",
+)
+active_dataset = None if selected_dataset == NEW_DATASET else selected_dataset
+if active_dataset:
+    st.query_params["dataset"] = active_dataset
+elif "dataset" in st.query_params:
+    del st.query_params["dataset"]
 
 
 sarima_model = None
-if active_dataset and os.path.exists(f"{active_dataset}_model.pkl"):
-    with open(f"{active_dataset}_model.pkl", "rb") as f:
-        sarima_model = pickle.load(f)
+model_path = dataset_store.resolve_model_path(active_dataset) if active_dataset else None
+if model_path is not None:
+    sarima_model = load_model(str(model_path), file_cache_key(model_path))
+
+# Frekuensi tersimpan untuk dataset lama; dipilih sekali saat dataset baru dibuat
+if active_dataset and dataset_store.exists(active_dataset):
+    dataset_freq = dataset_store.frequency(active_dataset)
+else:
+    dataset_freq = st.selectbox("Frekuensi model untuk dataset baru:", list(FREQUENCY_LABELS), format_func=FREQUENCY_LABELS.get)
+aggregate_mode = st.checkbox("🧾 File berisi data harian/mingguan/transaksi (jumlahkan per periode)")
+accumulate = False
+if aggregate_mode and active_dataset and dataset_store.exists(active_dataset):
+    accumulate = st.checkbox("➕ Tambahkan ke total periode yang sudah ada (upload lanjutan)")
 
 
 # ============================================================
@@ -132,46 +242,61 @@ if active_dataset and os.path.exists(f"{active_dataset}_model.pkl"):
 # ============================================================
 if uploaded_file:
     current_dataset_name = active_dataset
+    name_error = None
     if current_dataset_name is None:
         current_dataset_name = Path(uploaded_file.name).stem
-        with open("active_dataset.txt", "w") as f:
-            f.write(current_dataset_name)
-        active_dataset = current_dataset_name
-
-    data_filename = f"{current_dataset_name}_data.csv"
-
+        try:
+            validate_dataset_name(current_dataset_name)
+            st.query_params["dataset"] = current_dataset_name
+            active_dataset = current_dataset_name
+        except ValueError as e:
+            name_error = str(e)
+
+    # st.file_uploader menyimpan file yang sama di setiap rerun; tanpa penanda ini upload
+    # akan di-upsert ulang (dan dengan `accumulate` totalnya ditambahkan berkali-kali).
+    upload_id = (getattr(uploaded_file, "file_id", None) or f"{uploaded_file.name}:{uploaded_file.size}",
+                 current_dataset_name)
+    processed_uploads = st.session_state.setdefault("processed_uploads", set())
+
+    # Nama dari file upload bisa menunjuk dataset lama: frekuensinya tidak boleh berbeda (lihat cli.dataset_frequency)
+    stored_freq = dataset_store.frequency(current_dataset_name) if dataset_store.exists(current_dataset_name) else None
+    freq_conflict = stored_freq is not None and stored_freq != dataset_freq
+
+if uploaded_file and name_error:
+    st.error(f"❌ {name_error} Ganti nama file atau pilih dataset yang sudah ada di atas.")
+elif uploaded_file and freq_conflict:
+    st.error(f"❌ Dataset '{current_dataset_name}' sudah ada dengan frekuensi {FREQUENCY_LABELS[stored_freq]}; "
+             f"file tidak bisa diproses sebagai {FREQUENCY_LABELS[dataset_freq]}. "
+             "Pilih frekuensi yang sama, pilih dataset tersebut di atas, atau ganti nama file.")
+elif uploaded_file and upload_id in processed_uploads:
+    st.info(f"ℹ️ File '{uploaded_file.name}' sudah diproses ke dataset '{current_dataset_name}'. "
+            "Upload ulang file untuk memprosesnya lagi.")
+elif uploaded_file:
     try:
-        # Baca file upload (parse dates jika csv)
-        if uploaded_file.name.endswith(".csv"):
-            new_data = pd.read_csv(uploaded_file)
+        # Baca per potongan (CSV chunk / XLSX read-only), hanya kolom Periode & Pemasukan;
+        # setiap potongan langsung direduksi per periode (lihat revflux.ingest)
+        upload = stream_upload(uploaded_file, dataset_freq, combine=SUM if aggregate_mode else LATEST)
+        new_data = upload.data
+        rss = max_rss()
+        st.caption(f"{upload.rows_read:,} baris dibaca dalam {upload.elapsed:.2f} detik ({upload.rows_per_sec:,.0f} baris/detik) "
+                   f"menjadi {len(new_data)} periode; {upload.rows_dropped} baris tidak terbaca dibuang"
+                   + (f"; puncak memori proses {rss / 2**20:,.0f} MB." if rss else "."))
+        st.caption(f"Format tanggal terdeteksi (jumlah baris): {new_data.attrs['period_formats']}")
+
+        # Upsert per periode (last-write-wins, atau dijumlahkan untuk upload lanjutan);
+        # hanya partisi tahun yang tersentuh yang ditulis ulang
+        is_new_dataset = not dataset_store.exists(current_dataset_name)
+        require_periods(new_data)  # tolak upload kosong sebelum dataset baru didaftarkan
+        if is_new_dataset:
+            dataset_store.set_frequency(current_dataset_name, dataset_freq)
+        result = dataset_store.upsert(current_dataset_name, new_data, accumulate=accumulate)
+        processed_uploads.add(upload_id)
+        if is_new_dataset:
+            st.success(f"✅ Dataset '{current_dataset_name}' berhasil diinputkan ({result.inserted} periode).")
         else:
-            new_data = pd.read_excel(uploaded_file)
-
-        if "Periode" not in new_data.columns or "Pemasukan" not in new_data.columns:
-            st.error("❌ File harus memiliki kolom 'Periode' dan 'Pemasukan'.")
-            st.stop()
-
-        # Preprocess & normalisasi
-        new_data = preprocess_period_column(new_data)
-
-        if os.path.exists(data_filename):
-            old_data = pd.read_csv(data_filename)
-            old_data = preprocess_period_column(old_data)
-            st.info(f"Dataset lama: {len(old_data)} baris (setelah normalisasi)")
-
-            combined_data = pd.concat([old_data, new_data], ignore_index=True)
-            before = len(combined_data)
-            # Hapus duplikat berdasar Periode (setiap periode hanya 1 baris)
-            combined_data = combined_data.drop_duplicates(subset=["Periode"], keep="last").sort_values("Periode").reset_index(drop=True)
-            after = len(combined_data)
-            removed = before - after
-            st.success(f"✅ Penggabungan selesai. {removed} baris duplikat dihapus. Total sekarang: {after} baris.")
-        else:
-            combined_data = new_data.copy()
-            st.success(f"✅ Dataset '{current_dataset_name}' berhasil diinputkan ({len(combined_data)} baris).")
+            st.success(f"✅ Penggabungan selesai. {result.inserted} periode baru ditambahkan, {result.updated} periode diperbarui.")
 
-        # Simpan dengan format tanggal konsisten
-        combined_data.to_csv(data_filename, index=False, date_format="%Y-%m-%d")
+        combined_data = load_dataset(current_dataset_name, dataset_store.version(current_dataset_name))
         st.info("Data terbaru yang digunakan:")
         st.dataframe(combined_data.tail(10))
 
@@ -183,36 +308,83 @@ if uploaded_file:
 # Tombol Train / Retrain Model (DIPINDAHKAN KE SINI)
 # ============================================================
 # Blok ini akan muncul di bawah uploader file jika sebuah dataset sudah aktif (tersimpan).
-if active_dataset and os.path.exists(f"{active_dataset}_data.csv"):
-    data_filename = f"{active_dataset}_data.csv"
-    model_filename = f"{active_dataset}_model.pkl"
+if active_dataset and dataset_store.exists(active_dataset):
+    model_filename = dataset_store.model_path(active_dataset)
 
-    sales_data = pd.read_csv(data_filename)
-    sales_data = preprocess_period_column(sales_data)
+    sales_data = load_dataset(active_dataset, dataset_store.version(active_dataset))
     last_period = sales_data["Periode"].iloc[-1].strftime("%B %Y")
     
     # Notifikasi status data dipindahkan ke sini
     st.info(f"📅 Data terakhir: **{last_period}**")
+    # CSV dibuat hanya saat tombol diklik (callable), bukan di setiap rerun
+    st.download_button("⬇️ Download Dataset Aktif (CSV)", partial(dataset_store.export_csv, active_dataset),
+                       f"{active_dataset}_data.csv", "text/csv")
+
+    # Training berjalan di process pool (lihat revflux.jobs) sehingga sesi tidak terblokir
+    training_runner = get_training_runner()
+    training_job = training_runner.latest_job(active_dataset)
+    training_active = training_job is not None and training_runner.status(training_job).state in ACTIVE_STATES
+
+    seasonal_order = seasonal_order_for(dataset_freq)
+    auto_order = st.checkbox("🔎 Cari orde SARIMA terbaik otomatis (grid search paralel)")
+    search = None
+    if auto_order:
+        criterion = st.selectbox("Kriteria pemilihan model:", CRITERIA,
+                                 format_func={"aic": "AIC", "bic": "BIC", "holdout": "MAPE holdout 12 bulan"}.get)
+        search = {"criterion": criterion, "candidates": candidate_grid(s=seasonal_order[3])}
 
     train_button_label = "🚀 Train Model Baru" if sarima_model is None else "🔁 Retrain Model"
-    if st.button(train_button_label):
-        with st.spinner("Sedang melatih model... 🧠"):
+    if st.button(train_button_label, disabled=training_active):
+        try:
+            if len(sales_data) < 2 * seasonal_order[3]:
+                st.warning(f"⚠️ Jumlah data disarankan minimal {2 * seasonal_order[3]} periode (dua musim) untuk hasil optimal.")
+            dataset_store.snapshot(active_dataset, "sebelum training")
+            training_job = training_runner.submit(active_dataset, sales_data["Pemasukan"].to_numpy(), model_filename,
+                                                  search=search, seasonal_order=seasonal_order)
+            st.session_state["training_job"] = training_job
+            training_active = True
+        except Exception as e:
+            st.error(f"Gagal melatih model: {e}")
+
+    # Update inkremental: periode baru dimasukkan ke filter tanpa estimasi ulang (lihat revflux.updating)
+    new_periods = 0 if sarima_model is None else len(sales_data) - sarima_model.nobs
+    if new_periods > 0:
+        st.info(f"🆕 Ada {new_periods} periode baru sejak model terakhir dilatih.")
+        compare_refit = st.checkbox("Bandingkan hasil update dengan refit penuh (lebih lambat)")
+        if st.button("⚡ Update Model dengan Data Baru", disabled=training_active):
             try:
-                if len(sales_data) < 24:
-                    st.warning("⚠️ Jumlah data disarankan minimal 24 bulan untuk hasil optimal.")
-
-                y = sales_data["Pemasukan"]
-                y_log = np.log1p(y)
-                model = sm.tsa.statespace.SARIMAX(
-                    y_log, order=(1,1,1), seasonal_order=(1,1,1,12),
-                    enforce_stationarity=False, enforce_invertibility=False
-                ).fit(disp=False)
-                with open(model_filename, "wb") as f:
-                    pickle.dump(model, f)
-                sarima_model = model
-                st.success(f"✅ Model untuk '{active_dataset}' berhasil dilatih dengan data hingga {last_period}!")
+                dataset_store.snapshot(active_dataset, "sebelum update model")
+                training_job = training_runner.submit_update(active_dataset, dataset_store.root, compare_refit=compare_refit)
+                st.session_state["training_job"] = training_job
+                training_active = True
             except Exception as e:
-                st.error(f"Gagal melatih model: {e}")
+                st.error(f"Gagal memperbarui model: {e}")
+
+    if training_active:
+        training_progress_panel(training_job)
+    elif training_job is not None and st.session_state.get("training_job") == training_job:
+        # Tampilkan hasil job milik sesi ini sekali saja
+        del st.session_state["training_job"]
+        job_status = training_runner.status(training_job)
+        if job_status.state == DONE and "mode" in job_status.result:
+            update = job_status.result
+            mode_label = {"extended": "diperpanjang tanpa refit", "refit": "di-refit penuh", "unchanged": "tidak berubah"}
+            st.success(f"✅ Model '{active_dataset}' {mode_label[update['mode']]}: {update['reason']} "
+                       f"({update['n_new']} periode baru, {job_status.elapsed:.2f} detik)")
+            if update["refit_max_rel_diff"] == update["refit_max_rel_diff"]:  # bukan NaN
+                st.info(f"Selisih forecast vs refit penuh: maks {update['refit_max_rel_diff']:.2%}, "
+                        f"rata-rata {update['refit_mean_rel_diff']:.2%}")
+        elif job_status.state == DONE:
+            st.success(f"✅ Model untuk '{active_dataset}' berhasil dilatih dengan data hingga {last_period}! ({job_status.elapsed:.1f} detik)")
+            if "candidates" in job_status.result:
+                st.info(f"Orde terpilih: SARIMA{job_status.result['order']}{job_status.result['seasonal_order']} "
+                        f"(kriteria {job_status.result['criterion'].upper()})")
+                with st.expander("Laporan grid search (waktu per kandidat)"):
+                    st.dataframe(pd.DataFrame(job_status.result["candidates"]))
+        elif job_status.state == CANCELLED:
+            st.warning("⚠️ Training model dibatalkan.")
+        else:
+            st.error(f"Gagal melatih model: {job_status.error}")
 st.markdown("<hr class='divider'/>", unsafe_allow_html=True)
 
 # ============================================================
@@ -227,15 +399,9 @@ with col_reset:
     if st.button("🧹 Reset Model & Data"):
         try:
             if active_dataset:
-                data_file = f"{active_dataset}_data.csv"
-                model_file = f"{active_dataset}_model.pkl"
-                backup_data = f"{active_dataset}_data_backup.csv"
-                backup_model = f"{active_dataset}_model_backup.pkl"
-
-                if os.path.exists(model_file): shutil.copy(model_file, backup_model)
-                if os.path.exists(data_file): shutil.copy(data_file, backup_data)
-                for f in [model_file, data_file, "active_dataset.txt"]:
-                    if os.path.exists(f): os.remove(f)
+                # Isi dataset disimpan sebagai snapshot terlebih dulu, jadi reset bisa dibatalkan
+                dataset_store.reset(active_dataset)
+                invalidate_file_caches()
 
                 st.warning(f"⚠️ Model dan data '{active_dataset}' telah direset. Silakan refresh halaman.")
             else:
@@ -244,27 +410,23 @@ with col_reset:
             st.error(f"Gagal mereset: {e}")
 
 with col_restore:
+    snapshots = dataset_store.snapshots(active_dataset) if active_dataset else []
+    chosen_snapshot = None
+    if snapshots:
+        chosen_snapshot = st.selectbox(
+            "Snapshot yang dikembalikan:", snapshots,
+            format_func=lambda s: f"#{s['id']} — {s['created_at'][:19].replace('T', ' ')} UTC — {s['reason']}"
+                                  + ("" if s["model_file"] else " (tanpa model)"),
+        )
     if st.button("♻️ Kembalikan Model Setelah Reset"):
         try:
-            restored_dataset_name = active_dataset
-            if restored_dataset_name is None:
-                backup_files = [f for f in os.listdir() if f.endswith("_model_backup.pkl")]
-                if backup_files: restored_dataset_name = backup_files[0].replace("_model_backup.pkl", "")
-
-            if restored_dataset_name:
-                data_file = f"{restored_dataset_name}_data.csv"
-                model_file = f"{restored_dataset_name}_model.pkl"
-                backup_data = f"{restored_dataset_name}_data_backup.csv"
-                backup_model = f"{restored_dataset_name}_model_backup.pkl"
-                if os.path.exists(backup_model) and os.path.exists(backup_data):
-                    shutil.copy(backup_model, model_file)
-                    shutil.copy(backup_data, data_file)
-                    with open("active_dataset.txt", "w") as f: f.write(restored_dataset_name)
-                    st.success(f"✅ Model dan data '{restored_dataset_name}' berhasil dikembalikan! Silakan refresh halaman.")
-                else:
-                    st.warning("⚠️ File backup tidak ditemukan.")
+            if chosen_snapshot is not None:
+                dataset_store.rollback(active_dataset, chosen_snapshot["id"])
+                invalidate_file_caches()
+                st.success(f"✅ Model dan data '{active_dataset}' berhasil dikembalikan ke snapshot #{chosen_snapshot['id']}! "
+                           "Silakan refresh halaman.")
             else:
-                st.warning("⚠️ Tidak ada dataset aktif atau backup yang dapat dikembalikan.")
+                st.warning("⚠️ Tidak ada dataset aktif atau snapshot yang dapat dikembalikan.")
         except Exception as e:
             st.error(f"Gagal mengembalikan: {e}")
 st.markdown("<hr class='divider'/>", unsafe_allow_html=True)
@@ -272,28 +434,19 @@ st.markdown("<hr class='divider'/>", unsafe_allow_html=True)
 # ============================================================
 # Prediksi & Visualisasi
 # ============================================================
-if sarima_model is not None and active_dataset and os.path.exists(f"{active_dataset}_data.csv"):
+if sarima_model is not None and active_dataset and dataset_store.exists(active_dataset):
     st.subheader("📈 Prediksi & Visualisasi")
     st.markdown("<hr class='divider'/>", unsafe_allow_html=True)
 
-    n_periods = st.slider("Pilih jumlah bulan ke depan untuk prediksi:", 1, 24, 6)
+    n_periods = st.slider("Pilih jumlah bulan ke depan untuk prediksi:", 1, MAX_FORECAST_HORIZON, 6)
 
     # --- Persiapan Data untuk Visualisasi ---
-    hist_data = pd.read_csv(f"{active_dataset}_data.csv")
-    hist_data = preprocess_period_column(hist_data)
-    hist_data["Tipe"] = "Aktual"
-
-    forecast_res = sarima_model.get_forecast(steps=n_periods)
-    forecast_mean = np.expm1(forecast_res.predicted_mean)
-    conf_int_exp = np.expm1(forecast_res.conf_int())
-
-    forecast_df = pd.DataFrame({
-        "Periode": pd.date_range(hist_data["Periode"].iloc[-1] + pd.DateOffset(months=1), periods=n_periods, freq="MS"),
-        "Pemasukan": forecast_mean,
-        "Tipe": "Prediksi"
-    })
-    
-    combined_vis = pd.concat([hist_data, forecast_df], ignore_index=True)
+    dataset_version = dataset_store.version(active_dataset)
+    hist_data = load_dataset(active_dataset, dataset_version)
+
+    full_forecast = compute_forecast(sarima_model, model_fingerprint(sarima_model))
+    forecast_df = full_forecast.iloc[:n_periods].copy()
+    forecast_df.insert(0, "Periode", future_periods(hist_data["Periode"].iloc[-1], n_periods, dataset_freq))
     
     st.write("Tabel Hasil Prediksi:")
     display_df = forecast_df.copy()
@@ -301,34 +454,24 @@ if sarima_model is not None and active_dataset and os.path.exists(f"{active_data
     display_df["Pemasukan (Rp)"] = display_df["Pemasukan"].apply(lambda x: f"Rp {x:,.0f}".replace(",", "."))
     st.dataframe(display_df[["Periode", "Pemasukan (Rp)"]])
 
-    # --- Buat dan Tampilkan Semua Grafik ---
+    # --- Buat dan Tampilkan Semua Grafik (Plotly dimuat di dalam revflux.charts) ---
+    # Histori di-downsample & di-cache per versi dataset; hanya trace prediksi yang dibangun tiap rerun.
+    line_base, ci_base = history_figures(active_dataset, dataset_version)
     st.write("---")
-    fig_line = px.line(combined_vis, x="Periode", y="Pemasukan", color="Tipe", markers=True, 
-                       title=f"📈 Aktual vs Prediksi Pemasukan — Dataset: {active_dataset}",
-                       color_discrete_map={"Aktual": "#3498db", "Prediksi": "#e74c3c"})
-    fig_line.update_layout(legend_title_text="Jenis Data", yaxis_title="Pemasukan (Rp)", xaxis_title="Periode")
-    st.plotly_chart(fig_line, use_container_width=True)
+    fig_line = line_chart(hist_data, forecast_df, active_dataset, base=line_base)
+    with stage("ui.plotly_chart"):
+        st.plotly_chart(fig_line, use_container_width=True)
 
     st.write("---")
-    fig_ci = px.line(hist_data, x="Periode", y="Pemasukan", title="🎯 Prediksi Pemasukan dengan Rentang Keyakinan (Confidence Interval)")
-    fig_ci.data[0].name = 'Aktual'
-    fig_ci.data[0].showlegend = True
-    fig_ci.add_scatter(x=forecast_df["Periode"], y=forecast_df["Pemasukan"], mode="lines", name="Prediksi", line=dict(color="#e74c3c"))
-    fig_ci.add_scatter(x=forecast_df["Periode"], y=conf_int_exp.iloc[:, 1], mode="lines", line=dict(dash="dash", color="green"), name="Batas Atas CI")
-    fig_ci.add_scatter(x=forecast_df["Periode"], y=conf_int_exp.iloc[:, 0], mode="lines", line=dict(dash="dash", color="yellow"), name="Batas Bawah CI")
-    fig_ci.update_layout(yaxis_title="Pemasukan (Rp)", xaxis_title="Periode", legend_title_text="Keterangan")
-    st.plotly_chart(fig_ci, use_container_width=True)
+    fig_ci = ci_chart(hist_data, forecast_df, base=ci_base)
+    with stage("ui.plotly_chart"):
+        st.plotly_chart(fig_ci, use_container_width=True)
 
     st.write("---")
     tail_periods = st.slider("Tampilkan N bulan terakhir pada Bar Chart:", 6, 36, 12)
-    bar_data = combined_vis.tail(tail_periods)
-    
-    fig_bar = px.bar(bar_data, x="Periode", y="Pemasukan", color="Tipe",
-                     barmode="group", title=f"📊 Perbandingan Pemasukan Bulanan (Aktual vs Prediksi) — {tail_periods} Bulan Terakhir",
-                     labels={"Pemasukan": "Pemasukan (Rp)"},
-                     color_discrete_map={"Aktual": "#3498db", "Prediksi": "#e74c3c"})
-    fig_bar.update_layout(xaxis_title="Periode", yaxis_title="Pemasukan (Rp)", legend_title_text="Jenis Data")
-    st.plotly_chart(fig_bar, use_container_width=True)
+    fig_bar = bar_chart(hist_data, forecast_df, tail_periods)
+    with stage("ui.plotly_chart"):
+        st.plotly_chart(fig_bar, use_container_width=True)
 
      # ============================================================
     # Export PowerPoint (Sendiri)
@@ -338,153 +481,17 @@ if sarima_model is not None and active_dataset and os.path.exists(f"{active_data
 
     if st.button("📤 Export Visualisasi ke PowerPoint"):
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pptx") as tmpfile:
-                prs = Presentation()
-
-                # --- Slide Judul / Ringkasan ---
-                title_slide_layout = prs.slide_layouts[0]
-                slide = prs.slides.add_slide(title_slide_layout)
-                slide.shapes.title.text = "Laporan Prediksi Pemasukan"
-                try:
-                    slide.placeholders[1].text = (
-                        f"Dataset: {active_dataset}\n"
-                        f"Periode Data Aktual: {hist_data['Periode'].min().strftime('%B %Y')} - {hist_data['Periode'].max().strftime('%B %Y')}\n"
-                        f"Periode Prediksi: {n_periods} bulan ke depan"
-                    )
-                except Exception:
-                    # fallback jika placeholder indeks berbeda
-                    txBox = slide.shapes.add_textbox(Inches(1), Inches(1.5), Inches(8), Inches(2))
-                    tf = txBox.text_frame
-                    tf.text = (
-                        f"Dataset: {active_dataset}\n"
-                        f"Periode Data Aktual: {hist_data['Periode'].min().strftime('%B %Y')} - {hist_data['Periode'].max().strftime('%B %Y')}\n"
-                        f"Periode Prediksi: {n_periods} bulan ke depan"
-                    )
-
-                # --- Slide ringkasan angka prediksi (tabel singkat) ---
-                try:
-                    summary_slide = prs.slides.add_slide(prs.slide_layouts[1])
-                    summary_slide.shapes.title.text = "Ringkasan Prediksi"
-                    tb = summary_slide.shapes.add_textbox(Inches(0.7), Inches(1.8), Inches(9), Inches(3)).text_frame
-                    tb.text = "Tabel Prediksi (1 baris per periode):"
-                    for idx, row in forecast_df.reset_index(drop=True).iterrows():
-                        p = tb.add_paragraph()
-                        p.text = f"{row['Periode'].strftime('%B %Y')} — Rp {row['Pemasukan']:,.0f}".replace(",", ".")
-                        p.level = 1
-                        if idx >= 9:  # batasi agar tidak terlalu panjang pada satu slide
-                            break
-                except Exception:
-                    pass
-
-                # --- Tambahkan grafik (coba kaleido; fallback placeholder) ---
-                for fig_obj, title in [
-                    (fig_line, "Grafik Aktual vs Prediksi"),
-                    (fig_ci, "Grafik Rentang Keyakinan Prediksi"),
-                    (fig_bar, "Grafik Perbandingan Bulanan")
-                ]:
-                    slide = prs.slides.add_slide(prs.slide_layouts[5])
-                    try:
-                        slide.shapes.title.text = title
-                    except Exception:
-                        # beberapa layout tidak memiliki title placeholder
-                        try:
-                            slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.5)).text_frame.text = title
-                        except Exception:
-                            pass
-
-                    html_tmp = None
-                    img_tmp_path = None
-                    try:
-                        # Simpan HTML sebagai cadangan
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".html") as html_tmp:
-                            fig_obj.write_html(html_tmp.name)
-
-                        # Coba konversi pakai kaleido (jika tersedia)
-                        import plotly.io as pio
-                        try:
-                            img_bytes = pio.to_image(fig_obj, format="png", width=960, height=540)
-                            with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as img_tmp:
-                                img_tmp.write(img_bytes)
-                                img_tmp_path = img_tmp.name
-                        except Exception:
-                            # fallback: buat placeholder PNG dengan Pillow
-                            try:
-                                from PIL import Image, ImageDraw, ImageFont
-                                img = Image.new("RGB", (960, 540), color=(245, 245, 245))
-                                d = ImageDraw.Draw(img)
-                                text = f"{title}\n(Kaleido tidak tersedia — placeholder)"
-                                # posisi teks sederhana
-                                d.text((40, 240), text, fill=(20, 20, 20))
-                                img_tmp_path = html_tmp.name.replace(".html", ".png")
-                                img.save(img_tmp_path)
-                            except Exception:
-                                # fallback terakhir: buat file teks sebagai penanda
-                                placeholder_path = html_tmp.name.replace(".html", ".txt")
-                                with open(placeholder_path, "w", encoding="utf-8") as ph:
-                                    ph.write(f"{title}\n(Kaleido & Pillow tidak tersedia — tidak ada gambar)\n")
-                                img_tmp_path = placeholder_path
-
-                        # Tambahkan gambar atau fallback text ke slide
-                        if img_tmp_path and os.path.exists(img_tmp_path):
-                            try:
-                                # Jika path berakhiran .png tambahkan sebagai gambar
-                                if img_tmp_path.lower().endswith(".png"):
-                                    slide.shapes.add_picture(img_tmp_path, Inches(0.5), Inches(1.2), width=Inches(9))
-                                else:
-                                    # tambahkan sebagai kotak teks jika bukan gambar
-                                    tx = slide.shapes.add_textbox(Inches(0.5), Inches(1.2), Inches(9), Inches(2)).text_frame
-                                    tx.text = open(img_tmp_path, "r", encoding="utf-8").read()
-                            except Exception as e_pic:
-                                # jika gagal menambahkan gambar, tulis pesan error di slide
-                                txBox = slide.shapes.add_textbox(Inches(0.5), Inches(1.2), Inches(9), Inches(2))
-                                txBox.text = f"Gagal menambahkan gambar: {e_pic}"
-                        else:
-                            txBox = slide.shapes.add_textbox(Inches(0.5), Inches(1.2), Inches(9), Inches(2))
-                            txBox.text = f"Gambar tidak tersedia untuk '{title}'."
-
-                    finally:
-                        # bersihkan file sementara jika ada
-                        try:
-                            if html_tmp is not None and os.path.exists(html_tmp.name):
-                                os.remove(html_tmp.name)
-                        except Exception:
-                            pass
-                        try:
-                            if img_tmp_path is not None and os.path.exists(img_tmp_path):
-                                os.remove(img_tmp_path)
-                        except Exception:
-                            pass
-
-                # --- Slide Kesimpulan ---
-                try:
-                    cs_slide = prs.slides.add_slide(prs.slide_layouts[1])
-                    cs_slide.shapes.title.text = "Kesimpulan"
-                    txt = cs_slide.shapes.add_textbox(Inches(0.7), Inches(1.8), Inches(9), Inches(3)).text_frame
-                    txt.text = ("Laporan ini berisi prediksi pemasukan berdasarkan model SARIMA.\n"
-                                "Periksa slide 'Ringkasan Prediksi' untuk tabel singkat dan slide grafik untuk visualisasi.")
-                except Exception:
-                    pass
-
-                # Simpan presentasi setelah semua slide dibuat
-                prs.save(tmpfile.name)
-
-            # Baca dan tawarkan untuk di-download
-            with open(tmpfile.name, "rb") as f:
-                ppt_bytes = f.read()
+            charts = report_charts(fig_line, fig_ci, fig_bar)
+            images = get_chart_renderer().render_many(charts)
+            ppt_bytes = build_report_pptx(active_dataset, hist_data, forecast_df, charts, images)
 
             st.download_button(
                 label="⬇️ Download Laporan PowerPoint",
                 data=ppt_bytes,
                 file_name=f"laporan_prediksi_{active_dataset}.pptx",
-                mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
+                mime=PPTX_MIME
             )
 
-            # hapus file temporer pptx
-            try:
-                os.remove(tmpfile.name)
-            except Exception:
-                pass
-
         except Exception as e:
             st.error(f"Gagal membuat PowerPoint: {e}")
 
@@ -496,37 +503,23 @@ st.markdown("<hr class='divider'/>", unsafe_allow_html=True)
 st.subheader("🧨 Inisialisasi Ulang Sistem")
 
 st.markdown("""
-Gunakan tombol di bawah ini untuk menghapus **seluruh data, model, backup, dan file aktif**.  
+Gunakan tombol di bawah ini untuk menghapus **seluruh dataset, model, dan snapshot** yang terdaftar.  
 Aplikasi akan kembali ke kondisi awal secara otomatis setelah proses selesai.
 """)
 
 if st.button("🔄 Inisialisasi Ulang Sistem"):
     try:
-        # Hapus file di direktori kerja (kecuali logo)
-        for file in os.listdir():
-            if file.startswith("Logo"):
-                continue
-            if file.endswith((".pkl", ".csv", ".txt", ".backup.pkl", ".backup.csv")):
-                try:
-                    os.remove(file)
-                except:
-                    pass
-
-        # Hapus file di folder temporary
-        tmp_dir = tempfile.gettempdir()
-        for f in os.listdir(tmp_dir):
-            if f.startswith("tmp") and f.endswith((".pptx", ".png")):
-                try:
-                    os.remove(os.path.join(tmp_dir, f))
-                except:
-                    pass
+        # Hanya dataset yang terdaftar di registry yang dihapus; file lain di direktori kerja tidak disentuh
+        dataset_store.delete_all()
+        invalidate_file_caches()
+        st.query_params.clear()
 
         # Hapus session state agar data UI ikut ter-reset
         for key in list(st.session_state.keys()):
             del st.session_state[key]
 
         # Pesan sukses sebelum reload
-        st.success("✅ Semua data, model, dan file sementara telah dihapus.")
+        st.success("✅ Semua dataset, model, dan snapshot telah dihapus.")
         st.info("Memuat ulang aplikasi...")
 
         # 🔁 Auto refresh / reload halaman
@@ -534,3 +527,49 @@ if st.button("🔄 Inisialisasi Ulang Sistem"):
 
     except Exception as e:
         st.error(f"Gagal melakukan reset total: {e}")
+
+
+# ============================================================
+# Panel Debug Performa (?debug=1 atau REVFLUX_DEBUG=1)
+# ============================================================
+# Rerun yang berhenti lebih awal (st.rerun/st.stop) tidak sampai ke sini dan tidak tercatat.
+if rerun_profiler is not None:
+    rerun_profiler.stop()
+    st.session_state.pop("active_profiler", None)
+    st.session_state["last_profile"] = {"kind": rerun_profiler.kind, "run_id": perf_trace.run_id,
+                                        "text": rerun_profiler.text, "html": rerun_profiler.html}
+perf_trace.finish()
+log_trace(perf_trace, dataset=active_dataset, profiled=rerun_profiler is not None)
+
+if st.query_params.get("debug") == "1" or os.environ.get("REVFLUX_DEBUG") == "1":
+    with st.expander("🛠️ Debug Performa", expanded=False):
+        rss = current_rss()
+        st.caption(f"Rerun {perf_trace.run_id}: {perf_trace.elapsed * 1000:,.0f} ms "
+                   f"(CPU {perf_trace.cpu_seconds * 1000:,.0f} ms)"
+                   + (f"; RSS {rss / 2**20:,.0f} MB, puncak {max_rss() / 2**20:,.0f} MB" if rss else "")
+                   + ". Tahap yang tidak muncul diambil dari cache; tahap bersarang ikut terhitung di tahap luarnya.")
+        st.dataframe(perf_trace.table(), hide_index=True)
+        st.checkbox("Ukur puncak alokasi per tahap (tracemalloc; memperlambat rerun)", key="perf_track_allocations")
+        st.caption("tracemalloc berlaku untuk seluruh proses server: hanya satu sesi yang bisa mengukur alokasi pada satu "
+                   "waktu, dan angkanya ikut memuat alokasi sesi lain yang berjalan bersamaan.")
+        if perf_trace.allocations_busy:
+            st.warning("⚠️ Alokasi tidak diukur pada rerun ini karena sedang dipakai sesi lain.")
+
+        profiler_kind = st.selectbox("Profiler:", PROFILERS, format_func={CPROFILE: "cProfile", PYINSTRUMENT: "pyinstrument"}.get)
+        if st.button("⏺️ Profil Rerun Berikutnya"):
+            st.session_state["profile_next_rerun"] = profiler_kind
+            st.rerun()
+        profile_error = st.session_state.pop("last_profile_error", None)
+        if profile_error:
+            st.warning(f"⚠️ Gagal memulai profiler: {profile_error}")
+        last_profile = st.session_state.get("last_profile")
+        if last_profile:
+            st.caption(f"Profil {last_profile['kind']} untuk rerun {last_profile['run_id']}")
+            if last_profile["html"]:
+                import streamlit.components.v1 as components
+
+                components.html(last_profile["html"], height=600, scrolling=True)
+            else:
+                st.code(last_profile["text"])
+            st.download_button("⬇️ Download Profil", last_profile["html"] or last_profile["text"],
+                               f"profil_{last_profile['run_id']}.{'html' if last_profile['html'] else 'txt'}")
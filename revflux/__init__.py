@@ -0,0 +1 @@
+"""Logika inti RevFlux yang dapat dipakai ulang tanpa Streamlit."""
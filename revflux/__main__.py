@@ -0,0 +1,5 @@
+import sys
+
+from revflux.cli import main
+
+sys.exit(main())
@@ -0,0 +1,243 @@
+"""Artefak model ringkas (`.npz`) sebagai pengganti pickle `SARIMAXResults` penuh.
+
+Artefak hanya berisi spesifikasi model, parameter hasil fit, state prediksi
+terakhir (a_{n+1|n}, P_{n+1|n}), dan matriks sistem state-space yang
+time-invariant. Data latih, output filter/smoother, dan matriks kovarians tidak
+ikut disimpan. Forecast dihitung dengan rekursi Kalman murni NumPy, sehingga
+memuat artefak tidak perlu mengimpor statsmodels.
+
+Header JSON menyimpan `format_version` dan checksum SHA-256 atas header + semua
+array; artefak dengan versi tak dikenal atau checksum tidak cocok ditolak. Sejak
+versi 2 header juga mencatat hash deret latih (`history_sha256`), waktu estimasi
+penuh terakhir, dan jumlah update inkremental sejak itu (lihat revflux.updating).
+Sejak versi 3 artefak juga membawa status konvergensi filter ke steady state
+(`converged`, F dan P saat konvergen), karena statsmodels berhenti memperbarui
+kovarians setelah konvergen dan `extend` harus mengikuti aturan yang sama.
+"""
+import hashlib
+import json
+import os
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+
+FORMAT_VERSION = 3
+SUPPORTED_VERSIONS = (1, 2, 3)
+ARTIFACT_SUFFIX = ".npz"
+SYSTEM_MATRICES = ("design", "obs_intercept", "obs_cov", "transition", "state_intercept", "selection", "state_cov")
+# Toleransi konvergensi steady state bawaan filter Kalman statsmodels (jumlah kuadrat selisih P_{t+1} - P_t).
+CONVERGENCE_TOLERANCE = 1e-19
+
+
+class ArtifactError(ValueError):
+    """Artefak model tidak valid: versi tidak didukung atau checksum tidak cocok."""
+
+
+def history_checksum(y_log):
+    """Hash deret latih pada skala log1p, untuk mendeteksi perubahan riwayat yang sudah dilihat model."""
+    return hashlib.sha256(np.ascontiguousarray(y_log, dtype="float64").tobytes()).hexdigest()
+
+
+def _checksum(header, arrays):
+    h = hashlib.sha256()
+    h.update(json.dumps({k: v for k, v in header.items() if k != "checksum"}, sort_keys=True).encode())
+    for name in sorted(arrays):
+        h.update(name.encode())
+        h.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return h.hexdigest()
+
+
+class ForecastResult:
+    """Meniru antarmuka `PredictionResults` statsmodels yang dipakai aplikasi (skala log1p)."""
+
+    def __init__(self, predicted_mean, variance):
+        self.predicted_mean = predicted_mean
+        self.var_pred_mean = variance
+
+    def conf_int(self, alpha=0.05):
+        z = NormalDist().inv_cdf(1 - alpha / 2)
+        half_width = z * np.sqrt(self.var_pred_mean)
+        return np.column_stack([self.predicted_mean - half_width, self.predicted_mean + half_width])
+
+
+class CompactForecaster:
+    """Forecaster yang dibangun dari artefak ringkas; cukup untuk `get_forecast` pada skala log1p."""
+
+    def __init__(self, header, arrays):
+        self.header = header
+        self.spec = header["spec"]
+        self.param_names = header["param_names"]
+        self.nobs = header["nobs"]
+        self.checksum = header["checksum"]
+        self.params = arrays["params"]
+        self.state = arrays["state"]
+        self.state_cov = arrays["state_cov_final"]
+        self.matrices = {name: arrays[name] for name in SYSTEM_MATRICES}
+        # (F, P) steady state bila filter sudah konvergen; keduanya tidak lagi diperbarui
+        self.converged = None
+        if header.get("converged"):
+            self.converged = (header["converged_forecast_error_cov"], arrays["converged_state_cov"])
+
+    @property
+    def arrays(self):
+        """Semua array artefak (matriks sistem, parameter, state akhir), seperti yang disimpan di `.npz`."""
+        arrays = dict(self.matrices, params=self.params, state=self.state, state_cov_final=self.state_cov)
+        if self.converged is not None:
+            arrays["converged_state_cov"] = self.converged[1]
+        return arrays
+
+    @property
+    def aic(self):
+        return self.header.get("aic")
+
+    def extend(self, y, history_sha256=None):
+        """Lanjutkan filter Kalman dengan observasi baru (skala asli) memakai parameter yang sama.
+
+        `history_sha256` adalah hash seluruh deret setelah diperpanjang (lihat
+        `history_checksum`); dicatat di header agar update berikutnya bisa
+        memverifikasi riwayat. Mengembalikan `(forecaster_baru, z)` dengan `z` inovasi terstandardisasi
+        satu-langkah untuk setiap observasi baru (NaN untuk observasi kosong).
+
+        Seperti filter statsmodels, begitu P_{t+1} praktis sama dengan P_t
+        (`CONVERGENCE_TOLERANCE`) F dan P dibekukan pada nilai steady state.
+        """
+        m = self.matrices
+        Z, d, H = m["design"], m["obs_intercept"], m["obs_cov"]
+        T, c = m["transition"], m["state_intercept"]
+        RQR = m["selection"] @ m["state_cov"] @ m["selection"].T
+        a, P = self.state.copy(), self.state_cov.copy()
+        converged = self.converged
+        y_log = np.log1p(np.asarray(y, dtype="float64"))
+        z = np.full(len(y_log), np.nan)
+        previous_missing = False
+        for t, value in enumerate(y_log):
+            if not np.isfinite(value):
+                # Observasi kosong: hanya prediksi, dengan kovarians dihitung penuh
+                converged = None
+                a = T @ a + c
+                P = T @ P @ T.T + RQR
+                previous_missing = True
+                continue
+            F = converged[0] if converged is not None else (Z @ P @ Z.T + H)[0, 0]
+            K = (P @ Z.T)[:, 0] / F
+            v = value - (Z @ a + d)[0]
+            z[t] = v / np.sqrt(F)
+            a = T @ (a + K * v) + c
+            if converged is not None:
+                P = converged[1]
+            else:
+                P_next = T @ (P - np.outer(K, K) * F) @ T.T + RQR
+                if not previous_missing and np.sum((P_next - P) ** 2) < CONVERGENCE_TOLERANCE:
+                    converged = (float(F), P)
+                P = P_next
+            previous_missing = False
+
+        header = dict(self.header, format_version=FORMAT_VERSION, nobs=self.nobs + len(y_log),
+                      updates_since_fit=self.header.get("updates_since_fit", 0) + 1,
+                      converged=converged is not None,
+                      converged_forecast_error_cov=converged[0] if converged is not None else None)
+        if history_sha256 is not None:
+            header["history_sha256"] = history_sha256
+        arrays = dict(self.matrices, params=self.params, state=a, state_cov_final=P)
+        if converged is not None:
+            arrays["converged_state_cov"] = converged[1]
+        header["checksum"] = _checksum(header, arrays)
+        return CompactForecaster(header, arrays), z
+
+    def get_forecast(self, steps):
+        m = self.matrices
+        Z, d, H = m["design"], m["obs_intercept"], m["obs_cov"]
+        T, c = m["transition"], m["state_intercept"]
+        RQR = m["selection"] @ m["state_cov"] @ m["selection"].T
+        a, P = self.state.copy(), self.state_cov.copy()
+        mean = np.empty(steps)
+        variance = np.empty(steps)
+        for h in range(steps):
+            mean[h] = (Z @ a + d)[0]
+            variance[h] = (Z @ P @ Z.T + H)[0, 0]
+            a = T @ a + c
+            P = T @ P @ T.T + RQR
+        return ForecastResult(mean, variance)
+
+
+def compact_from_results(results):
+    """Ambil isi artefak (header, arrays) dari `SARIMAXResults` hasil fit."""
+    model = results.model
+    filter_results = results.filter_results
+    arrays = {
+        "params": np.asarray(results.params, dtype="float64"),
+        "state": np.asarray(results.predicted_state[:, -1], dtype="float64"),
+        "state_cov_final": np.asarray(results.predicted_state_cov[:, :, -1], dtype="float64"),
+    }
+    for name in SYSTEM_MATRICES:
+        matrix = np.asarray(getattr(filter_results, name), dtype="float64")
+        if matrix.shape[-1] != 1:
+            raise ArtifactError(f"Matriks '{name}' berubah terhadap waktu; tidak didukung artefak ringkas.")
+        arrays[name] = matrix[..., 0]
+    converged = bool(filter_results.converged)
+    if converged:
+        arrays["converged_state_cov"] = np.asarray(
+            filter_results.predicted_state_cov[:, :, filter_results.period_converged], dtype="float64")
+    header = {
+        "format_version": FORMAT_VERSION,
+        "spec": {
+            "order": list(model.order),
+            "seasonal_order": list(model.seasonal_order),
+            "enforce_stationarity": bool(model.enforce_stationarity),
+            "enforce_invertibility": bool(model.enforce_invertibility),
+            "transform": "log1p",
+        },
+        "param_names": list(model.param_names),
+        "nobs": int(results.nobs),
+        "aic": float(results.aic),
+        "history_sha256": history_checksum(model.endog[:, 0] if model.endog.ndim == 2 else model.endog),
+        "fitted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "updates_since_fit": 0,
+        "converged": converged,
+        "converged_forecast_error_cov": (
+            float(filter_results.forecasts_error_cov[0, 0, filter_results.period_converged]) if converged else None),
+    }
+    header["checksum"] = _checksum(header, arrays)
+    return header, arrays
+
+
+def as_compact(model):
+    """`CompactForecaster` dari model apa pun yang dimuat (artefak ringkas atau `SARIMAXResults`)."""
+    if isinstance(model, CompactForecaster):
+        return model
+    return CompactForecaster(*compact_from_results(model))
+
+
+def save_compact(model, path):
+    """Simpan artefak ringkas secara atomik (file sementara + `os.replace`)."""
+    compact = as_compact(model)
+    header, arrays = compact.header, compact.arrays
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp.npz")
+    try:
+        np.savez(tmp_path, header=np.array(json.dumps(header)), **arrays)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return header
+
+
+def load_compact(path):
+    """Muat artefak dan verifikasi versi serta checksum-nya; file yang tidak bisa dibaca juga `ArtifactError`."""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data["header"]))
+            arrays = {name: data[name] for name in data.files if name != "header"}
+    except FileNotFoundError:
+        raise
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        raise ArtifactError(f"Artefak model rusak: {e}")
+    if header.get("format_version") not in SUPPORTED_VERSIONS:
+        raise ArtifactError(f"Versi artefak model {header.get('format_version')} tidak didukung.")
+    if _checksum(header, arrays) != header.get("checksum"):
+        raise ArtifactError("Artefak model rusak: checksum tidak cocok.")
+    return CompactForecaster(header, arrays)
@@ -0,0 +1,147 @@
+"""Forecast banyak deret (toko/SKU) sekaligus.
+
+Input berupa tabel long-format: satu kolom kunci deret plus 'Periode' dan
+'Pemasukan'. Nilai seluruh deret disalin sekali ke shared memory; setiap worker
+hanya menerima (kunci, rentang baris) sehingga data tidak di-pickle per tugas.
+Setiap deret di-fit dengan SARIMAX log1p yang sama seperti aplikasi, pada
+frekuensi `freq` (bulanan atau mingguan). Baris per deret direduksi per periode
+seperti ingest: nilai terakhir (`LATEST`) atau jumlah (`SUM`, periode tanpa
+transaksi diisi 0).
+"""
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from revflux.ingest import LATEST, SUM
+from revflux.jobs import process_context
+from revflux.modeling import (DEFAULT_ORDER, DEFAULT_SEASONAL_ORDER, fit_sarimax, forecast_frame, future_periods,
+                              seasonal_order_for)
+from revflux.preprocessing import MONTHLY, fill_missing_periods, preprocess_period_column
+
+SERIES_KEY = "series"
+DEFAULT_STEPS = 24
+
+OK = "ok"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+_shared = {}
+
+
+@dataclass
+class BatchResult:
+    forecasts: pd.DataFrame
+    series_report: pd.DataFrame
+    wall_time: float
+
+    @property
+    def failures(self):
+        return self.series_report[self.series_report["status"] != OK]
+
+
+def _attach_shared(periods_name, values_name, n_rows):
+    """Initializer worker: buka blok shared memory sekali per proses."""
+    periods_shm = SharedMemory(name=periods_name)
+    values_shm = SharedMemory(name=values_name)
+    _shared["handles"] = (periods_shm, values_shm)
+    _shared["periods"] = np.ndarray((n_rows,), dtype="datetime64[ns]", buffer=periods_shm.buf)
+    _shared["values"] = np.ndarray((n_rows,), dtype="float64", buffer=values_shm.buf)
+
+
+def _forecast_series(task):
+    key, start, stop, steps, order, seasonal_order, min_obs, freq = task
+    started = time.perf_counter()
+    report = {SERIES_KEY: key, "n_obs": stop - start, "status": OK, "error": None}
+    forecast = None
+    # Salin irisan kecil agar model tidak memegang referensi ke buffer shared memory.
+    values = _shared["values"][start:stop].copy()
+    if len(values) < min_obs:
+        report.update(status=SKIPPED, error=f"hanya {len(values)} periode (minimal {min_obs})")
+    else:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                model = fit_sarimax(values, order, seasonal_order)
+                forecast = forecast_frame(model, steps)
+            forecast.insert(0, "Periode", future_periods(_shared["periods"][stop - 1], steps, freq))
+            forecast.insert(0, SERIES_KEY, key)
+        except Exception as e:
+            report.update(status=FAILED, error=str(e))
+    report["fit_seconds"] = time.perf_counter() - started
+    return forecast, report
+
+
+def prepare_long_table(table, key=SERIES_KEY, freq=MONTHLY, combine=LATEST):
+    """Normalisasi periode ke `freq`, reduksi per (key, Periode), urutkan per deret.
+
+    `LATEST`: nilai terakhir per periode (last-write-wins). `SUM`: jumlah per periode,
+    dan periode kosong di tengah setiap deret diisi 0.
+    """
+    table = preprocess_period_column(table[[key, "Periode", "Pemasukan"]], freq)
+    if combine == SUM:
+        totals = table.groupby([key, "Periode"], sort=True, as_index=False)["Pemasukan"].sum()
+        series = [fill_missing_periods(group, freq).assign(**{key: name})
+                  for name, group in totals.groupby(key, sort=True)]
+        table = pd.concat(series, ignore_index=True)[[key, "Periode", "Pemasukan"]] if series else totals
+    elif combine == LATEST:
+        table = table.drop_duplicates(subset=[key, "Periode"], keep="last")
+    else:
+        raise ValueError(f"Mode reduksi tidak dikenal: {combine!r} (pilihan: {LATEST}, {SUM}).")
+    return table.sort_values([key, "Periode"], kind="stable").reset_index(drop=True)
+
+
+def forecast_many(table, key=SERIES_KEY, steps=DEFAULT_STEPS, order=DEFAULT_ORDER,
+                  seasonal_order=DEFAULT_SEASONAL_ORDER, max_workers=None, min_obs=None, freq=MONTHLY, combine=LATEST):
+    """Fit dan forecast setiap deret di `table` secara paralel; kembalikan `BatchResult`.
+
+    Kolom hasil forecast: kunci deret (`series`), Periode, Pemasukan, Batas Bawah,
+    Batas Atas. Periode musiman `seasonal_order` mengikuti `freq` (12 atau 52) dan
+    `combine` menentukan reduksi per periode (lihat `prepare_long_table`). Deret yang
+    lebih pendek dari `min_obs` (bawaan: dua musim) dilewati, deret yang gagal di-fit
+    dicatat di `series_report` tanpa menghentikan batch.
+    """
+    started = time.perf_counter()
+    seasonal_order = seasonal_order_for(freq, seasonal_order)
+    table = prepare_long_table(table, key, freq, combine)
+    min_obs = min_obs if min_obs is not None else 2 * seasonal_order[3]
+    n_rows = len(table)
+
+    keys = table[key].to_numpy()
+    boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate([[0], boundaries]) if n_rows else np.array([], dtype=int)
+    stops = np.concatenate([boundaries, [n_rows]]) if n_rows else np.array([], dtype=int)
+    tasks = [(keys[a], int(a), int(b), steps, tuple(order), tuple(seasonal_order), min_obs, freq)
+             for a, b in zip(starts, stops)]
+
+    periods_shm = SharedMemory(create=True, size=max(n_rows, 1) * 8)
+    values_shm = SharedMemory(create=True, size=max(n_rows, 1) * 8)
+    try:
+        np.ndarray((n_rows,), dtype="datetime64[ns]", buffer=periods_shm.buf)[:] = table["Periode"].to_numpy("datetime64[ns]")
+        np.ndarray((n_rows,), dtype="float64", buffer=values_shm.buf)[:] = table["Pemasukan"].to_numpy("float64")
+        max_workers = max_workers or os.cpu_count()
+        chunksize = max(1, len(tasks) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=process_context(),
+                                 initializer=_attach_shared,
+                                 initargs=(periods_shm.name, values_shm.name, n_rows)) as executor:
+            outputs = list(executor.map(_forecast_series, tasks, chunksize=chunksize))
+    finally:
+        periods_shm.close()
+        periods_shm.unlink()
+        values_shm.close()
+        values_shm.unlink()
+
+    forecasts = [f for f, _ in outputs if f is not None]
+    columns = [SERIES_KEY, "Periode", "Pemasukan", "Batas Bawah", "Batas Atas"]
+    forecasts = pd.concat(forecasts, ignore_index=True) if forecasts else pd.DataFrame(columns=columns)
+    if key != SERIES_KEY:
+        forecasts = forecasts.rename(columns={SERIES_KEY: key})
+    series_report = pd.DataFrame([r for _, r in outputs], columns=[SERIES_KEY, "n_obs", "status", "error", "fit_seconds"])
+    if key != SERIES_KEY:
+        series_report = series_report.rename(columns={SERIES_KEY: key})
+    return BatchResult(forecasts=forecasts, series_report=series_report, wall_time=time.perf_counter() - started)
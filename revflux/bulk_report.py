@@ -0,0 +1,155 @@
+"""Pembuatan laporan PowerPoint massal untuk banyak dataset sekaligus.
+
+Setiap dataset memakai model yang sudah tersimpan (tidak ada training ulang),
+figure dari `revflux.charts`, dan `build_report_pptx` yang sama dengan tombol
+ekspor di Streamlit, sehingga dek massal identik dengan ekspor manual. Dataset
+diproses paralel di thread pool; semua thread berbagi satu `ChartRenderer`
+sehingga server kaleido hanya dibuka sekali dan batas tab Chromium tetap
+berlaku. Hasil ditulis sebagai `laporan_prediksi_{dataset}.pptx` ke direktori,
+atau ke satu arsip `.zip` bila path keluaran berakhiran `.zip`.
+"""
+import math
+import os
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from revflux.charts import bar_chart, ci_chart, line_chart, report_charts
+from revflux.modeling import forecast_frame, future_periods, load_model
+from revflux.report import RENDER_WORKERS, ChartRenderer, build_report_pptx
+
+DEFAULT_STEPS = 12
+DEFAULT_TAIL_PERIODS = 12
+
+OK = "ok"
+FAILED = "failed"
+
+REPORT_COLUMNS = ["dataset", "status", "error", "forecast_seconds", "render_seconds", "build_seconds", "size_bytes"]
+
+
+def report_filename(dataset):
+    return f"laporan_prediksi_{dataset}.pptx"
+
+
+@dataclass
+class BulkReportResult:
+    datasets: pd.DataFrame
+    wall_time: float
+    output: Path
+
+    @property
+    def failures(self):
+        return self.datasets[self.datasets["status"] != OK]
+
+    @property
+    def reports_per_sec(self):
+        succeeded = len(self.datasets) - len(self.failures)
+        return succeeded / self.wall_time if self.wall_time else math.nan
+
+    def summary(self):
+        """Ringkasan throughput satu baris (jumlah dek, waktu per tahap, ukuran total)."""
+        return {
+            "reports": int((self.datasets["status"] == OK).sum()),
+            "failures": len(self.failures),
+            "wall_time": self.wall_time,
+            "reports_per_sec": self.reports_per_sec,
+            "forecast_seconds_total": float(self.datasets["forecast_seconds"].sum()),
+            "render_seconds_total": float(self.datasets["render_seconds"].sum()),
+            "build_seconds_total": float(self.datasets["build_seconds"].sum()),
+            "size_bytes_total": int(self.datasets["size_bytes"].sum()),
+        }
+
+
+def build_dataset_report(store, name, renderer, steps=DEFAULT_STEPS, tail_periods=DEFAULT_TAIL_PERIODS):
+    """Forecast dari model tersimpan lalu bangun dek `name`; kembalikan (bytes .pptx, waktu per tahap)."""
+    started = time.perf_counter()
+    model_path = store.resolve_model_path(name)
+    if model_path is None:
+        raise FileNotFoundError("model belum dilatih")
+    model = load_model(model_path)
+    hist_data = store.load(name)
+    forecast_df = forecast_frame(model, steps)
+    forecast_df.insert(0, "Periode", future_periods(hist_data["Periode"].iloc[-1], steps, store.frequency(name)))
+
+    charts = report_charts(line_chart(hist_data, forecast_df, name), ci_chart(hist_data, forecast_df),
+                           bar_chart(hist_data, forecast_df, tail_periods))
+    forecasted = time.perf_counter()
+    images = renderer.render_many(charts)
+    rendered = time.perf_counter()
+    deck = build_report_pptx(name, hist_data, forecast_df, charts, images)
+    timings = {
+        "forecast_seconds": forecasted - started,
+        "render_seconds": rendered - forecasted,
+        "build_seconds": time.perf_counter() - rendered,
+    }
+    return deck, timings
+
+
+def _report_task(store, name, renderer, steps, tail_periods):
+    report = {"dataset": name, "status": OK, "error": None,
+              "forecast_seconds": 0.0, "render_seconds": 0.0, "build_seconds": 0.0, "size_bytes": 0}
+    deck = None
+    try:
+        deck, timings = build_dataset_report(store, name, renderer, steps, tail_periods)
+        report.update(timings, size_bytes=len(deck))
+    except Exception as e:
+        report.update(status=FAILED, error=str(e))
+    return deck, report
+
+
+def generate_reports(store, datasets, output, steps=DEFAULT_STEPS, tail_periods=DEFAULT_TAIL_PERIODS,
+                     max_workers=None, renderer=None, progress=None):
+    """Buat dek laporan untuk setiap nama di `datasets`; kembalikan `BulkReportResult`.
+
+    `output` berupa direktori (dibuat bila belum ada) atau path `.zip`. Dataset
+    yang gagal (mis. belum punya model) dicatat tanpa menghentikan proses lain.
+    `progress(selesai, total)` dipanggil setiap kali satu dataset selesai.
+    """
+    started = time.perf_counter()
+    output = Path(output)
+    as_zip = output.suffix.lower() == ".zip"
+    if as_zip:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+        archive = zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_STORED)
+    else:
+        output.mkdir(parents=True, exist_ok=True)
+    renderer = renderer or ChartRenderer()
+    # Tahap forecast & python-pptx ringan; render Chromium dibatasi oleh worker renderer.
+    max_workers = max_workers or max(RENDER_WORKERS, min(len(datasets), os.cpu_count() or 1))
+
+    reports = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk-report") as executor:
+            futures = [executor.submit(_report_task, store, name, renderer, steps, tail_periods) for name in datasets]
+            # File ditulis dari thread ini saja: ZipFile tidak aman dipakai bersama antar thread.
+            for done, future in enumerate(as_completed(futures), 1):
+                deck, report = future.result()
+                if deck is not None:
+                    if as_zip:
+                        # .pptx sudah terkompresi (zip), jadi disimpan apa adanya.
+                        archive.writestr(report_filename(report["dataset"]), deck)
+                    else:
+                        path = output / report_filename(report["dataset"])
+                        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                        tmp.write_bytes(deck)
+                        os.replace(tmp, path)
+                reports.append(report)
+                if progress is not None:
+                    progress(done, len(futures))
+        if as_zip:
+            archive.close()
+            os.replace(tmp_path, output)
+    finally:
+        if as_zip:
+            archive.close()
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    order = {name: i for i, name in enumerate(datasets)}
+    table = pd.DataFrame(sorted(reports, key=lambda r: order[r["dataset"]]), columns=REPORT_COLUMNS)
+    return BulkReportResult(datasets=table, wall_time=time.perf_counter() - started, output=output)
@@ -0,0 +1,108 @@
+"""Figure Plotly untuk halaman prediksi dan laporan PowerPoint.
+
+Halaman Streamlit, ekspor satu dataset, dan laporan massal memakai fungsi yang
+sama sehingga grafik di layar dan di slide selalu identik.
+
+Grafik garis dibangun dua tahap: figure dasar berisi histori aktual yang sudah
+di-downsample (lihat revflux.downsampling) dan bisa di-cache per versi dataset,
+lalu trace prediksi ditambahkan ke salinannya. Dengan begitu jumlah titik yang
+dikirim ke browser dibatasi `MAX_HISTORY_POINTS` berapa pun panjang histori,
+dan perubahan horizon hanya membangun ulang trace prediksi.
+"""
+import pandas as pd
+
+from revflux.downsampling import LTTB, downsample_indices
+from revflux.instrumentation import stage
+
+COLORS = {"Aktual": "#3498db", "Prediksi": "#e74c3c"}
+MAX_HISTORY_POINTS = 2000
+
+LINE_TITLE = "📈 Aktual vs Prediksi Pemasukan — Dataset: {dataset}"
+CI_TITLE = "🎯 Prediksi Pemasukan dengan Rentang Keyakinan (Confidence Interval)"
+
+
+def downsample_history(hist_data, max_points=MAX_HISTORY_POINTS, method=LTTB):
+    """Baris histori yang cukup untuk menggambar garis; tanpa salinan bila sudah di bawah batas."""
+    if len(hist_data) <= max_points:
+        return hist_data
+    keep = downsample_indices(hist_data["Periode"].to_numpy(), hist_data["Pemasukan"].to_numpy(), max_points, method)
+    return hist_data.iloc[keep]
+
+
+def combine_actual_forecast(hist_data, forecast_df):
+    """Gabungkan data aktual dan prediksi dengan kolom `Tipe` untuk pewarnaan."""
+    return pd.concat([
+        hist_data[["Periode", "Pemasukan"]].assign(Tipe="Aktual"),
+        forecast_df[["Periode", "Pemasukan"]].assign(Tipe="Prediksi"),
+    ], ignore_index=True)
+
+
+@stage("charts.line_base")
+def line_chart_base(hist_data, dataset, max_points=MAX_HISTORY_POINTS):
+    """Figure garis berisi histori aktual saja; aman di-cache selama dataset tidak berubah."""
+    import plotly.graph_objects as go
+
+    shown = downsample_history(hist_data, max_points)
+    fig = go.Figure(go.Scatter(x=shown["Periode"], y=shown["Pemasukan"], mode="lines+markers", name="Aktual",
+                               legendgroup="Aktual", line=dict(color=COLORS["Aktual"])))
+    fig.update_layout(title=LINE_TITLE.format(dataset=dataset), legend_title_text="Jenis Data",
+                      yaxis_title="Pemasukan (Rp)", xaxis_title="Periode")
+    return fig
+
+
+@stage("charts.line")
+def line_chart(hist_data, forecast_df, dataset, base=None):
+    """Aktual vs prediksi; `base` (hasil `line_chart_base`) tidak diubah, trace prediksi ditambahkan ke salinannya."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(base if base is not None else line_chart_base(hist_data, dataset))
+    fig.add_scatter(x=forecast_df["Periode"], y=forecast_df["Pemasukan"], mode="lines+markers", name="Prediksi",
+                    legendgroup="Prediksi", line=dict(color=COLORS["Prediksi"]))
+    return fig
+
+
+@stage("charts.ci_base")
+def ci_chart_base(hist_data, max_points=MAX_HISTORY_POINTS):
+    """Figure rentang keyakinan berisi histori aktual saja; aman di-cache selama dataset tidak berubah."""
+    import plotly.graph_objects as go
+
+    shown = downsample_history(hist_data, max_points)
+    fig = go.Figure(go.Scatter(x=shown["Periode"], y=shown["Pemasukan"], mode="lines", name="Aktual",
+                               showlegend=True, line=dict(color=COLORS["Aktual"])))
+    fig.update_layout(title=CI_TITLE, yaxis_title="Pemasukan (Rp)", xaxis_title="Periode", legend_title_text="Keterangan")
+    return fig
+
+
+@stage("charts.ci")
+def ci_chart(hist_data, forecast_df, base=None):
+    """Aktual + prediksi dengan batas atas/bawah; `forecast_df` memuat kolom Batas Bawah & Batas Atas."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(base if base is not None else ci_chart_base(hist_data))
+    fig.add_scatter(x=forecast_df["Periode"], y=forecast_df["Pemasukan"], mode="lines", name="Prediksi", line=dict(color=COLORS["Prediksi"]))
+    fig.add_scatter(x=forecast_df["Periode"], y=forecast_df["Batas Atas"], mode="lines", line=dict(dash="dash", color="green"), name="Batas Atas CI")
+    fig.add_scatter(x=forecast_df["Periode"], y=forecast_df["Batas Bawah"], mode="lines", line=dict(dash="dash", color="yellow"), name="Batas Bawah CI")
+    return fig
+
+
+@stage("charts.bar")
+def bar_chart(hist_data, forecast_df, tail_periods=12):
+    """Batang N periode terakhir dari gabungan aktual + prediksi; hanya ekor histori yang disalin."""
+    import plotly.express as px
+
+    bar_data = combine_actual_forecast(hist_data.tail(tail_periods), forecast_df).tail(tail_periods)
+    fig = px.bar(bar_data, x="Periode", y="Pemasukan", color="Tipe",
+                 barmode="group", title=f"📊 Perbandingan Pemasukan Bulanan (Aktual vs Prediksi) — {tail_periods} Bulan Terakhir",
+                 labels={"Pemasukan": "Pemasukan (Rp)"},
+                 color_discrete_map=COLORS)
+    fig.update_layout(xaxis_title="Periode", yaxis_title="Pemasukan (Rp)", legend_title_text="Jenis Data")
+    return fig
+
+
+def report_charts(fig_line, fig_ci, fig_bar):
+    """Pasangan (judul slide, figure) dengan urutan slide laporan."""
+    return [
+        ("Grafik Aktual vs Prediksi", fig_line),
+        ("Grafik Rentang Keyakinan Prediksi", fig_ci),
+        ("Grafik Perbandingan Bulanan", fig_bar),
+    ]
@@ -0,0 +1,411 @@
+"""CLI RevFlux untuk ingest, training, dan forecast tanpa Streamlit.
+
+Contoh:
+    python -m revflux ingest --dataset toko_a penjualan_2025.xlsx
+    python -m revflux ingest --dataset toko_b --aggregate --freq W transaksi_pos.csv
+    python -m revflux train --all --auto-order
+    python -m revflux update --all --compare-refit
+    python -m revflux forecast --all --steps 12 --output forecast.parquet
+    python -m revflux batch --input semua_toko.csv --key toko --output forecast_toko.csv
+    python -m revflux batch --input transaksi_toko.csv --key toko --aggregate --freq W --output forecast_mingguan.csv
+    python -m revflux backtest --all --folds 24 --horizon 12 --output akurasi.csv
+    python -m revflux report --all --steps 12 --output laporan_bulanan.zip
+    python -m revflux snapshots --dataset toko_a
+    python -m revflux rollback --dataset toko_a --snapshot 42
+    python -m revflux migrate-legacy --source /srv/revflux_lama
+    python -m revflux serve --host 0.0.0.0 --port 8000   # GET /forecast?dataset=toko_a&steps=12
+    python -m revflux --perf-log perf.jsonl --profile cprofile forecast --all --steps 12
+
+Untuk cron (setiap tanggal 1; laporan dibuat setelah model diperbarui):
+    0 2 1 * * cd /srv/revflux && python -m revflux update --all && python -m revflux forecast --all --output forecast.parquet
+    30 2 1 * * cd /srv/revflux && python -m revflux report --all --output laporan_bulanan.zip
+
+Modul ini sengaja tidak mengimpor streamlit, plotly, maupun python-pptx di tingkat
+modul; hanya subperintah `report` yang memuatnya (dan `serve` yang memuat uvicorn).
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from revflux.instrumentation import PROFILERS, Profiler, configure_json_log, log_trace, max_rss, start_trace
+from revflux.registry import validate_dataset_name
+from revflux.storage import DatasetStore, require_periods
+
+
+class ResultWriter:
+    """Tulis hasil secara bertahap ke CSV atau Parquet (ditentukan dari ekstensi), satu potongan per dataset."""
+
+    def __init__(self, path):
+        self.path = Path(path) if path else None
+        self._parquet = None
+        self._csv_started = False
+
+    def write(self, df):
+        if self.path is None:
+            df.to_csv(sys.stdout, index=False, header=not self._csv_started, date_format="%Y-%m-%d")
+            self._csv_started = True
+        elif self.path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            df.to_csv(self.path, index=False, mode="a" if self._csv_started else "w",
+                      header=not self._csv_started, date_format="%Y-%m-%d")
+            self._csv_started = True
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def resolve_datasets(store, args):
+    if args.all:
+        return store.list_datasets()
+    if not args.dataset:
+        raise SystemExit("Gunakan --dataset NAMA (boleh berulang) atau --all.")
+    return args.dataset
+
+
+def read_upload(path):
+    path = Path(path)
+    if path.suffix.lower() in (".xlsx", ".xls"):
+        return pd.read_excel(path)
+    return pd.read_csv(path)
+
+
+def dataset_frequency(store, name, requested):
+    """Frekuensi dataset: yang tersimpan untuk dataset lama, `requested` (bawaan bulanan) untuk dataset baru."""
+    if store.exists(name):
+        freq = store.frequency(name)
+        if requested and requested != freq:
+            raise SystemExit(f"Dataset '{name}' berfrekuensi {freq}; tidak bisa di-ingest sebagai {requested}.")
+        return freq
+    return requested or store.frequency(name)
+
+
+def cmd_ingest(store, args):
+    from revflux.ingest import LATEST, SUM, stream_upload
+
+    name = args.dataset[0]
+    freq = dataset_frequency(store, name, args.freq)
+    for path in args.files:
+        upload = stream_upload(path, freq, combine=SUM if args.aggregate else LATEST,
+                               chunksize=args.chunksize, track_memory=args.track_memory)
+        require_periods(upload.data)
+        if not store.exists(name):
+            store.set_frequency(name, freq)
+        result = store.upsert(name, upload.data, accumulate=args.accumulate)
+        peak = upload.peak_memory if upload.peak_memory is not None else max_rss()
+        log(f"{name}: {path} -> {result.inserted} periode baru, {result.updated} diperbarui "
+            f"({upload.rows_read} baris, {upload.rows_dropped} dibuang, {upload.chunks} potongan, "
+            f"{upload.rows_per_sec:,.0f} baris/detik"
+            + (f", puncak memori {peak / 2**20:,.0f} MB" if peak else "")
+            + f"; format: {upload.period_formats})")
+    return 0
+
+
+def cmd_train(store, args):
+    from revflux.modeling import fit_sarimax, save_model, seasonal_order_for
+
+    failures = 0
+    for name in resolve_datasets(store, args):
+        started = time.perf_counter()
+        try:
+            y = store.load(name)["Pemasukan"].to_numpy()
+            seasonal_order = seasonal_order_for(store.frequency(name))
+            if args.auto_order:
+                from revflux.grid_search import candidate_grid, grid_search
+
+                report = grid_search(y, candidates=candidate_grid(s=seasonal_order[3]),
+                                     criterion=args.criterion, max_workers=args.workers)
+                model, spec = report.model, f"{report.best.order}{report.best.seasonal_order}"
+            else:
+                model, spec = fit_sarimax(y, seasonal_order=seasonal_order), f"default{seasonal_order}"
+            store.snapshot(name, "sebelum training")
+            save_model(model, store.model_path(name))
+            log(f"{name}: model {spec} tersimpan ({len(y)} periode, {time.perf_counter() - started:.1f} detik)")
+        except Exception as e:
+            failures += 1
+            log(f"{name}: GAGAL training: {e}")
+    return 1 if failures else 0
+
+
+def cmd_update(store, args):
+    from revflux.updating import update_model
+
+    failures = 0
+    for name in resolve_datasets(store, args):
+        try:
+            store.snapshot(name, "sebelum update model")
+            report = update_model(store, name, drift_threshold=args.drift_threshold, max_updates=args.max_updates,
+                                  force_refit=args.force_refit, compare_refit=args.compare_refit)
+            message = f"{name}: {report.mode} ({report.reason}), {report.n_new} periode baru, {report.elapsed:.2f} detik"
+            if args.compare_refit and report.mode == "extended":
+                message += f", selisih vs refit maks {report.refit_max_rel_diff:.2%}"
+            log(message)
+        except Exception as e:
+            failures += 1
+            log(f"{name}: GAGAL update: {e}")
+    return 1 if failures else 0
+
+
+def cmd_forecast(store, args):
+    from revflux.modeling import forecast_frame, future_periods, load_model
+
+    writer = ResultWriter(args.output)
+    failures = 0
+    try:
+        for name in resolve_datasets(store, args):
+            try:
+                model_path = store.resolve_model_path(name)
+                if model_path is None:
+                    raise FileNotFoundError("model belum dilatih")
+                model = load_model(model_path)
+                last_period = store.load(name)["Periode"].iloc[-1]
+                forecast = forecast_frame(model, args.steps)
+                forecast.insert(0, "Periode", future_periods(last_period, args.steps, store.frequency(name)))
+                forecast.insert(0, "dataset", name)
+                writer.write(forecast)
+                log(f"{name}: {args.steps} periode diprediksi")
+            except Exception as e:
+                failures += 1
+                log(f"{name}: GAGAL forecast: {e}")
+    finally:
+        writer.close()
+    return 1 if failures else 0
+
+
+def cmd_batch(store, args):
+    from revflux.batch import forecast_many
+    from revflux.ingest import LATEST, SUM
+
+    result = forecast_many(read_upload(args.input), key=args.key, steps=args.steps, max_workers=args.workers,
+                           freq=args.freq, combine=SUM if args.aggregate else LATEST)
+    writer = ResultWriter(args.output)
+    try:
+        writer.write(result.forecasts)
+    finally:
+        writer.close()
+    if args.report:
+        result.series_report.to_csv(args.report, index=False)
+    log(f"{len(result.series_report)} deret dalam {result.wall_time:.1f} detik, {len(result.failures)} gagal/dilewati")
+    return 1 if len(result.failures) else 0
+
+
+def cmd_backtest(store, args):
+    from revflux.backtest import backtest
+    from revflux.modeling import seasonal_order_for
+
+    writer = ResultWriter(args.output)
+    failures = 0
+    try:
+        for name in resolve_datasets(store, args):
+            try:
+                y = store.load(name)["Pemasukan"].to_numpy()
+                report = backtest(y, folds=args.folds, horizon=args.horizon, step=args.step,
+                                  seasonal_order=seasonal_order_for(store.frequency(name)),
+                                  max_workers=args.workers, warm_start=not args.cold_start)
+                per_horizon = report.per_horizon
+                per_horizon.insert(0, "dataset", name)
+                writer.write(per_horizon)
+                summary = report.summary()
+                log(f"{name}: {summary['folds']} fold, MAPE rata-rata {summary['mape_mean']:.2f}%, "
+                    f"{report.wall_time:.1f} detik ({report.fits_per_sec:.2f} fit/detik)")
+            except Exception as e:
+                failures += 1
+                log(f"{name}: GAGAL backtest: {e}")
+    finally:
+        writer.close()
+    return 1 if failures else 0
+
+
+def cmd_report(store, args):
+    from revflux.bulk_report import generate_reports
+
+    result = generate_reports(store, resolve_datasets(store, args), args.output, steps=args.steps,
+                              tail_periods=args.tail, max_workers=args.workers)
+    for row in result.failures.itertuples():
+        log(f"{row.dataset}: GAGAL laporan: {row.error}")
+    if args.report:
+        result.datasets.to_csv(args.report, index=False)
+    summary = result.summary()
+    log(f"{summary['reports']} laporan -> {result.output} dalam {result.wall_time:.1f} detik "
+        f"({summary['reports_per_sec']:.2f} laporan/detik; render {summary['render_seconds_total']:.1f} detik, "
+        f"{summary['size_bytes_total'] / 1e6:.1f} MB), {summary['failures']} gagal")
+    return 1 if summary["failures"] else 0
+
+
+def cmd_snapshots(store, args):
+    for name in resolve_datasets(store, args):
+        for snap in store.snapshots(name):
+            print(f"{name}\t#{snap['id']}\t{snap['created_at']}\tdata v{snap['data_version']}\t"
+                  f"{'model' if snap['model_file'] else 'tanpa model'}\t{snap['reason']}")
+    return 0
+
+
+def cmd_rollback(store, args):
+    name = args.dataset[0]
+    if not store.rollback(name, args.snapshot):
+        raise SystemExit(f"Snapshot tidak ditemukan untuk dataset '{name}'.")
+    log(f"{name}: dikembalikan ke snapshot #{args.snapshot or 'terbaru'}")
+    return 0
+
+
+def cmd_migrate_legacy(store, args):
+    migrated = store.migrate_legacy(args.source)
+    log(f"{len(migrated)} dataset dimigrasi" + (f": {', '.join(migrated)}" if migrated else ""))
+    return 0
+
+
+def cmd_serve(store, args):
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("Subperintah serve membutuhkan server ASGI: pip install uvicorn")
+    from revflux.serving import ForecastApp, ForecastService
+
+    service = ForecastService(store, max_entries=args.cache_size, precompute_steps=args.precompute,
+                              batch_window=args.batch_window_ms / 1000)
+    log(f"Layanan forecast di http://{args.host}:{args.port}/forecast?dataset=NAMA&steps=12")
+    # Satu proses: cache model & batch hanya berlaku di dalam proses yang sama.
+    uvicorn.run(ForecastApp(service), host=args.host, port=args.port, log_level=args.log_level)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="revflux", description="RevFlux: prediksi penjualan tanpa antarmuka web.")
+    parser.add_argument("--data-dir", default=".", help="Direktori penyimpanan dataset & model (bawaan: direktori kerja).")
+    parser.add_argument("--perf-log", help="Tambahkan waktu & memori per tahap perintah ini sebagai satu baris JSON ke file.")
+    parser.add_argument("--profile", choices=PROFILERS, help="Profil seluruh perintah dan cetak ringkasannya ke stderr.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_dataset_args(sub, allow_all=True):
+        sub.add_argument("--dataset", action="append", help="Nama dataset (boleh berulang).")
+        if allow_all:
+            sub.add_argument("--all", action="store_true", help="Proses semua dataset yang tersimpan.")
+
+    ingest = commands.add_parser("ingest", help="Upsert file CSV/XLSX (Periode, Pemasukan) ke dataset.")
+    add_dataset_args(ingest, allow_all=False)
+    ingest.add_argument("--freq", choices=("M", "W"), help="Frekuensi dataset baru: M bulanan (bawaan), W mingguan.")
+    ingest.add_argument("--aggregate", action="store_true",
+                        help="Data harian/transaksi: jumlahkan per periode alih-alih mengambil nilai terakhir.")
+    ingest.add_argument("--accumulate", action="store_true", help="Tambahkan ke total periode yang sudah ada, bukan menggantinya.")
+    ingest.add_argument("--chunksize", type=int, default=1_000_000, help="Baris per potongan saat membaca CSV/XLSX.")
+    ingest.add_argument("--track-memory", action="store_true",
+                        help="Ukur puncak alokasi ingest dengan tracemalloc (lebih lambat); bawaan: puncak RSS proses.")
+    ingest.add_argument("files", nargs="+")
+    ingest.set_defaults(handler=cmd_ingest)
+
+    train = commands.add_parser("train", help="Latih ulang model SARIMAX log1p dan simpan ke datasets/{dataset}/model.npz.")
+    add_dataset_args(train)
+    train.add_argument("--auto-order", action="store_true", help="Cari orde SARIMA lewat grid search paralel.")
+    train.add_argument("--criterion", default="aic", choices=("aic", "bic", "holdout"))
+    train.add_argument("--workers", type=int, default=None)
+    train.set_defaults(handler=cmd_train)
+
+    update = commands.add_parser("update", help="Perpanjang model tersimpan dengan periode baru; refit hanya bila perlu.")
+    add_dataset_args(update)
+    update.add_argument("--drift-threshold", type=float, default=3.0, help="Refit bila |inovasi terstandardisasi| melewati nilai ini.")
+    update.add_argument("--max-updates", type=int, default=12, help="Refit setelah sekian update inkremental.")
+    update.add_argument("--force-refit", action="store_true")
+    update.add_argument("--compare-refit", action="store_true", help="Laporkan selisih forecast terhadap refit penuh.")
+    update.set_defaults(handler=cmd_update)
+
+    forecast = commands.add_parser("forecast", help="Forecast dari model tersimpan ke CSV/Parquet (atau stdout).")
+    add_dataset_args(forecast)
+    forecast.add_argument("--steps", type=int, default=24)
+    forecast.add_argument("--output", help="File .csv atau .parquet; kosongkan untuk CSV ke stdout.")
+    forecast.set_defaults(handler=cmd_forecast)
+
+    batch = commands.add_parser("batch", help="Fit & forecast banyak deret dari satu tabel long-format.")
+    batch.add_argument("--input", required=True, help="CSV/XLSX dengan kolom kunci deret, Periode, Pemasukan.")
+    batch.add_argument("--key", default="series", help="Nama kolom kunci deret.")
+    batch.add_argument("--freq", choices=("M", "W"), default="M", help="Frekuensi deret: M bulanan (bawaan), W mingguan.")
+    batch.add_argument("--aggregate", action="store_true",
+                       help="Data harian/transaksi: jumlahkan per periode (periode kosong = 0) alih-alih nilai terakhir.")
+    batch.add_argument("--steps", type=int, default=24)
+    batch.add_argument("--workers", type=int, default=None)
+    batch.add_argument("--output", help="File .csv atau .parquet; kosongkan untuk CSV ke stdout.")
+    batch.add_argument("--report", help="Simpan laporan per deret (waktu, status) ke CSV.")
+    batch.set_defaults(handler=cmd_batch)
+
+    backtest = commands.add_parser("backtest", help="Backtest rolling-origin paralel: MAPE & RMSE per horizon.")
+    add_dataset_args(backtest)
+    backtest.add_argument("--folds", type=int, default=12)
+    backtest.add_argument("--horizon", type=int, default=12)
+    backtest.add_argument("--step", type=int, default=1, help="Jarak antar titik potong fold (periode).")
+    backtest.add_argument("--workers", type=int, default=None)
+    backtest.add_argument("--cold-start", action="store_true", help="Jangan pakai parameter fold sebelumnya sebagai warm start.")
+    backtest.add_argument("--output", help="File .csv atau .parquet; kosongkan untuk CSV ke stdout.")
+    backtest.set_defaults(handler=cmd_backtest)
+
+    report = commands.add_parser("report", help="Buat laporan PowerPoint per dataset dari model tersimpan.")
+    add_dataset_args(report)
+    report.add_argument("--steps", type=int, default=12, help="Jumlah bulan prediksi di setiap laporan.")
+    report.add_argument("--tail", type=int, default=12, help="Jumlah bulan terakhir pada grafik batang.")
+    report.add_argument("--workers", type=int, default=None)
+    report.add_argument("--output", required=True, help="Direktori tujuan file .pptx, atau path .zip untuk satu arsip.")
+    report.add_argument("--report", help="Simpan waktu per tahap & ukuran per dataset ke CSV.")
+    report.set_defaults(handler=cmd_report)
+
+    snapshots = commands.add_parser("snapshots", help="Daftar snapshot (versi data + model) yang bisa di-rollback.")
+    add_dataset_args(snapshots)
+    snapshots.set_defaults(handler=cmd_snapshots)
+
+    rollback = commands.add_parser("rollback", help="Kembalikan data & model dataset ke sebuah snapshot.")
+    add_dataset_args(rollback, allow_all=False)
+    rollback.add_argument("--snapshot", type=int, help="Id snapshot (bawaan: terbaru).")
+    rollback.set_defaults(handler=cmd_rollback)
+
+    migrate = commands.add_parser("migrate-legacy",
+                                  help="Salin dataset/model format lama ({nama}_data*, {nama}_model.*) ke registry.")
+    migrate.add_argument("--source", help="Direktori berisi file format lama (bawaan: --data-dir). File asli tidak diubah.")
+    migrate.set_defaults(handler=cmd_migrate_legacy)
+
+    serve = commands.add_parser("serve", help="Layanan HTTP forecast (GET /forecast?dataset=&steps=) dari model tersimpan.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--cache-size", type=int, default=32, help="Jumlah model yang disimpan di cache LRU.")
+    serve.add_argument("--precompute", type=int, default=24, help="Horizon forecast yang dihitung saat model dimuat.")
+    serve.add_argument("--batch-window-ms", type=float, default=2.0,
+                       help="Lama mengumpulkan request serentak untuk model yang sama sebelum dihitung.")
+    serve.add_argument("--log-level", default="warning")
+    serve.set_defaults(handler=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command in ("ingest", "rollback") and (not args.dataset or len(args.dataset) != 1):
+        raise SystemExit(f"{args.command} membutuhkan tepat satu --dataset.")
+    try:
+        for name in getattr(args, "dataset", None) or []:
+            validate_dataset_name(name)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if args.perf_log:
+        configure_json_log(args.perf_log)
+    trace = start_trace(f"cli {args.command}")
+    try:
+        profiler = Profiler(args.profile).start() if args.profile else None
+    except RuntimeError as e:
+        trace.finish()
+        raise SystemExit(f"Gagal memulai profiler: {e}")
+    try:
+        return args.handler(DatasetStore(args.data_dir), args)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            log(profiler.text)
+        log_trace(trace.finish(), argv=sys.argv[1:] if argv is None else list(argv))
@@ -0,0 +1,84 @@
+"""Downsampling deret waktu untuk grafik, supaya payload ke browser tetap terbatas.
+
+Keduanya mengembalikan indeks baris terurut (titik pertama dan terakhir selalu
+ikut), sehingga pemanggil bisa memotong DataFrame apa pun dengan `iloc`:
+
+- `lttb`: Largest-Triangle-Three-Buckets; mempertahankan bentuk visual garis.
+- `minmax`: titik minimum & maksimum per bucket; puncak/lembah tidak pernah hilang.
+"""
+import numpy as np
+
+LTTB = "lttb"
+MINMAX = "minmax"
+METHODS = (LTTB, MINMAX)
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype("datetime64[ns]").astype("int64")
+    return x.astype("float64")
+
+
+def lttb(x, y, n_out):
+    """Indeks `n_out` titik terpilih dengan algoritme LTTB (Steinarsson, 2013)."""
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    x = x - x[0]  # jaga presisi hasil kali ketika x berupa nanodetik
+
+    every = (n - 2) / (n_out - 2)
+    bounds = np.minimum(np.floor(np.arange(n_out) * every).astype(np.int64) + 1, n)
+    bounds[-1] = n
+    # Rata-rata bucket berikutnya lewat cumsum, tanpa iterasi per titik.
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = a = 0
+    for i in range(n_out - 2):
+        start, stop = bounds[i], bounds[i + 1]
+        next_start, next_stop = bounds[i + 1], bounds[i + 2]
+        count = next_stop - next_start
+        avg_x = (cx[next_stop] - cx[next_start]) / count
+        avg_y = (cy[next_stop] - cy[next_start]) / count
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+
+def _first_match(y, extrema, bucket, starts):
+    """Indeks pertama di tiap bucket yang nilainya sama dengan `extrema` bucket itu (awal bucket bila semua NaN)."""
+    hits = np.flatnonzero(y == extrema[bucket])
+    found = np.append(hits, -1)[np.searchsorted(hits, starts)]
+    in_bucket = (found >= 0) & (bucket[found] == np.arange(len(starts)))
+    return np.where(in_bucket, found, starts)
+
+
+def minmax(y, n_out):
+    """Indeks titik min & maks untuk `n_out // 2` bucket berukuran sama, ditambah titik pertama/terakhir."""
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    n_buckets = (n_out - 2) // 2
+    # Bucket k = baris i dengan i * n_buckets // n == k, yaitu mulai dari ceil(k * n / n_buckets).
+    starts = -(-np.arange(n_buckets) * n // n_buckets)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(np.append(starts, n)))
+    # Ekstrem per bucket lewat reduceat (linear, tanpa sort); NaN diabaikan oleh fmin/fmax.
+    lows = _first_match(y, np.fmin.reduceat(y, starts), bucket, starts)
+    highs = _first_match(y, np.fmax.reduceat(y, starts), bucket, starts)
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+def downsample_indices(x, y, max_points, method=LTTB):
+    """Indeks baris yang ditampilkan; seluruh baris bila `len(y) <= max_points`."""
+    if method == LTTB:
+        return lttb(x, y, max_points)
+    if method == MINMAX:
+        return minmax(y, max_points)
+    raise ValueError(f"Metode downsampling tidak dikenal: {method!r} (pilihan: {', '.join(METHODS)}).")
@@ -0,0 +1,180 @@
+"""Pencarian orde SARIMA paralel dengan warm start dan pruning dini.
+
+Kandidat (p,d,q)(P,D,Q,s) dievaluasi bergelombang menurut kompleksitas
+(p+q+P+Q). Setiap gelombang berjalan paralel di process pool dan memulai
+optimasi dari parameter tetangga terbaik (beda satu orde) dari gelombang
+sebelumnya. Kandidat dipangkas bila setelah `PRUNE_MAXITER` iterasi AIC-nya
+sudah jauh di atas AIC terbaik, atau bila optimasi tidak konvergen.
+"""
+import itertools
+import math
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from revflux.jobs import process_context
+from revflux.modeling import DEFAULT_MAXITER, build_sarimax, fit_sarimax
+
+DEFAULT_GRID = {"p": (0, 1, 2), "d": (1,), "q": (0, 1, 2), "P": (0, 1), "D": (1,), "Q": (0, 1), "s": 12}
+CRITERIA = ("aic", "bic", "holdout")
+DEFAULT_HOLDOUT = 12
+PRUNE_MAXITER = 10
+PRUNE_AIC_MARGIN = 10.0
+
+OK = "ok"
+PRUNED = "pruned"
+NOT_CONVERGED = "not_converged"
+FAILED = "failed"
+
+
+@dataclass
+class CandidateResult:
+    order: tuple
+    seasonal_order: tuple
+    status: str
+    aic: float = math.nan
+    bic: float = math.nan
+    holdout_mape: float = math.nan
+    wall_time: float = 0.0
+    warm_start: bool = False
+    error: str = None
+    params: dict = field(default_factory=dict, repr=False)
+
+    def score(self, criterion):
+        return self.holdout_mape if criterion == "holdout" else getattr(self, criterion)
+
+
+@dataclass
+class GridSearchReport:
+    criterion: str
+    best: CandidateResult
+    model: object
+    candidates: list
+    wall_time: float
+
+    def to_frame(self):
+        """Satu baris per kandidat, diurutkan menurut skor; cocok untuk ditampilkan atau disimpan."""
+        rows = [{k: v for k, v in asdict(c).items() if k != "params"} for c in self.candidates]
+        frame = pd.DataFrame(rows)
+        frame["score"] = [c.score(self.criterion) for c in self.candidates]
+        frame["rank_group"] = frame["status"] != OK
+        frame = frame.sort_values(["rank_group", "score", "wall_time"], na_position="last")
+        return frame.drop(columns="rank_group").reset_index(drop=True)
+
+
+def candidate_grid(p=DEFAULT_GRID["p"], d=DEFAULT_GRID["d"], q=DEFAULT_GRID["q"],
+                   P=DEFAULT_GRID["P"], D=DEFAULT_GRID["D"], Q=DEFAULT_GRID["Q"], s=DEFAULT_GRID["s"]):
+    """Semua kombinasi (order, seasonal_order) dari nilai-nilai yang diberikan."""
+    return [((p_, d_, q_), (P_, D_, Q_, s)) for p_, d_, q_, P_, D_, Q_ in itertools.product(p, d, q, P, D, Q)]
+
+
+def _complexity(candidate):
+    (p, _, q), (P, _, Q, _) = candidate
+    return p + q + P + Q
+
+
+def _is_neighbor(a, b):
+    """Dua kandidat bertetangga jika berbeda tepat satu pada salah satu orde."""
+    diffs = [abs(x - y) for x, y in zip(a[0] + a[1], b[0] + b[1])]
+    return sum(diffs) == 1
+
+
+def _warm_start_params(model, neighbor_params):
+    """Parameter awal: nilai tetangga untuk nama parameter yang sama, sisanya start_params bawaan model."""
+    start = np.array(model.start_params, dtype="float64")
+    for i, name in enumerate(model.param_names):
+        if name in neighbor_params:
+            start[i] = neighbor_params[name]
+    return start
+
+
+def _evaluate_candidate(y, holdout, order, seasonal_order, neighbor_params, aic_threshold, maxiter):
+    """Dijalankan di worker: fit pendek, pangkas bila jelas kalah, lalu lanjutkan hingga `maxiter`."""
+    started = time.perf_counter()
+    result = CandidateResult(order=order, seasonal_order=seasonal_order, status=OK, warm_start=bool(neighbor_params))
+    y_fit = y[:-holdout] if holdout else y
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model = build_sarimax(y_fit, order, seasonal_order)
+            start = _warm_start_params(model, neighbor_params) if neighbor_params else None
+            fitted = model.fit(disp=False, start_params=start, maxiter=PRUNE_MAXITER)
+            if aic_threshold is not None and not fitted.aic <= aic_threshold:
+                result.status = PRUNED
+            else:
+                fitted = model.fit(disp=False, start_params=fitted.params, maxiter=maxiter)
+                if not fitted.mle_retvals.get("converged", True):
+                    result.status = NOT_CONVERGED
+        result.aic, result.bic = float(fitted.aic), float(fitted.bic)
+        result.params = dict(zip(model.param_names, np.asarray(fitted.params, dtype="float64")))
+        if holdout and result.status == OK:
+            forecast = np.expm1(np.asarray(fitted.get_forecast(steps=holdout).predicted_mean))
+            actual = y[-holdout:]
+            result.holdout_mape = float(np.mean(np.abs((actual - forecast) / actual)) * 100)
+    except Exception as e:
+        result.status, result.error = FAILED, str(e)
+    result.wall_time = time.perf_counter() - started
+    return result
+
+
+def grid_search(y, candidates=None, criterion="aic", holdout=DEFAULT_HOLDOUT, max_workers=None,
+                maxiter=DEFAULT_MAXITER, prune_margin=PRUNE_AIC_MARGIN, progress=None):
+    """Cari orde SARIMA terbaik untuk deret `y` (skala asli) dan kembalikan `GridSearchReport`.
+
+    `criterion` salah satu dari `CRITERIA`; "holdout" mengukur MAPE forecast pada
+    `holdout` titik terakhir. Model pemenang di-fit ulang pada seluruh data dengan
+    warm start dari parameternya. `progress(selesai, total)` dipanggil setiap satu
+    kandidat selesai dan boleh melempar exception untuk membatalkan pencarian.
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"Kriteria tidak dikenal: {criterion}. Pilih salah satu dari {CRITERIA}.")
+    y = np.asarray(y, dtype="float64")
+    holdout = holdout if criterion == "holdout" else 0
+    candidates = candidates or candidate_grid()
+    waves = itertools.groupby(sorted(candidates, key=_complexity), key=_complexity)
+
+    started = time.perf_counter()
+    results = []
+    best_aic = math.inf
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), mp_context=process_context()) as executor:
+        try:
+            for _, wave in waves:
+                fitted = [r for r in results if r.status == OK]
+                threshold = best_aic + prune_margin if math.isfinite(best_aic) else None
+                futures = []
+                for order, seasonal_order in wave:
+                    neighbors = [r for r in fitted if _is_neighbor((order, seasonal_order), (r.order, r.seasonal_order))]
+                    neighbor = min(neighbors, key=lambda r: r.aic) if neighbors else None
+                    futures.append(executor.submit(
+                        _evaluate_candidate, y, holdout, order, seasonal_order,
+                        neighbor.params if neighbor else None, threshold, maxiter,
+                    ))
+                for future in futures:
+                    result = future.result()
+                    results.append(result)
+                    if result.status == OK:
+                        best_aic = min(best_aic, result.aic)
+                    if progress is not None:
+                        progress(len(results), len(candidates))
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    ranked = [r for r in results if r.status == OK] or [r for r in results if r.status == NOT_CONVERGED]
+    ranked = [r for r in ranked if np.isfinite(r.score(criterion))]
+    if not ranked:
+        raise RuntimeError("Tidak ada kandidat SARIMA yang berhasil di-fit.")
+    best = min(ranked, key=lambda r: r.score(criterion))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = build_sarimax(y, best.order, best.seasonal_order)
+        model = fit_sarimax(y, best.order, best.seasonal_order,
+                            start_params=_warm_start_params(model, best.params), maxiter=maxiter)
+    return GridSearchReport(criterion=criterion, best=best, model=model, candidates=results,
+                            wall_time=time.perf_counter() - started)
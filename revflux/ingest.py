@@ -0,0 +1,151 @@
+"""Ingest file upload secara streaming dengan memori terbatas.
+
+File dibaca per potongan: CSV lewat `pd.read_csv(chunksize=...)` dan XLSX lewat
+iterator baris openpyxl mode read-only. Hanya kolom 'Periode' dan 'Pemasukan'
+yang dibaca. Setiap potongan langsung dinormalisasi lalu direduksi per periode,
+sehingga yang tertahan di memori hanya satu potongan plus hasil reduksi (satu
+baris per periode) berapa pun ukuran file. Reduksinya:
+
+- `LATEST`: satu baris per periode dengan nilai terakhir di file (upload bulanan biasa);
+- `SUM`: jumlah per periode, untuk data harian/mingguan/transaksi. Periode tanpa
+  transaksi di antara periode pertama dan terakhir diisi 0 (`fill_missing_periods`).
+
+Periode yang terbelah di antara dua potongan direduksi lagi pada penggabungan akhir.
+"""
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from revflux.instrumentation import AllocationPeak, stage
+from revflux.preprocessing import (MONTHLY, aggregate_periods, fill_missing_periods, latest_per_period,
+                                   merge_format_counts, preprocess_period_column)
+
+DEFAULT_CHUNKSIZE = 1_000_000
+REQUIRED_COLUMNS = ("Periode", "Pemasukan")
+# 'Periode' dibiarkan sebagai teks agar deteksi format tanggal tetap berlaku; 'Pemasukan'
+# diinferensi parser C (float64/int64 tanpa objek Python) dan nilai kotor di-coerce saat normalisasi.
+CSV_DTYPES = {"Periode": str}
+
+LATEST = "latest"
+SUM = "sum"
+REDUCERS = {LATEST: latest_per_period, SUM: aggregate_periods}
+
+
+@dataclass
+class IngestResult:
+    data: pd.DataFrame
+    rows_read: int
+    rows_kept: int
+    chunks: int
+    elapsed: float
+    period_formats: dict = field(default_factory=dict)
+    peak_memory: int = None
+
+    @property
+    def rows_dropped(self):
+        """Baris yang dibuang karena periode atau pemasukan tidak terbaca."""
+        return self.rows_read - self.rows_kept
+
+    @property
+    def rows_per_sec(self):
+        return self.rows_read / self.elapsed if self.elapsed else float("nan")
+
+
+def _check_columns(columns):
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        raise ValueError(f"Kolom {', '.join(missing)} tidak ditemukan.")
+
+
+def read_csv_chunks(source, chunksize=DEFAULT_CHUNKSIZE):
+    """DataFrame 'Periode'/'Pemasukan' per `chunksize` baris; kolom lain tidak pernah di-parse."""
+    with pd.read_csv(source, usecols=lambda c: c in REQUIRED_COLUMNS, dtype=CSV_DTYPES,
+                     chunksize=chunksize) as reader:
+        for chunk in reader:
+            _check_columns(chunk.columns)
+            yield chunk
+
+
+def read_xlsx_chunks(source, chunksize=DEFAULT_CHUNKSIZE):
+    """Baca sheet pertama XLSX baris demi baris (openpyxl read-only) dan kirimkan per `chunksize` baris."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(c).strip() if c is not None else "" for c in next(rows, ())]
+        _check_columns(header)
+        i_period, i_amount = header.index("Periode"), header.index("Pemasukan")
+        periods, amounts = [], []
+        for row in rows:
+            if i_period >= len(row) or i_amount >= len(row):
+                continue
+            periods.append(row[i_period])
+            amounts.append(row[i_amount])
+            if len(periods) >= chunksize:
+                yield pd.DataFrame({"Periode": periods, "Pemasukan": amounts})
+                periods, amounts = [], []
+        if periods:
+            yield pd.DataFrame({"Periode": periods, "Pemasukan": amounts})
+    finally:
+        workbook.close()
+
+
+def iter_upload_chunks(source, chunksize=DEFAULT_CHUNKSIZE, excel=None):
+    """Potongan file upload (path atau buffer); `excel` bawaan ditentukan dari ekstensi nama file."""
+    name = getattr(source, "name", source)
+    if excel is None:
+        excel = Path(str(name)).suffix.lower() in (".xlsx", ".xlsm")
+    return read_xlsx_chunks(source, chunksize) if excel else read_csv_chunks(source, chunksize)
+
+
+def reduce_chunks(chunks, freq=MONTHLY, combine=LATEST):
+    """Normalisasi dan reduksi setiap DataFrame dari iterator `chunks`, lalu gabungkan hasilnya."""
+    reduce = REDUCERS[combine]
+    started = time.perf_counter()
+    partials = []
+    formats = {}
+    rows_read = kept = n_chunks = 0
+    chunks = iter(chunks)
+    while True:
+        # Parsing CSV/XLSX terjadi saat potongan berikutnya diminta dari iterator
+        with stage("ingest.parse"):
+            chunk = next(chunks, None)
+        if chunk is None:
+            break
+        rows_read += len(chunk)
+        n_chunks += 1
+        clean = preprocess_period_column(chunk, freq)
+        formats = merge_format_counts(formats, clean.attrs["period_formats"])
+        kept += len(clean)
+        with stage("ingest.reduce"):
+            partials.append(reduce(clean))
+        del chunk, clean
+    if partials:
+        with stage("ingest.reduce"):
+            data = reduce(pd.concat(partials, ignore_index=True))
+            if combine == SUM:
+                data = fill_missing_periods(data, freq)
+    else:
+        data = pd.DataFrame({"Periode": pd.Series(dtype="datetime64[ns]"), "Pemasukan": pd.Series(dtype="float64")})
+    data.attrs["period_formats"] = formats
+    return IngestResult(data=data, rows_read=rows_read, rows_kept=kept, chunks=n_chunks,
+                        elapsed=time.perf_counter() - started, period_formats=formats)
+
+
+def stream_upload(source, freq=MONTHLY, combine=LATEST, chunksize=DEFAULT_CHUNKSIZE, excel=None, track_memory=False):
+    """Baca file upload secara streaming dan reduksi per periode `freq`; kembalikan `IngestResult`.
+
+    Dengan `track_memory=True`, puncak alokasi selama ingest diukur dengan tracemalloc
+    (`peak_memory`, byte). Pengukuran ini memperlambat ingest, jadi bawaannya mati;
+    `peak_memory` tetap None bila tracemalloc sedang dipakai trace lain (lihat `AllocationPeak`).
+    """
+    chunks = iter_upload_chunks(source, chunksize, excel)
+    if not track_memory:
+        return reduce_chunks(chunks, freq, combine)
+    with AllocationPeak() as allocations:
+        result = reduce_chunks(chunks, freq, combine)
+    result.peak_memory = allocations.peak
+    return result
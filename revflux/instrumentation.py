@@ -0,0 +1,370 @@
+"""Instrumentasi per tahap pipeline: waktu wall/CPU, RSS, dan alokasi memori.
+
+Satu rerun Streamlit (atau satu perintah CLI) membuka satu `Trace` lewat
+`start_trace`. Kode di revflux cukup membungkus tahapnya dengan `stage("nama")`,
+sebagai context manager atau dekorator, tanpa meneruskan objek apa pun; trace
+aktif disimpan di ContextVar. Tanpa trace aktif `stage` tidak mencatat apa-apa
+dan biayanya hanya satu lookup ContextVar, jadi aman dibiarkan di jalur panas.
+Hanya thread yang membuka trace yang dicatat: thread pool (render grafik,
+laporan massal, `asyncio.to_thread`) dan worker proses training tidak ikut
+tercatat; waktunya terlihat di tahap pemanggilnya.
+
+Per tahap dicatat jumlah panggilan, waktu wall, waktu CPU thread, perubahan RSS,
+dan puncak alokasi tracemalloc di atas alokasi saat tahap dimulai (hanya bila
+trace dibuka dengan `track_allocations=True`, karena tracemalloc memperlambat
+seluruh proses). tracemalloc dan `reset_peak` berlaku untuk seluruh proses, jadi
+hanya satu pengukur (trace atau `AllocationPeak`) pada satu waktu yang boleh
+mengukur alokasi; pengukur lain berjalan tanpa pengukuran alokasi (trace:
+`allocations_busy`, `AllocationPeak`: `peak` None). Angkanya tetap ikut memuat
+alokasi thread lain di proses yang sama. Tahap bersarang ikut terhitung di tahap
+luarnya. Fungsi yang hasilnya di-cache Streamlit tidak muncul sama sekali pada
+rerun yang kena cache.
+
+`log_trace` menulis trace sebagai satu baris JSON ke logger `revflux.perf`;
+`configure_json_log` mengarahkannya ke file JSONL. `Profiler` membungkus
+cProfile atau pyinstrument (opsional) untuk menangkap satu rerun penuh.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+import weakref
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+PERF_LOGGER = "revflux.perf"
+PERF_LOG_ENV = "REVFLUX_PERF_LOG"
+CPROFILE = "cprofile"
+PYINSTRUMENT = "pyinstrument"
+PROFILERS = (CPROFILE, PYINSTRUMENT)
+PROFILE_LIMIT = 40
+
+perf_logger = logging.getLogger(PERF_LOGGER)
+_current_trace = ContextVar("revflux_trace", default=None)
+
+# Pemilik tracemalloc di proses ini (weakref ke Trace). Trace yang ditinggalkan tanpa
+# `finish` (mis. sesi ditutup) melepas kepemilikan saat objeknya di-garbage-collect.
+_allocation_guard = threading.Lock()
+_allocation_owner = None
+_tracemalloc_started = False
+
+
+def _claim_allocations(trace):
+    """Jadikan `trace` (objek dengan atribut `finished`) satu-satunya pengukur alokasi; False bila yang lain masih memakainya."""
+    global _allocation_owner, _tracemalloc_started
+    with _allocation_guard:
+        owner = _allocation_owner() if _allocation_owner is not None else None
+        if owner is not None and not owner.finished:
+            return False
+        _allocation_owner = weakref.ref(trace)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_started = True
+        return True
+
+
+def _release_allocations(trace):
+    global _allocation_owner, _tracemalloc_started
+    with _allocation_guard:
+        if _allocation_owner is None or _allocation_owner() is not trace:
+            return
+        _allocation_owner = None
+        if _tracemalloc_started:
+            tracemalloc.stop()
+            _tracemalloc_started = False
+
+
+class AllocationPeak:
+    """Puncak alokasi tracemalloc (byte) selama blok `with`, di `peak`.
+
+    `peak` tetap None bila tracemalloc sedang dimiliki pengukur lain (mis. trace dengan
+    `track_allocations=True`), karena `reset_peak` akan merusak angka milik pengukur itu.
+    """
+
+    def __init__(self):
+        self.peak = None
+        self.finished = False
+        self._owned = False
+
+    def __enter__(self):
+        self._owned = _claim_allocations(self)
+        if self._owned:
+            tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, *exc):
+        if self._owned:
+            self.peak = tracemalloc.get_traced_memory()[1]
+            _release_allocations(self)
+        self.finished = True
+        return False
+
+
+def max_rss():
+    """Puncak resident set size proses (byte) sejak proses mulai; None di platform tanpa modul `resource`."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024  # macOS melaporkan byte, Linux KiB
+
+
+def current_rss():
+    """Resident set size proses saat ini (byte) dari /proc; None di luar Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@dataclass
+class StageStats:
+    name: str
+    calls: int = 0
+    seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rss_delta: int = None
+    alloc_peak: int = None
+
+
+class _Frame:
+    __slots__ = ("name", "started", "cpu", "rss", "alloc_start", "alloc_peak")
+
+    def __init__(self, name):
+        self.name = name
+        self.rss = current_rss()
+        self.alloc_start = self.alloc_peak = None
+        self.cpu = time.thread_time()
+        self.started = time.perf_counter()
+
+
+class Trace:
+    """Catatan satu rerun/perintah: statistik per tahap plus total waktu dan memori."""
+
+    def __init__(self, label, track_allocations=False):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.track_allocations = track_allocations
+        self.allocations_busy = False
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        self.stages = {}
+        self.elapsed = self.cpu_seconds = None
+        self.rss_start = current_rss()
+        self.rss_end = None
+        self._stack = []
+        self._thread = threading.get_ident()
+        self._started = time.perf_counter()
+        self._cpu = time.thread_time()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.finish()
+        return False
+
+    @property
+    def finished(self):
+        return self.elapsed is not None
+
+    def _tracing(self):
+        return self.track_allocations and tracemalloc.is_tracing()
+
+    def _enter(self, name):
+        if threading.get_ident() != self._thread:
+            return
+        frame = _Frame(name)
+        if self._tracing():
+            # reset_peak berlaku global: simpan dulu puncak yang sudah terlihat oleh tahap-tahap luar
+            peak = tracemalloc.get_traced_memory()[1]
+            for outer in self._stack:
+                outer.alloc_peak = max(outer.alloc_peak or 0, peak)
+            tracemalloc.reset_peak()
+            frame.alloc_start = tracemalloc.get_traced_memory()[0]
+        self._stack.append(frame)
+
+    def _exit(self, name):
+        if threading.get_ident() != self._thread or not self._stack or self._stack[-1].name != name:
+            return
+        frame = self._stack.pop()
+        seconds = time.perf_counter() - frame.started
+        cpu = time.thread_time() - frame.cpu
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.cpu_seconds += cpu
+        rss = current_rss()
+        if rss is not None and frame.rss is not None:
+            stats.rss_delta = (stats.rss_delta or 0) + rss - frame.rss
+        if frame.alloc_start is not None and tracemalloc.is_tracing():
+            peak = max(frame.alloc_peak or 0, tracemalloc.get_traced_memory()[1]) - frame.alloc_start
+            stats.alloc_peak = max(stats.alloc_peak or 0, peak)
+
+    def finish(self):
+        """Tutup trace: hitung total, lepas dari konteks, dan lepaskan tracemalloc bila trace ini pemiliknya."""
+        if self.finished:
+            return self
+        self.elapsed = time.perf_counter() - self._started
+        self.cpu_seconds = time.thread_time() - self._cpu
+        self.rss_end = current_rss()
+        if self.track_allocations:
+            _release_allocations(self)
+        if _current_trace.get() is self:
+            _current_trace.set(None)
+        return self
+
+    def to_dict(self):
+        return {
+            "event": "trace",
+            "run_id": self.run_id,
+            "label": self.label,
+            "started_at": self.started_at,
+            "seconds": self.elapsed,
+            "cpu_seconds": self.cpu_seconds,
+            "rss_start": self.rss_start,
+            "rss_end": self.rss_end,
+            "max_rss": max_rss(),
+            "track_allocations": self.track_allocations,
+            "stages": [asdict(s) for s in self.stages.values()],
+        }
+
+    def table(self):
+        """DataFrame per tahap (urut pertama kali selesai), dengan kolom memori dalam MB."""
+        import pandas as pd
+
+        table = pd.DataFrame([asdict(s) for s in self.stages.values()],
+                             columns=["name", "calls", "seconds", "cpu_seconds", "rss_delta", "alloc_peak"])
+        for column in ("rss_delta", "alloc_peak"):
+            table[column] = table[column].astype("float64") / 2**20
+        table = table.rename(columns={"name": "tahap", "calls": "panggilan", "seconds": "detik",
+                                      "cpu_seconds": "detik_cpu", "rss_delta": "Δrss_MB", "alloc_peak": "alokasi_MB"})
+        if self.elapsed:
+            table["%_rerun"] = table["detik"] / self.elapsed * 100
+        return table
+
+
+def start_trace(label, track_allocations=False):
+    """Buka trace baru dan jadikan trace aktif; trace aktif sebelumnya yang belum ditutup akan ditutup."""
+    previous = _current_trace.get()
+    if previous is not None:
+        previous.finish()
+    trace = Trace(label, track_allocations)
+    if track_allocations and not _claim_allocations(trace):
+        trace.track_allocations = False
+        trace.allocations_busy = True
+    _current_trace.set(trace)
+    return trace
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+class stage(ContextDecorator):
+    """Catat blok atau fungsi sebagai tahap `name` di trace aktif; tanpa trace aktif tidak melakukan apa-apa."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        trace = _current_trace.get()
+        if trace is not None:
+            trace._enter(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        trace = _current_trace.get()
+        if trace is not None:
+            trace._exit(self.name)
+        return False
+
+
+def configure_json_log(path):
+    """Arahkan logger `revflux.perf` ke file JSONL `path` (handler yang sama tidak dipasang dua kali)."""
+    path = os.path.abspath(path)
+    for handler in perf_logger.handlers:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == path:
+            return handler
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    perf_logger.addHandler(handler)
+    perf_logger.setLevel(logging.INFO)
+    perf_logger.propagate = False
+    return handler
+
+
+def log_trace(trace, **fields):
+    """Tulis trace (plus `fields` tambahan) sebagai satu baris JSON bila logger `revflux.perf` aktif."""
+    if perf_logger.isEnabledFor(logging.INFO):
+        perf_logger.info(json.dumps({**trace.to_dict(), **fields}, ensure_ascii=False, default=str))
+
+
+class Profiler:
+    """Profil satu blok kode dengan cProfile (bawaan) atau pyinstrument (bila terpasang).
+
+    Setelah `stop`, `text` berisi ringkasan teks (cProfile: `PROFILE_LIMIT` fungsi
+    teratas menurut waktu kumulatif) dan `html` berisi laporan interaktif pyinstrument.
+    """
+
+    def __init__(self, kind=CPROFILE):
+        if kind not in PROFILERS:
+            raise ValueError(f"Profiler tidak dikenal: {kind!r} (pilihan: {', '.join(PROFILERS)}).")
+        self.kind = kind
+        self.text = self.html = None
+        self._profiler = None
+
+    def start(self):
+        """Mulai profiling; RuntimeError bila profiler tidak tersedia atau sedang dipakai (mis. oleh sesi lain)."""
+        if self.kind == PYINSTRUMENT:
+            try:
+                from pyinstrument import Profiler as PyinstrumentProfiler
+            except ImportError:
+                raise RuntimeError("pyinstrument belum terpasang: pip install pyinstrument")
+            profiler = PyinstrumentProfiler()
+            begin = profiler.start
+        else:
+            profiler = cProfile.Profile()
+            begin = profiler.enable
+        try:
+            begin()
+        except (ValueError, RuntimeError) as e:
+            # cProfile (Python 3.12+) hanya boleh aktif satu per proses
+            raise RuntimeError(f"profiler sedang dipakai di proses ini ({e})")
+        self._profiler = profiler
+        return self
+
+    @property
+    def running(self):
+        return self._profiler is not None and self.text is None
+
+    def stop(self):
+        if self.kind == PYINSTRUMENT:
+            self._profiler.stop()
+            self.text = self._profiler.output_text(unicode=True)
+            self.html = self._profiler.output_html()
+        else:
+            self._profiler.disable()
+            buffer = io.StringIO()
+            pstats.Stats(self._profiler, stream=buffer).sort_stats("cumulative").print_stats(PROFILE_LIMIT)
+            self.text = buffer.getvalue()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
@@ -0,0 +1,213 @@
+"""Pelatihan model di latar belakang lewat process pool, dengan status, progres, dan pembatalan.
+
+Satu `TrainingJobRunner` dipakai bersama oleh semua sesi dalam satu proses
+server; setiap dataset paling banyak memiliki satu job aktif. Pembatalan
+bersifat kooperatif: callback optimizer memeriksa flag batal setiap iterasi.
+"""
+import itertools
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from revflux.modeling import DEFAULT_MAXITER
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+
+def process_context():
+    """Context multiprocessing untuk worker RevFlux.
+
+    Streamlit mendaftarkan skrip halaman sebagai `__main__`, sehingga start method
+    "spawn"/"forkserver" akan mengeksekusi ulang seluruh halaman di setiap worker.
+    """
+    return multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+
+
+class TrainingCancelled(Exception):
+    """Dilempar dari callback optimizer ketika job dibatalkan."""
+
+
+@dataclass
+class JobStatus:
+    job_id: str
+    dataset: str
+    state: str
+    progress: float
+    elapsed: float
+    result: dict = None
+    error: str = None
+
+
+@dataclass
+class _Job:
+    dataset: str
+    future: object
+    submitted: float
+    finished: float = None
+    extra: dict = field(default_factory=dict)
+
+
+def _train_worker(job_id, series, model_path, fit_kwargs, progress, cancel_flags):
+    """Dijalankan di proses worker: fit SARIMAX, lalu simpan model secara atomik."""
+    from revflux.modeling import fit_sarimax, save_model
+
+    started = time.time()
+    progress[job_id] = (0.0, started)
+    maxiter = fit_kwargs.get("maxiter", DEFAULT_MAXITER)
+    iterations = itertools.count(1)
+
+    def callback(params):
+        if cancel_flags.get(job_id):
+            raise TrainingCancelled(job_id)
+        progress[job_id] = (min(next(iterations) / maxiter, 0.99), started)
+
+    model = fit_sarimax(series, callback=callback, **fit_kwargs)
+    if cancel_flags.get(job_id):
+        raise TrainingCancelled(job_id)
+    save_model(model, model_path)
+    progress[job_id] = (1.0, started)
+    return {"model_path": str(model_path), "nobs": int(model.nobs), "aic": float(model.aic), "started": started}
+
+
+def _search_worker(job_id, series, model_path, search_kwargs, progress, cancel_flags):
+    """Dijalankan di proses worker: grid search orde SARIMA, lalu simpan model pemenang secara atomik."""
+    from revflux.grid_search import grid_search
+    from revflux.modeling import save_model
+
+    started = time.time()
+    progress[job_id] = (0.0, started)
+
+    def on_progress(done, total):
+        if cancel_flags.get(job_id):
+            raise TrainingCancelled(job_id)
+        progress[job_id] = (min(done / total, 0.99), started)
+
+    report = grid_search(series, progress=on_progress, **search_kwargs)
+    if cancel_flags.get(job_id):
+        raise TrainingCancelled(job_id)
+    save_model(report.model, model_path)
+    progress[job_id] = (1.0, started)
+    return {
+        "model_path": str(model_path), "nobs": int(report.model.nobs), "aic": float(report.model.aic),
+        "started": started, "order": report.best.order, "seasonal_order": report.best.seasonal_order,
+        "criterion": report.criterion, "search_wall_time": report.wall_time,
+        "candidates": report.to_frame().to_dict("records"),
+    }
+
+
+def _update_worker(job_id, store_root, dataset, policy, progress, cancel_flags):
+    """Dijalankan di proses worker: update model inkremental (atau refit bila perlu), lihat revflux.updating."""
+    from dataclasses import asdict
+
+    from revflux.storage import DatasetStore
+    from revflux.updating import update_model
+
+    started = time.time()
+    progress[job_id] = (0.0, started)
+    report = update_model(DatasetStore(store_root), dataset, should_cancel=lambda: cancel_flags.get(job_id), **policy)
+    progress[job_id] = (1.0, started)
+    return dict(asdict(report), started=started)
+
+
+class TrainingJobRunner:
+    """Menerima permintaan fit per dataset dan menjalankannya di `ProcessPoolExecutor`."""
+
+    def __init__(self, max_workers=None):
+        self._context = process_context()
+        self._manager = self._context.Manager()
+        self._progress = self._manager.dict()
+        self._cancel_flags = self._manager.dict()
+        self._max_workers = max_workers
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=self._context)
+        self._jobs = {}
+        self._latest_by_dataset = {}
+        self._lock = threading.Lock()
+
+    def submit(self, dataset, series, model_path, search=None, **fit_kwargs):
+        """Jadwalkan fit untuk `dataset`. Jika sudah ada job aktif untuk dataset itu, id job tersebut yang dikembalikan.
+
+        Bila `search` berisi argumen `grid_search` (boleh dict kosong), orde SARIMA
+        dicari otomatis dan model pemenang yang disimpan ke `model_path`.
+        """
+        worker, kwargs = (_train_worker, fit_kwargs) if search is None else (_search_worker, search)
+        return self._submit(dataset, worker, np.asarray(series, dtype="float64"), str(model_path), kwargs)
+
+    def submit_update(self, dataset, store_root, **policy):
+        """Jadwalkan update inkremental model `dataset` (argumen `policy` diteruskan ke `update_model`)."""
+        return self._submit(dataset, _update_worker, str(store_root), dataset, policy)
+
+    def _submit(self, dataset, worker, *worker_args):
+        with self._lock:
+            latest = self._latest_by_dataset.get(dataset)
+            if latest is not None and not self._jobs[latest].future.done():
+                return latest
+
+            job_id = uuid.uuid4().hex[:12]
+            self._cancel_flags[job_id] = False
+            args = (worker, job_id, *worker_args, self._progress, self._cancel_flags)
+            try:
+                future = self._executor.submit(*args)
+            except BrokenProcessPool:
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers, mp_context=self._context)
+                future = self._executor.submit(*args)
+
+            job = _Job(dataset=dataset, future=future, submitted=time.time())
+            future.add_done_callback(lambda _: setattr(job, "finished", time.time()))
+            self._jobs[job_id] = job
+            self._latest_by_dataset[dataset] = job_id
+            return job_id
+
+    def latest_job(self, dataset):
+        return self._latest_by_dataset.get(dataset)
+
+    def status(self, job_id):
+        """Status job. `elapsed` dihitung sejak worker mulai (atau sejak submit selama masih antre)."""
+        job = self._jobs[job_id]
+        progress, started = self._progress.get(job_id, (0.0, None))
+        elapsed = (job.finished or time.time()) - (started or job.submitted)
+        status = JobStatus(job_id=job_id, dataset=job.dataset, state=QUEUED, progress=progress, elapsed=elapsed)
+
+        future = job.future
+        if not future.done():
+            if started is not None:
+                status.state = RUNNING
+            return status
+        if future.cancelled():
+            status.state = CANCELLED
+            return status
+        error = future.exception()
+        if error is None:
+            status.state = DONE
+            status.progress = 1.0
+            status.result = future.result()
+        elif isinstance(error, TrainingCancelled):
+            status.state = CANCELLED
+        else:
+            status.state = FAILED
+            status.error = str(error)
+        return status
+
+    def cancel(self, job_id):
+        """Batalkan job; job yang masih antre dibatalkan langsung, yang berjalan berhenti di iterasi optimizer berikutnya."""
+        job = self._jobs[job_id]
+        if job.future.cancel():
+            return True
+        if job.future.done():
+            return False
+        self._cancel_flags[job_id] = True
+        return True
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._manager.shutdown()
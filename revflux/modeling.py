@@ -0,0 +1,91 @@
+"""Model SARIMAX pada skala log1p dan penyimpanannya di disk.
+
+statsmodels baru diimpor saat model dibangun, supaya modul ini (dan konstanta
+di dalamnya) murah diimpor oleh halaman yang belum butuh training.
+"""
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from revflux.artifacts import ARTIFACT_SUFFIX, load_compact, save_compact
+from revflux.instrumentation import stage
+from revflux.preprocessing import MONTHLY, SEASONAL_PERIODS, WEEKLY
+
+DEFAULT_ORDER = (1, 1, 1)
+DEFAULT_SEASONAL_ORDER = (1, 1, 1, 12)
+DEFAULT_MAXITER = 50
+
+
+def seasonal_order_for(freq=MONTHLY, seasonal_order=DEFAULT_SEASONAL_ORDER):
+    """`seasonal_order` dengan periode musiman yang sesuai frekuensi data (12 bulanan, 52 mingguan)."""
+    return (*seasonal_order[:3], SEASONAL_PERIODS[freq])
+
+
+def build_sarimax(y, order=DEFAULT_ORDER, seasonal_order=DEFAULT_SEASONAL_ORDER):
+    """SARIMAX atas `log1p(Pemasukan)`; hasil forecast dikembalikan ke skala asli dengan `expm1`."""
+    import statsmodels.api as sm
+
+    return sm.tsa.statespace.SARIMAX(
+        np.log1p(y), order=order, seasonal_order=seasonal_order,
+        enforce_stationarity=False, enforce_invertibility=False
+    )
+
+
+def fit_sarimax(y, order=DEFAULT_ORDER, seasonal_order=DEFAULT_SEASONAL_ORDER,
+                start_params=None, maxiter=DEFAULT_MAXITER, callback=None):
+    model = build_sarimax(y, order, seasonal_order).fit(
+        disp=False, start_params=start_params, maxiter=maxiter, callback=callback
+    )
+    # statsmodels menyimpan callback di mle_settings; lepas agar model tetap bisa di-pickle.
+    model.mle_settings["callback"] = None
+    return model
+
+
+@stage("model.forecast")
+def forecast_frame(model, steps):
+    """Forecast `steps` periode ke depan di skala asli (expm1): kolom Pemasukan, Batas Bawah, Batas Atas."""
+    forecast_res = model.get_forecast(steps=steps)
+    conf_int = np.expm1(np.asarray(forecast_res.conf_int()))
+    return pd.DataFrame({
+        "Pemasukan": np.expm1(np.asarray(forecast_res.predicted_mean)),
+        "Batas Bawah": conf_int[:, 0],
+        "Batas Atas": conf_int[:, 1],
+    })
+
+
+def future_periods(last_period, steps, freq=MONTHLY):
+    """Tanggal awal periode (awal bulan, atau Senin untuk mingguan) untuk `steps` periode setelah `last_period`."""
+    if freq == WEEKLY:
+        return pd.date_range(pd.Timestamp(last_period) + pd.DateOffset(weeks=1), periods=steps, freq="W-MON")
+    return pd.date_range(pd.Timestamp(last_period) + pd.DateOffset(months=1), periods=steps, freq="MS")
+
+
+def save_model(model, path):
+    """Simpan model secara atomik: artefak ringkas untuk `.npz`, pickle penuh untuk path lain.
+
+    Keduanya ditulis ke file sementara lalu `os.replace`, sehingga pembaca tidak pernah melihat file setengah jadi.
+    """
+    path = Path(path)
+    if path.suffix == ARTIFACT_SUFFIX:
+        save_compact(model, path)
+        return
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(model, f)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+@stage("model.load")
+def load_model(path):
+    """Muat `.npz` sebagai `CompactForecaster`; file lain dianggap pickle `SARIMAXResults` (format lama)."""
+    if Path(path).suffix == ARTIFACT_SUFFIX:
+        return load_compact(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
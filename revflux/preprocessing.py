@@ -0,0 +1,171 @@
+"""Normalisasi kolom 'Periode' dan 'Pemasukan' untuk aplikasi maupun proses batch.
+
+Setiap tanggal dipotong ke awal periode model: awal bulan (`MONTHLY`, bawaan)
+atau Senin awal minggu (`WEEKLY`). Data harian/transaksi dijumlahkan per periode
+dengan `aggregate_periods`; periode tanpa transaksi dilengkapi bernilai 0 dengan
+`fill_missing_periods`, karena model menganggap baris tersimpan berurutan.
+"""
+import numpy as np
+import pandas as pd
+
+from revflux.instrumentation import stage
+
+MONTHLY = "M"
+WEEKLY = "W"
+SEASONAL_PERIODS = {MONTHLY: 12, WEEKLY: 52}
+# Alias frekuensi pandas untuk awal periode (sama dengan hasil `truncate_periods`).
+PANDAS_FREQ = {MONTHLY: "MS", WEEKLY: "W-MON"}
+
+# Urutan juga menjadi prioritas saat jumlah kecocokan pada sampel sama.
+PERIOD_FORMATS = ("%Y-%m-%d", "%Y-%m", "%d/%m/%Y", "%Y/%m/%d", "%d-%m-%Y", "%Y-%m-%d %H:%M:%S")
+FORMAT_SAMPLE_SIZE = 512
+MIXED_FORMAT = "mixed"
+UNPARSED = "unparsed"
+
+
+def detect_period_formats(values, sample_size=FORMAT_SAMPLE_SIZE):
+    """Urutkan `PERIOD_FORMATS` menurut jumlah kecocokan pada sampel; format tanpa kecocokan dibuang."""
+    values = pd.Index(values)
+    if len(values) > sample_size:
+        values = values[:: len(values) // sample_size][:sample_size]
+    scores = []
+    for rank, fmt in enumerate(PERIOD_FORMATS):
+        hits = int(pd.to_datetime(values, format=fmt, errors="coerce").notna().sum())
+        if hits:
+            scores.append((-hits, rank, fmt))
+    return [fmt for _, _, fmt in sorted(scores)]
+
+
+def truncate_periods(values, freq=MONTHLY):
+    """Potong array datetime64 ke awal periode `freq` (awal bulan atau Senin awal minggu)."""
+    values = np.asarray(values, dtype="datetime64[ns]")
+    if freq == MONTHLY:
+        return values.astype("datetime64[M]").astype("datetime64[ns]")
+    if freq == WEEKLY:
+        days = values.astype("datetime64[D]")
+        # 1970-01-01 jatuh pada hari Kamis, jadi (hari + 3) % 7 == 0 untuk Senin.
+        weekday = (days.astype("int64") + 3) % 7
+        return (days - weekday.astype("timedelta64[D]")).astype("datetime64[ns]")
+    raise ValueError(f"Frekuensi tidak dikenal: {freq!r} (pilihan: {', '.join(SEASONAL_PERIODS)}).")
+
+
+def parse_periods(values, freq=MONTHLY):
+    """Parse nilai periode menjadi datetime64 awal periode `freq` dalam satu lintasan vektor.
+
+    Parsing dilakukan pada nilai unik saja. Format dideteksi sekali dari sampel;
+    hanya sisa yang belum terbaca dicoba dengan format berikutnya, lalu dengan
+    parser per-baris (`format="mixed"`). Mengembalikan `(Series, {format: jumlah baris})`.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if values.dt.tz is not None:
+            values = values.dt.tz_localize(None)
+        parsed = truncate_periods(values.to_numpy(dtype="datetime64[ns]"), freq)
+        counts = {"datetime64": int(values.notna().sum())}
+        if values.isna().any():
+            counts[UNPARSED] = int(values.isna().sum())
+        return pd.Series(parsed, index=values.index, name=values.name), counts
+
+    codes, uniques = pd.factorize(values)
+    text = pd.Index(uniques).astype(str).str.strip()
+    parsed = np.full(len(text), np.datetime64("NaT"), dtype="datetime64[ns]")
+    matched_by = np.full(len(text), -1, dtype=np.int16)
+    labels = []
+    pending = np.arange(len(text))
+
+    for fmt in detect_period_formats(text) + [MIXED_FORMAT]:
+        if not len(pending):
+            break
+        if fmt == MIXED_FORMAT:
+            attempt = pd.to_datetime(text[pending], format=fmt, errors="coerce", utc=True).tz_localize(None)
+        else:
+            attempt = pd.to_datetime(text[pending], format=fmt, errors="coerce")
+        ok = np.asarray(attempt.notna())
+        if ok.any():
+            parsed[pending[ok]] = attempt[ok].to_numpy(dtype="datetime64[ns]")
+            matched_by[pending[ok]] = len(labels)
+            labels.append(fmt)
+        pending = pending[~ok]
+
+    parsed = truncate_periods(parsed, freq)
+    row_parsed = parsed[codes]
+    row_matched = matched_by[codes]
+    row_parsed[codes < 0] = np.datetime64("NaT")
+    row_matched[codes < 0] = -1
+
+    hits = np.bincount(row_matched[row_matched >= 0], minlength=len(labels))
+    counts = {label: int(n) for label, n in zip(labels, hits) if n}
+    unparsed = int((row_matched < 0).sum())
+    if unparsed:
+        counts[UNPARSED] = unparsed
+    return pd.Series(row_parsed, index=values.index, name=values.name), counts
+
+
+@stage("preprocess_period_column")
+def preprocess_period_column(df, freq=MONTHLY):
+    """Mempersiapkan kolom 'Periode' agar konsisten sebagai datetime (awal bulan, atau awal minggu untuk `WEEKLY`).
+
+    Jumlah baris yang cocok per format tanggal dicatat di `df.attrs["period_formats"]`.
+    """
+    if "Periode" not in df.columns:
+        raise ValueError("Kolom 'Periode' tidak ditemukan.")
+    periode, format_counts = parse_periods(df["Periode"], freq)
+    keep = periode.notna().to_numpy()
+    columns = {"Periode": periode}
+
+    if "Pemasukan" in df.columns:
+        pemasukan = pd.to_numeric(df["Pemasukan"], errors="coerce")
+        keep = keep & pemasukan.notna().to_numpy()  # pandas 3 (copy-on-write) memberi array read-only
+        columns["Pemasukan"] = pemasukan
+
+    df = df.assign(**columns)
+    if not keep.all():
+        df = df.loc[keep]
+    if not df["Periode"].is_monotonic_increasing:
+        df = df.sort_values("Periode", kind="stable")
+    df = df.reset_index(drop=True)
+    df.attrs["period_formats"] = format_counts
+    return df
+
+
+def merge_format_counts(*counts):
+    """Jumlahkan beberapa dict `period_formats` (mis. dari potongan file yang berbeda)."""
+    merged = {}
+    for c in counts:
+        for label, n in c.items():
+            merged[label] = merged.get(label, 0) + n
+    return merged
+
+
+def aggregate_periods(df):
+    """Jumlahkan 'Pemasukan' per 'Periode' (sudah dinormalisasi) dalam satu groupby; hasil terurut per periode."""
+    totals = df.groupby("Periode", sort=True)["Pemasukan"].sum()
+    result = pd.DataFrame({"Periode": totals.index.to_numpy(dtype="datetime64[ns]"),
+                           "Pemasukan": totals.to_numpy(dtype="float64")})
+    result.attrs = dict(df.attrs)
+    return result
+
+
+def fill_missing_periods(df, freq=MONTHLY, fill_value=0.0):
+    """Tambahkan periode `freq` yang tidak muncul di antara periode pertama dan terakhir, dengan 'Pemasukan' = `fill_value`.
+
+    `df` berisi satu baris per 'Periode' (sudah dinormalisasi ke `freq`). SARIMAX memperlakukan
+    baris sebagai periode berurutan, jadi tanpa ini lag musiman menunjuk periode yang salah.
+    """
+    if len(df) == 0:
+        return df
+    periods = pd.date_range(df["Periode"].min(), df["Periode"].max(), freq=PANDAS_FREQ[freq])
+    if len(periods) == len(df):
+        return df
+    result = (df[["Periode", "Pemasukan"]].set_index("Periode").reindex(periods, fill_value=fill_value)
+              .rename_axis("Periode").reset_index())
+    result.attrs = dict(df.attrs)
+    return result
+
+
+def latest_per_period(df):
+    """Satu baris per 'Periode' dengan nilai terakhir (urutan baris dipertahankan); hasil terurut per periode."""
+    result = df[["Periode", "Pemasukan"]].drop_duplicates(subset=["Periode"], keep="last")
+    result = result.sort_values("Periode", kind="stable").reset_index(drop=True)
+    result.attrs = dict(df.attrs)
+    return result
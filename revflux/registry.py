@@ -0,0 +1,183 @@
+"""Indeks dataset berbasis SQLite beserta kunci file per dataset.
+
+Registry mencatat setiap dataset (frekuensi, versi data aktif) dan snapshot-nya
+(versi data + salinan model) sehingga daftar dataset, pencarian versi aktif, dan
+rollback cukup satu query, tanpa memindai direktori. Setiap operasi membuka
+koneksi sendiri, jadi aman dipakai dari banyak thread (sesi Streamlit) maupun
+proses (worker training, CLI). SQLite berjalan dalam mode WAL agar pembaca tidak
+terblokir penulis.
+
+Penulisan file dataset diserialisasi dengan `dataset_lock` (flock pada
+`.lock` di direktori dataset), sehingga dua sesi yang meng-upload ke dataset
+yang sama tidak saling menimpa.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: kunci hanya berlaku di dalam satu proses
+    fcntl = None
+    _process_locks = {}
+    _process_locks_guard = threading.Lock()
+
+REGISTRY_FILE = "registry.sqlite3"
+LOCK_FILE = ".lock"
+BUSY_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    name TEXT PRIMARY KEY,
+    frequency TEXT NOT NULL,
+    data_version INTEGER,
+    last_version INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dataset TEXT NOT NULL,
+    data_version INTEGER,
+    model_file TEXT,
+    reason TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_dataset ON snapshots (dataset, id);
+CREATE INDEX IF NOT EXISTS datasets_by_update ON datasets (updated_at);
+"""
+
+
+def validate_dataset_name(name):
+    """ValueError bila `name` tidak aman dipakai sebagai satu komponen path (kosong, `.`/`..`, `/`, `\\`, NUL)."""
+    if not isinstance(name, str) or name.strip() in ("", ".", "..") or any(c in name for c in "/\\\0"):
+        raise ValueError(f"Nama dataset tidak valid: {name!r} (tidak boleh kosong, '.', '..', atau memuat / \\ NUL).")
+    return name
+
+
+def utc_now():
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+@contextmanager
+def dataset_lock(directory):
+    """Kunci eksklusif untuk menulis isi `directory` (lintas proses bila `fcntl` tersedia)."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / LOCK_FILE
+    if fcntl is None:
+        with _process_locks_guard:
+            lock = _process_locks.setdefault(str(path.resolve()), threading.Lock())
+        with lock:
+            yield
+        return
+    with open(path, "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class DatasetRegistry:
+    """Tabel `datasets` dan `snapshots` di `{root}/registry.sqlite3`."""
+
+    def __init__(self, root="."):
+        self.path = Path(root) / REGISTRY_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Koneksi dengan transaksi `BEGIN IMMEDIATE` (kunci tulis diambil di awal), commit otomatis."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def get(self, name):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM datasets WHERE name = ?", (name,)).fetchone()
+        return dict(row) if row else None
+
+    def names(self, with_data=True):
+        """Nama dataset, terbaru diperbarui lebih dulu; `with_data=False` ikut menyertakan dataset yang sedang direset."""
+        query = "SELECT name FROM datasets"
+        if with_data:
+            query += " WHERE data_version IS NOT NULL"
+        with self._connect() as conn:
+            return [row["name"] for row in conn.execute(query + " ORDER BY updated_at DESC, name")]
+
+    def register(self, name, frequency):
+        """Daftarkan dataset bila belum ada; frekuensi dataset lama tidak diubah."""
+        validate_dataset_name(name)
+        now = utc_now()
+        with self.transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO datasets (name, frequency, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                         (name, frequency, now, now))
+
+    def set_frequency(self, name, frequency):
+        with self.transaction() as conn:
+            conn.execute("UPDATE datasets SET frequency = ?, updated_at = ? WHERE name = ?", (frequency, utc_now(), name))
+
+    def next_version(self, name):
+        """Ambil nomor versi data berikutnya (monoton, tidak pernah dipakai ulang)."""
+        with self.transaction() as conn:
+            conn.execute("UPDATE datasets SET last_version = last_version + 1 WHERE name = ?", (name,))
+            return conn.execute("SELECT last_version FROM datasets WHERE name = ?", (name,)).fetchone()[0]
+
+    def set_data_version(self, name, version):
+        """Pindahkan penunjuk versi aktif (None = tanpa data); satu UPDATE sehingga atomik bagi pembaca."""
+        with self.transaction() as conn:
+            conn.execute("UPDATE datasets SET data_version = ?, updated_at = ? WHERE name = ?", (version, utc_now(), name))
+
+    def add_snapshot(self, name, data_version, model_file, reason):
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO snapshots (dataset, data_version, model_file, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+                (name, data_version, model_file, reason, utc_now()))
+            return cursor.lastrowid
+
+    def snapshots(self, name):
+        """Snapshot dataset, terbaru lebih dulu."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM snapshots WHERE dataset = ? ORDER BY id DESC", (name,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def snapshot(self, name, snapshot_id=None):
+        """Snapshot tertentu, atau yang terbaru bila `snapshot_id` None."""
+        query = "SELECT * FROM snapshots WHERE dataset = ?"
+        params = (name,)
+        if snapshot_id is not None:
+            query += " AND id = ?"
+            params += (snapshot_id,)
+        with self._connect() as conn:
+            row = conn.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+        return dict(row) if row else None
+
+    def delete_snapshots(self, ids):
+        with self.transaction() as conn:
+            conn.executemany("DELETE FROM snapshots WHERE id = ?", [(i,) for i in ids])
+
+    def forget(self, name):
+        """Hapus dataset beserta semua snapshot-nya dari registry."""
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM snapshots WHERE dataset = ?", (name,))
+            conn.execute("DELETE FROM datasets WHERE name = ?", (name,))
@@ -0,0 +1,165 @@
+"""Ekspor laporan prediksi ke PowerPoint, sepenuhnya di memori.
+
+Grafik dirender paralel lewat satu server kaleido yang tetap hidup (Chromium
+tidak dijalankan ulang setiap ekspor) dan hasil PNG-nya di-cache berdasarkan
+hash isi figure, sehingga ekspor ulang dengan grafik yang sama tidak merender
+lagi. Dek dibangun di `BytesIO` tanpa file sementara. Tata letak slide di sini
+dipakai bersama oleh halaman Streamlit dan pembuatan laporan massal.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from revflux.instrumentation import stage
+
+CHART_WIDTH = 960
+CHART_HEIGHT = 540
+RENDER_WORKERS = 3
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+def figure_key(fig, width=CHART_WIDTH, height=CHART_HEIGHT):
+    """Hash isi figure (data + layout) beserta ukuran gambar; dipakai sebagai kunci cache PNG."""
+    payload = fig.to_json() if hasattr(fig, "to_json") else str(fig)
+    return hashlib.sha256(f"{width}x{height}:{payload}".encode()).hexdigest()
+
+
+def placeholder_png(title, width=CHART_WIDTH, height=CHART_HEIGHT):
+    """PNG pengganti (Pillow) bila kaleido/Chromium tidak tersedia; None bila Pillow juga tidak ada."""
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        return None
+    img = Image.new("RGB", (width, height), color=(245, 245, 245))
+    ImageDraw.Draw(img).text((40, height // 2 - 20), f"{title}\n(Kaleido tidak tersedia — placeholder)", fill=(20, 20, 20))
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class ChartRenderer:
+    """Render figure Plotly ke PNG secara paralel dengan cache LRU berbasis hash isi.
+
+    Satu instance dimaksudkan hidup selama proses (mis. lewat `st.cache_resource`):
+    server kaleido dibuka sekali dengan `workers` tab Chromium dan dipakai ulang.
+    """
+
+    def __init__(self, workers=RENDER_WORKERS, max_entries=64, width=CHART_WIDTH, height=CHART_HEIGHT):
+        self.workers = workers
+        self.max_entries = max_entries
+        self.width = width
+        self.height = height
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._server_started = False
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chart-render")
+
+    def _start_server(self):
+        """Buka server kaleido global (kaleido >= 1.0) agar Chromium tetap hangat antar ekspor.
+
+        Hanya dipanggil setelah ada render yang berhasil: bila Chrome tidak ada, thread server
+        mati dan panggilan berikutnya akan menggantung, jadi server tidak boleh dibuka lebih dulu.
+        """
+        self._server_started = True
+        try:
+            import kaleido
+
+            start = getattr(kaleido, "start_sync_server", None)
+            if start is not None:
+                start(n=self.workers, silence_warnings=True)
+        except Exception:
+            pass
+
+    def _render(self, fig, title):
+        import plotly.io as pio
+
+        try:
+            return pio.to_image(fig, format="png", width=self.width, height=self.height), True
+        except Exception:
+            return placeholder_png(title, self.width, self.height), False
+
+    @stage("report.render")
+    def render_many(self, charts):
+        """`charts`: daftar (judul, figure). Mengembalikan daftar PNG bytes (atau None) dengan urutan yang sama."""
+        keys = [figure_key(fig, self.width, self.height) for _, fig in charts]
+        with self._lock:
+            images = [self._cache.get(key) for key in keys]
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+        missing = [i for i, image in enumerate(images) if image is None]
+        if missing:
+            futures = {i: self._executor.submit(self._render, charts[i][1], charts[i][0]) for i in missing}
+            rendered = []
+            for i, future in futures.items():
+                images[i], ok = future.result()
+                # Placeholder tidak di-cache supaya render asli dicoba lagi bila kaleido pulih.
+                if ok:
+                    rendered.append(i)
+            if rendered and not self._server_started:
+                self._start_server()
+            with self._lock:
+                for i in rendered:
+                    self._cache[keys[i]] = images[i]
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return images
+
+
+@stage("report.pptx")
+def build_report_pptx(dataset, hist_data, forecast_df, charts, images):
+    """Bangun dek laporan (judul, ringkasan, satu slide per grafik, kesimpulan) dan kembalikan bytes .pptx.
+
+    `charts` berisi (judul, figure) dan `images` PNG hasil `ChartRenderer.render_many` dengan urutan sama.
+    """
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    prs = Presentation()
+    period_text = (
+        f"Dataset: {dataset}\n"
+        f"Periode Data Aktual: {hist_data['Periode'].min().strftime('%B %Y')} - {hist_data['Periode'].max().strftime('%B %Y')}\n"
+        f"Periode Prediksi: {len(forecast_df)} bulan ke depan"
+    )
+
+    # --- Slide Judul / Ringkasan ---
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = "Laporan Prediksi Pemasukan"
+    try:
+        slide.placeholders[1].text = period_text
+    except KeyError:
+        slide.shapes.add_textbox(Inches(1), Inches(1.5), Inches(8), Inches(2)).text_frame.text = period_text
+
+    # --- Slide ringkasan angka prediksi (maksimal 10 baris agar muat satu slide) ---
+    summary_slide = prs.slides.add_slide(prs.slide_layouts[1])
+    summary_slide.shapes.title.text = "Ringkasan Prediksi"
+    tb = summary_slide.shapes.add_textbox(Inches(0.7), Inches(1.8), Inches(9), Inches(3)).text_frame
+    tb.text = "Tabel Prediksi (1 baris per periode):"
+    for periode, pemasukan in zip(forecast_df["Periode"].iloc[:10], forecast_df["Pemasukan"].iloc[:10]):
+        p = tb.add_paragraph()
+        p.text = f"{periode.strftime('%B %Y')} — Rp {pemasukan:,.0f}".replace(",", ".")
+        p.level = 1
+
+    # --- Slide grafik ---
+    for (title, _), image in zip(charts, images):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = title
+        if image is not None:
+            slide.shapes.add_picture(io.BytesIO(image), Inches(0.5), Inches(1.2), width=Inches(9))
+        else:
+            slide.shapes.add_textbox(Inches(0.5), Inches(1.2), Inches(9), Inches(2)).text_frame.text = (
+                f"{title}\n(Kaleido & Pillow tidak tersedia — tidak ada gambar)"
+            )
+
+    # --- Slide Kesimpulan ---
+    cs_slide = prs.slides.add_slide(prs.slide_layouts[1])
+    cs_slide.shapes.title.text = "Kesimpulan"
+    txt = cs_slide.shapes.add_textbox(Inches(0.7), Inches(1.8), Inches(9), Inches(3)).text_frame
+    txt.text = ("Laporan ini berisi prediksi pemasukan berdasarkan model SARIMA.\n"
+                "Periksa slide 'Ringkasan Prediksi' untuk tabel singkat dan slide grafik untuk visualisasi.")
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,277 @@
+"""Layanan HTTP (ASGI) forecast dari model tersimpan, untuk diakses sistem lain (mis. ERP).
+
+    GET /forecast?dataset=toko_a&steps=12
+    GET /health
+
+Jalankan dengan `python -m revflux serve --port 8000`, atau langsung lewat uvicorn:
+`uvicorn --factory revflux.serving:create_app`. `ForecastApp` adalah callable ASGI
+murni tanpa framework web, jadi satu-satunya dependensi tambahan adalah server ASGI.
+
+Model per dataset dimuat sekali ke cache LRU di memori, langsung bersama forecast
+`PRECOMPUTED_STEPS` periode di skala asli (`forecast_frame`: expm1 dari forecast
+log1p, sama dengan halaman Streamlit). Request yang horizonnya sudah tersedia cukup
+memotong tabel itu. Request dengan horizon lebih panjang dikumpulkan per model
+selama `batch_window` detik lalu dihitung sekali pada horizon terpanjang di batch;
+hasilnya menggantikan forecast tersimpan untuk request berikutnya. Request serentak
+untuk model yang belum termuat juga menunggu satu pemuatan yang sama.
+
+Versi data dan file model diperiksa ulang paling lama setiap `revalidate_after`
+detik, sehingga retrain, upload, atau rollback otomatis memuat ulang entri cache.
+Pemuatan model dan perhitungan forecast berjalan di thread pool; state cache hanya
+disentuh dari event loop sehingga tidak membutuhkan kunci.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from urllib.parse import parse_qs
+
+import pandas as pd
+
+from revflux.modeling import forecast_frame, future_periods, load_model
+from revflux.storage import DatasetStore
+
+PRECOMPUTED_STEPS = 24
+DEFAULT_STEPS = 12
+MAX_STEPS = 120
+DEFAULT_CACHE_SIZE = 32
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_REVALIDATE_AFTER = 1.0
+
+
+class ServiceError(Exception):
+    """Kesalahan yang dikembalikan ke klien dengan status HTTP `status`."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def dated_forecast(model, last_period, freq, steps):
+    forecast = forecast_frame(model, steps)
+    forecast.insert(0, "Periode", future_periods(last_period, steps, freq))
+    return forecast
+
+
+def _finite(value):
+    return value if math.isfinite(value) else None
+
+
+def forecast_records(forecast):
+    """Baris forecast sebagai dict siap-JSON; nilai tak hingga (overflow expm1) menjadi null."""
+    return [
+        {"periode": period.strftime("%Y-%m-%d"), "pemasukan": _finite(mean),
+         "batas_bawah": _finite(lower), "batas_atas": _finite(upper)}
+        for period, mean, lower, upper in zip(
+            forecast["Periode"], forecast["Pemasukan"].tolist(),
+            forecast["Batas Bawah"].tolist(), forecast["Batas Atas"].tolist())
+    ]
+
+
+@dataclass
+class ServingStats:
+    requests: int = 0
+    precomputed_hits: int = 0
+    model_loads: int = 0
+    evictions: int = 0
+    batches: int = 0
+    batched_requests: int = 0
+
+
+class PendingBatch:
+    def __init__(self, steps):
+        self.steps = steps
+        self.size = 0
+        self.future = asyncio.get_running_loop().create_future()
+
+
+class CachedModel:
+    def __init__(self, name, key, model, last_period, freq, forecast):
+        self.name = name
+        self.key = key
+        self.model = model
+        self.last_period = last_period
+        self.freq = freq
+        self.checked_at = time.monotonic()
+        self.pending = None
+        self.records = forecast_records(forecast)
+
+    @property
+    def data_version(self):
+        return self.key[1]
+
+    @property
+    def horizon(self):
+        return len(self.records)
+
+
+class ForecastService:
+    """Cache LRU model per dataset plus micro-batching forecast; dipakai dari satu event loop."""
+
+    def __init__(self, store, max_entries=DEFAULT_CACHE_SIZE, precompute_steps=PRECOMPUTED_STEPS,
+                 max_steps=MAX_STEPS, batch_window=DEFAULT_BATCH_WINDOW, revalidate_after=DEFAULT_REVALIDATE_AFTER):
+        self.store = store
+        self.max_entries = max_entries
+        self.precompute_steps = precompute_steps
+        self.max_steps = max_steps
+        self.batch_window = batch_window
+        self.revalidate_after = revalidate_after
+        self.stats = ServingStats()
+        self._cache = OrderedDict()
+        self._loading = {}
+        self._tasks = set()
+
+    @property
+    def cached_models(self):
+        return len(self._cache)
+
+    def _model_key(self, name):
+        """(nama, versi data, path model, mtime, ukuran): berubah setiap upload, retrain, atau rollback."""
+        _, data_version = self.store.version(name)
+        path = self.store.resolve_model_path(name)
+        if data_version is None or path is None:
+            raise ServiceError(404, f"Dataset '{name}' tidak ditemukan atau belum punya model.")
+        stat = path.stat()
+        return name, data_version, str(path), stat.st_mtime_ns, stat.st_size
+
+    def _load(self, name, key):
+        model = load_model(key[2])
+        last_period = self.store.load(name)["Periode"].iloc[-1]
+        freq = self.store.frequency(name)
+        forecast = dated_forecast(model, last_period, freq, self.precompute_steps)
+        return CachedModel(name, key, model, last_period, freq, forecast)
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _load_entry(self, name, key):
+        try:
+            entry = await asyncio.to_thread(self._load, name, key)
+        finally:
+            self._loading.pop(key, None)
+        self.stats.model_loads += 1
+        self._cache[name] = entry
+        self._cache.move_to_end(name)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self.stats.evictions += 1
+        return entry
+
+    async def model(self, name):
+        """Entri cache `name`; dimuat (sekali untuk semua request serentak) bila belum ada atau sudah usang."""
+        entry = self._cache.get(name)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < self.revalidate_after:
+            self._cache.move_to_end(name)
+            return entry
+        key = self._model_key(name)
+        if entry is not None and entry.key == key:
+            entry.checked_at = now
+            self._cache.move_to_end(name)
+            return entry
+        task = self._loading.get(key)
+        if task is None:
+            task = self._loading[key] = self._spawn(self._load_entry(name, key))
+        # shield: klien yang memutus koneksi tidak membatalkan pemuatan milik request lain
+        return await asyncio.shield(task)
+
+    async def _run_batch(self, entry, batch):
+        await asyncio.sleep(self.batch_window)
+        entry.pending = None
+        self.stats.batches += 1
+        self.stats.batched_requests += batch.size
+        try:
+            forecast = await asyncio.to_thread(dated_forecast, entry.model, entry.last_period, entry.freq, batch.steps)
+            records = forecast_records(forecast)
+        except Exception as e:
+            batch.future.set_exception(e)
+            return
+        if len(records) > entry.horizon:
+            entry.records = records
+        batch.future.set_result(records)
+
+    async def forecast(self, name, steps=DEFAULT_STEPS):
+        """Kembalikan (entri cache, baris forecast `steps` periode, sumber: "precomputed" atau "batched")."""
+        if not 1 <= steps <= self.max_steps:
+            raise ServiceError(400, f"steps harus di antara 1 dan {self.max_steps}.")
+        self.stats.requests += 1
+        entry = await self.model(name)
+        if steps <= entry.horizon:
+            self.stats.precomputed_hits += 1
+            return entry, entry.records[:steps], "precomputed"
+        batch = entry.pending
+        if batch is None:
+            batch = entry.pending = PendingBatch(steps)
+            self._spawn(self._run_batch(entry, batch))
+        batch.steps = max(batch.steps, steps)
+        batch.size += 1
+        records = await asyncio.shield(batch.future)
+        return entry, records[:steps], "batched"
+
+
+class ForecastApp:
+    """Aplikasi ASGI di atas `ForecastService`."""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        try:
+            payload = await self._dispatch(scope)
+            status = 200
+        except ServiceError as e:
+            status, payload = e.status, {"error": str(e)}
+        except FileNotFoundError as e:
+            status, payload = 404, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": f"Gagal membuat forecast: {e}"}
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json; charset=utf-8"),
+                                (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _dispatch(self, scope):
+        if scope["method"] != "GET":
+            raise ServiceError(405, "Hanya GET yang didukung.")
+        if scope["path"] == "/health":
+            return {"status": "ok", "cached_models": self.service.cached_models, **asdict(self.service.stats)}
+        if scope["path"] != "/forecast":
+            raise ServiceError(404, f"Path tidak dikenal: {scope['path']}")
+
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+        name = query.get("dataset", [None])[0]
+        if not name:
+            raise ServiceError(400, "Parameter dataset wajib diisi.")
+        try:
+            steps = int(query.get("steps", [DEFAULT_STEPS])[0])
+        except ValueError:
+            raise ServiceError(400, "steps harus bilangan bulat.")
+        entry, records, source = await self.service.forecast(name, steps)
+        return {"dataset": name, "frequency": entry.freq, "data_version": entry.data_version,
+                "last_period": pd.Timestamp(entry.last_period).strftime("%Y-%m-%d"),
+                "steps": steps, "source": source, "forecast": records}
+
+
+def create_app(root=".", **options):
+    """Pabrik aplikasi untuk `uvicorn --factory`; `options` diteruskan ke `ForecastService`."""
+    return ForecastApp(ForecastService(DatasetStore(root), **options))
@@ -0,0 +1,444 @@
+"""Penyimpanan dataset kolumnar (Feather/Arrow IPC) per nama dataset, diindeks registry SQLite.
+
+Tata letak di bawah `root`:
+
+    registry.sqlite3                       indeks dataset & snapshot (lihat revflux.registry)
+    datasets/{nama}/data/v{N}/2024.feather versi data N, dipartisi per tahun
+    datasets/{nama}/model.npz              model aktif (atau model.pkl format lama)
+    datasets/{nama}/snapshots/{id}.npz     salinan model milik snapshot `id`
+
+Setiap versi data bersifat immutable dengan skema tetap: `Periode`
+datetime64[ns] dan `Pemasukan` float64. Upsert menulis hanya partisi tahun
+yang tersentuh ke versi baru; partisi lain di-hardlink dari versi sebelumnya,
+sehingga biayanya sebanding dengan ukuran upload, bukan ukuran histori.
+Versi baru baru terlihat setelah penunjuk `data_version` di registry dipindah,
+jadi pembaca tidak pernah melihat dataset setengah jadi. Penulisan ke satu
+dataset diserialisasi dengan kunci file.
+
+Sebelum setiap perubahan (upsert, reset, rollback) dibuat snapshot: versi data
+saat itu plus hardlink model aktif. Rollback hanya memindah penunjuk versi dan
+mengembalikan file model. Snapshot di luar `MAX_SNAPSHOTS` terbaru dipangkas
+beserta versi data yang tidak lagi dirujuk.
+
+Tata letak lama (`{nama}_data/`, `{nama}_data.csv`, `{nama}_model.*`,
+`*_backup.*`) bisa diimpor lewat `migrate_legacy` (`python -m revflux migrate-legacy`);
+file aslinya tidak dipindah maupun dihapus.
+"""
+import io
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from revflux.artifacts import ARTIFACT_SUFFIX
+from revflux.instrumentation import stage
+from revflux.preprocessing import MONTHLY, SEASONAL_PERIODS, preprocess_period_column
+from revflux.registry import LOCK_FILE, DatasetRegistry, dataset_lock, validate_dataset_name
+
+DATASETS_DIR = "datasets"
+PARTITION_SUFFIX = ".feather"
+LEGACY_DATA_DIR_SUFFIX = "_data"
+LEGACY_BACKUP_DIR_SUFFIX = "_data_backup"
+LEGACY_CSV_SUFFIX = "_data.csv"
+LEGACY_FEATHER_SUFFIX = "_data.feather"
+LEGACY_FREQUENCY_FILE = "frequency.txt"
+# Urutan penting: akhiran terpanjang dicocokkan lebih dulu.
+LEGACY_SUFFIXES = ("_data_backup", "_model_backup.npz", "_model_backup.pkl", "_data.feather", "_data.csv", "_data")
+CSV_DATE_FORMAT = "%Y-%m-%d"
+MAX_SNAPSHOTS = 20
+
+
+@dataclass
+class UpsertResult:
+    inserted: int
+    updated: int
+    partitions_written: int
+
+
+def require_periods(df):
+    """ValueError bila `df` tidak berisi satu periode pun; dipanggil sebelum dataset didaftarkan."""
+    if len(df) == 0:
+        raise ValueError("Tidak ada periode valid untuk disimpan (file kosong atau semua baris gagal dibaca).")
+    return df
+
+
+def to_store_schema(df):
+    """Ambil kolom 'Periode'/'Pemasukan' dengan tipe penyimpanan yang baku."""
+    return pd.DataFrame({
+        "Periode": df["Periode"].to_numpy(dtype="datetime64[ns]"),
+        "Pemasukan": df["Pemasukan"].to_numpy(dtype="float64"),
+    })
+
+
+def write_feather_atomic(df, path):
+    """Tulis ke file sementara di direktori yang sama lalu `os.replace` agar pembaca tidak melihat file setengah jadi."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Tanpa kompresi supaya file bisa dibaca lewat memory-map.
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def read_feather(path, memory_map=True):
+    return feather.read_table(path, memory_map=memory_map).to_pandas()
+
+
+def link_or_copy(source, target):
+    """Hardlink `source` ke `target` (file versi tidak pernah diubah di tempat); salin bila hardlink tidak didukung."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class DatasetStore:
+    """Akses baca/tulis dataset di satu direktori data."""
+
+    def __init__(self, root="."):
+        self.root = Path(root)
+        self.registry = DatasetRegistry(self.root)
+
+    # --- Path ---------------------------------------------------------------
+
+    def dataset_dir(self, name):
+        return self.root / DATASETS_DIR / name
+
+    def version_path(self, name, version):
+        return self.dataset_dir(name) / "data" / f"v{version}"
+
+    def data_path(self, name):
+        """Direktori versi data aktif, atau None bila dataset belum/tidak berisi data."""
+        entry = self.registry.get(name)
+        if entry is None or entry["data_version"] is None:
+            return None
+        return self.version_path(name, entry["data_version"])
+
+    def model_path(self, name):
+        """Artefak model ringkas (lihat revflux.artifacts)."""
+        return self.dataset_dir(name) / f"model{ARTIFACT_SUFFIX}"
+
+    def legacy_model_path(self, name):
+        """Pickle `SARIMAXResults` penuh dari versi lama; masih bisa dimuat bila artefak ringkas belum ada."""
+        return self.dataset_dir(name) / "model.pkl"
+
+    def resolve_model_path(self, name):
+        """Path model yang tersedia (ringkas diutamakan), atau None."""
+        for path in (self.model_path(name), self.legacy_model_path(name)):
+            if path.exists():
+                return path
+        return None
+
+    def delete_model(self, name):
+        for path in (self.model_path(name), self.legacy_model_path(name)):
+            if path.exists():
+                path.unlink()
+
+    # --- Registry -------------------------------------------------------------
+
+    def list_datasets(self):
+        """Nama semua dataset yang berisi data, terbaru diperbarui lebih dulu."""
+        return self.registry.names()
+
+    def known_datasets(self):
+        """Seperti `list_datasets`, ditambah dataset yang direset tetapi masih punya snapshot."""
+        return self.registry.names(with_data=False)
+
+    def exists(self, name):
+        entry = self.registry.get(name)
+        return entry is not None and entry["data_version"] is not None
+
+    def version(self, name):
+        """Tuple (nama, versi data aktif); berubah setiap kali dataset ditulis, dipakai sebagai kunci cache."""
+        entry = self.registry.get(name)
+        return name, entry["data_version"] if entry else None
+
+    def frequency(self, name):
+        """Frekuensi periode dataset (`MONTHLY` atau `WEEKLY`); bulanan bila belum terdaftar."""
+        entry = self.registry.get(name)
+        return entry["frequency"] if entry else MONTHLY
+
+    def set_frequency(self, name, freq):
+        if freq not in SEASONAL_PERIODS:
+            raise ValueError(f"Frekuensi tidak dikenal: {freq!r} (pilihan: {', '.join(SEASONAL_PERIODS)}).")
+        validate_dataset_name(name)
+        self.registry.register(name, freq)
+        self.registry.set_frequency(name, freq)
+
+    # --- Baca ----------------------------------------------------------------
+
+    def partitions(self, name):
+        data_dir = self.data_path(name)
+        if data_dir is None or not data_dir.is_dir():
+            return []
+        return sorted(data_dir.glob(f"*{PARTITION_SUFFIX}"))
+
+    @stage("storage.load")
+    def load(self, name, memory_map=True):
+        """Baca seluruh versi data aktif; tidak ada parsing tanggal karena tipe kolom sudah tersimpan."""
+        tables = [feather.read_table(p, memory_map=memory_map) for p in self.partitions(name)]
+        if not tables:
+            raise FileNotFoundError(f"Dataset '{name}' tidak ditemukan.")
+        return pa.concat_tables(tables).to_pandas()
+
+    # --- Tulis ---------------------------------------------------------------
+
+    def _commit_version(self, name, partitions, keep_from=None):
+        """Tulis `{tahun: DataFrame}` sebagai versi baru; partisi `keep_from` yang tidak ditulis ikut di-hardlink.
+
+        Versi disusun di direktori sementara lalu di-rename, baru kemudian penunjuk di registry dipindah.
+        """
+        version = self.registry.next_version(name)
+        target = self.version_path(name, version)
+        staging = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        try:
+            if keep_from is not None:
+                for path in keep_from.glob(f"*{PARTITION_SUFFIX}"):
+                    if int(path.stem) not in partitions:
+                        link_or_copy(path, staging / path.name)
+            for year, part in partitions.items():
+                write_feather_atomic(part.reset_index(drop=True), staging / f"{year}{PARTITION_SUFFIX}")
+            if not any(staging.glob(f"*{PARTITION_SUFFIX}")):
+                raise ValueError(f"Versi data '{name}' tanpa partisi tidak disimpan.")
+            os.replace(staging, target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self.registry.set_data_version(name, version)
+        return version
+
+    def save(self, name, df, reason="sebelum impor"):
+        """Ganti seluruh isi dataset dengan `df` (versi lama tetap tersimpan sebagai snapshot)."""
+        validate_dataset_name(name)
+        df = to_store_schema(require_periods(df)).sort_values("Periode", kind="stable").reset_index(drop=True)
+        self.registry.register(name, MONTHLY)
+        with dataset_lock(self.dataset_dir(name)):
+            if self.exists(name):
+                self._snapshot(name, reason)
+            self._commit_version(name, dict(list(df.groupby(df["Periode"].dt.year, sort=True))))
+            self.prune(name)
+        return df
+
+    @stage("storage.upsert")
+    def upsert(self, name, df, accumulate=False):
+        """Gabungkan periode baru ke dataset; hanya partisi tahun yang tersentuh yang ditulis ulang.
+
+        Bawaannya last-write-wins. Dengan `accumulate=True` (upload transaksi lanjutan)
+        nilai periode yang sudah ada ditambah, bukan diganti. `updated` hanya menghitung
+        periode yang nilainya berubah; bila tidak ada yang berubah, tidak dibuat versi
+        maupun snapshot baru.
+        """
+        validate_dataset_name(name)
+        new = to_store_schema(require_periods(df)).drop_duplicates(subset=["Periode"], keep="last")
+        self.registry.register(name, MONTHLY)
+        inserted = updated = 0
+        years = new["Periode"].dt.year
+        with dataset_lock(self.dataset_dir(name)):
+            current = self.data_path(name)
+            partitions = {}
+            for year, batch in new.groupby(years, sort=True):
+                path = current / f"{year}{PARTITION_SUFFIX}" if current is not None else None
+                if path is not None and path.exists():
+                    old = read_feather(path, memory_map=False)
+                    previous = batch["Periode"].map(old.set_index("Periode")["Pemasukan"])
+                    existing = batch["Periode"].isin(old["Periode"])
+                    if accumulate:
+                        batch = batch.assign(Pemasukan=batch["Pemasukan"] + previous.fillna(0.0))
+                    changed = int((existing & (batch["Pemasukan"] != previous)).sum())
+                    added = int((~existing).sum())
+                    if not changed and not added:
+                        continue
+                    updated += changed
+                    inserted += added
+                    merged = pd.concat([old[~old["Periode"].isin(batch["Periode"])], batch], ignore_index=True)
+                else:
+                    inserted += len(batch)
+                    merged = batch
+                partitions[year] = merged.sort_values("Periode", kind="stable")
+            if partitions:
+                if current is not None:
+                    self._snapshot(name, "sebelum upload")
+                self._commit_version(name, partitions, keep_from=current)
+                self.prune(name)
+        return UpsertResult(inserted=inserted, updated=updated, partitions_written=len(partitions))
+
+    # --- Snapshot & rollback -------------------------------------------------
+
+    def _snapshot(self, name, reason):
+        """Catat versi data aktif + hardlink model aktif; pemanggil memegang kunci dataset."""
+        entry = self.registry.get(name)
+        model = self.resolve_model_path(name)
+        if entry is None or (entry["data_version"] is None and model is None):
+            return None
+        model_file = None
+        snapshot_dir = self.dataset_dir(name) / "snapshots"
+        if model is not None:
+            snapshot_dir.mkdir(parents=True, exist_ok=True)
+            staged = snapshot_dir / f".{os.getpid()}{model.suffix}.tmp"
+            link_or_copy(model, staged)
+        snapshot_id = self.registry.add_snapshot(name, entry["data_version"], None, reason)
+        if model is not None:
+            model_file = f"snapshots/{snapshot_id}{model.suffix}"
+            os.replace(staged, self.dataset_dir(name) / model_file)
+            with self.registry.transaction() as conn:
+                conn.execute("UPDATE snapshots SET model_file = ? WHERE id = ?", (model_file, snapshot_id))
+        return snapshot_id
+
+    def snapshot(self, name, reason="manual"):
+        """Buat snapshot (versi data + model aktif); mengembalikan id snapshot atau None bila tidak ada isi."""
+        with dataset_lock(self.dataset_dir(name)):
+            snapshot_id = self._snapshot(name, reason)
+            self.prune(name)
+        return snapshot_id
+
+    def snapshots(self, name):
+        """Daftar snapshot dataset (dict: id, data_version, model_file, reason, created_at), terbaru lebih dulu."""
+        return self.registry.snapshots(name)
+
+    def has_snapshot(self, name):
+        return self.registry.snapshot(name) is not None
+
+    def rollback(self, name, snapshot_id=None):
+        """Kembalikan data & model ke snapshot `snapshot_id` (bawaan: terbaru). Kondisi sekarang di-snapshot dulu."""
+        target = self.registry.snapshot(name, snapshot_id)
+        if target is None:
+            return False
+        with dataset_lock(self.dataset_dir(name)):
+            self._snapshot(name, f"sebelum rollback ke #{target['id']}")
+            self.delete_model(name)
+            if target["model_file"]:
+                source = self.dataset_dir(name) / target["model_file"]
+                destination = self.model_path(name) if source.suffix == ARTIFACT_SUFFIX else self.legacy_model_path(name)
+                staged = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+                link_or_copy(source, staged)
+                os.replace(staged, destination)
+            self.registry.set_data_version(name, target["data_version"])
+            self.prune(name)
+        return True
+
+    def reset(self, name):
+        """Kosongkan data & model dataset; isinya tetap bisa dikembalikan lewat `rollback`."""
+        with dataset_lock(self.dataset_dir(name)):
+            self._snapshot(name, "sebelum reset")
+            self.delete_model(name)
+            self.registry.set_data_version(name, None)
+
+    def delete(self, name):
+        """Hapus dataset beserta semua versi, model, dan snapshot-nya (tidak bisa dikembalikan)."""
+        directory = self.dataset_dir(name)
+        if directory.resolve().parent != (self.root / DATASETS_DIR).resolve():
+            # Nama tidak valid dari registry lama (mis. '..'): hanya barisnya yang dihapus, bukan isi direktori
+            self.registry.forget(name)
+            return
+        with dataset_lock(directory):
+            self.registry.forget(name)
+            for child in directory.iterdir():
+                if child.is_dir():
+                    shutil.rmtree(child, ignore_errors=True)
+                elif child.name != LOCK_FILE:
+                    child.unlink()
+
+    def delete_all(self):
+        for name in self.known_datasets():
+            self.delete(name)
+
+    def prune(self, name, keep=MAX_SNAPSHOTS):
+        """Buang snapshot di luar `keep` terbaru, beserta versi data & salinan model yang tidak lagi dirujuk."""
+        snapshots = self.registry.snapshots(name)
+        dropped = snapshots[keep:]
+        if dropped:
+            self.registry.delete_snapshots([s["id"] for s in dropped])
+            for s in dropped:
+                if s["model_file"]:
+                    (self.dataset_dir(name) / s["model_file"]).unlink(missing_ok=True)
+        entry = self.registry.get(name)
+        referenced = {s["data_version"] for s in snapshots[:keep]} | {entry["data_version"] if entry else None}
+        data_root = self.dataset_dir(name) / "data"
+        if data_root.is_dir():
+            for path in data_root.glob("v*"):
+                if path.name[1:].isdigit() and int(path.name[1:]) not in referenced:
+                    shutil.rmtree(path, ignore_errors=True)
+
+    # --- Impor / ekspor ------------------------------------------------------
+
+    def import_csv(self, name, source):
+        """Impor CSV (path atau buffer) dengan kolom Periode & Pemasukan menggantikan isi dataset."""
+        return self.save(name, preprocess_period_column(pd.read_csv(source)))
+
+    def export_csv(self, name):
+        """Ekspor dataset sebagai teks CSV dengan format tanggal konsisten."""
+        buffer = io.StringIO()
+        self.load(name).to_csv(buffer, index=False, date_format=CSV_DATE_FORMAT)
+        return buffer.getvalue()
+
+    def migrate_legacy(self, source=None):
+        """Salin tata letak lama di `source` (bawaan: `root`) ke registry; file aslinya tidak disentuh.
+
+        Hanya dijalankan atas perintah eksplisit, karena pemindaian ini bisa menemukan file
+        lain yang kebetulan bernama mirip. Dataset yang sudah terdaftar dilewati, jadi aman
+        dijalankan ulang. Mengembalikan nama yang dimigrasi.
+        """
+        source = Path(source) if source is not None else self.root
+        names = set()
+        for path in source.iterdir():
+            suffix = next((s for s in LEGACY_SUFFIXES if path.name.endswith(s)), None)
+            if suffix is not None and path.is_dir() == (suffix in (LEGACY_DATA_DIR_SUFFIX, LEGACY_BACKUP_DIR_SUFFIX)):
+                names.add(path.name[: -len(suffix)])
+        migrated = []
+        for name in sorted(names):
+            if name and self.registry.get(name) is None and self._migrate_one(name, source):
+                migrated.append(name)
+        return migrated
+
+    def _migrate_one(self, name, root):
+        data_dir = root / f"{name}{LEGACY_DATA_DIR_SUFFIX}"
+        backup_dir = root / f"{name}{LEGACY_BACKUP_DIR_SUFFIX}"
+        frequency = MONTHLY
+        if (data_dir / LEGACY_FREQUENCY_FILE).exists():
+            frequency = (data_dir / LEGACY_FREQUENCY_FILE).read_text().strip()
+
+        def load_partitions(directory):
+            tables = [feather.read_table(p, memory_map=False) for p in sorted(directory.glob(f"*{PARTITION_SUFFIX}"))]
+            return pa.concat_tables(tables).to_pandas() if tables else None
+
+        backup = load_partitions(backup_dir) if backup_dir.is_dir() else None
+        model_backups = [p for p in (root / f"{name}_model_backup{ARTIFACT_SUFFIX}", root / f"{name}_model_backup.pkl")
+                         if p.exists()]
+        current = load_partitions(data_dir) if data_dir.is_dir() else None
+        if current is None and (root / f"{name}{LEGACY_FEATHER_SUFFIX}").exists():
+            current = read_feather(root / f"{name}{LEGACY_FEATHER_SUFFIX}", memory_map=False)
+        if current is None and (root / f"{name}{LEGACY_CSV_SUFFIX}").exists():
+            current = preprocess_period_column(pd.read_csv(root / f"{name}{LEGACY_CSV_SUFFIX}"))
+        if current is None and backup is None and not model_backups:
+            return False  # direktori/file lain yang kebetulan berakhiran sama
+
+        self.registry.register(name, frequency)
+        # Backup lama menjadi snapshot pertama, supaya tombol "kembalikan" tetap berfungsi.
+        if backup is not None or model_backups:
+            if backup is not None:
+                self.save(name, backup)
+            if model_backups:
+                self.dataset_dir(name).mkdir(parents=True, exist_ok=True)
+                target = self.model_path(name) if model_backups[0].suffix == ARTIFACT_SUFFIX else self.legacy_model_path(name)
+                shutil.copy(model_backups[0], target)
+            self.snapshot(name, "backup format lama")
+            self.delete_model(name)
+            self.registry.set_data_version(name, None)
+
+        if current is not None:
+            self.save(name, current, reason="sebelum migrasi")
+        for suffix, target in ((ARTIFACT_SUFFIX, self.model_path(name)), (".pkl", self.legacy_model_path(name))):
+            source = root / f"{name}_model{suffix}"
+            if source.exists():
+                self.dataset_dir(name).mkdir(parents=True, exist_ok=True)
+                shutil.copy(source, target)
+        return True
@@ -0,0 +1,128 @@
+"""Update model inkremental: perpanjang filter state-space dengan periode baru tanpa estimasi ulang.
+
+Setelah upload, periode baru cukup dimasukkan ke filter Kalman memakai parameter
+hasil fit terakhir (lihat `CompactForecaster.extend`). Estimasi ulang penuh hanya
+dilakukan bila:
+
+* riwayat yang sudah dilihat model berubah (hash `history_sha256` tidak cocok),
+* jadwal tercapai: `max_updates` update sejak fit penuh atau `refit_after_days` hari,
+* terdeteksi drift: |inovasi terstandardisasi| periode baru melewati `drift_threshold`.
+
+Refit memakai orde yang sama dengan model tersimpan dan warm start dari parameternya.
+"""
+import math
+import time
+import warnings
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+
+from revflux.artifacts import as_compact, history_checksum
+from revflux.jobs import TrainingCancelled
+from revflux.modeling import fit_sarimax, forecast_frame, load_model, save_model
+
+DRIFT_THRESHOLD = 3.0
+MAX_UPDATES = 12
+REFIT_AFTER_DAYS = 365
+COMPARE_STEPS = 24
+
+EXTENDED = "extended"
+REFIT = "refit"
+UNCHANGED = "unchanged"
+
+
+@dataclass
+class UpdateReport:
+    dataset: str
+    mode: str
+    n_new: int
+    reason: str
+    max_abs_z: float
+    elapsed: float
+    refit_max_rel_diff: float = math.nan
+    refit_mean_rel_diff: float = math.nan
+
+
+def refit_reason(compact, y, max_updates=MAX_UPDATES, refit_after_days=REFIT_AFTER_DAYS):
+    """Alasan estimasi ulang penuh wajib dilakukan sebelum melihat data baru, atau None."""
+    header = compact.header
+    if "history_sha256" not in header:
+        return "artefak model lama tanpa hash riwayat"
+    if len(y) < compact.nobs or history_checksum(np.log1p(y[:compact.nobs])) != header["history_sha256"]:
+        return "riwayat yang sudah dilatih berubah"
+    if header.get("updates_since_fit", 0) + 1 > max_updates:
+        return f"jadwal: sudah {header.get('updates_since_fit', 0)} update sejak fit penuh"
+    fitted_at = datetime.fromisoformat(header["fitted_at"])
+    if (datetime.now(timezone.utc) - fitted_at).days >= refit_after_days:
+        return f"jadwal: fit penuh terakhir {fitted_at:%Y-%m-%d}"
+    return None
+
+
+def _check_cancel(should_cancel, name):
+    if should_cancel is not None and should_cancel():
+        raise TrainingCancelled(name)
+
+
+def _refit(compact, y, callback=None):
+    spec = compact.spec
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            return fit_sarimax(y, tuple(spec["order"]), tuple(spec["seasonal_order"]), start_params=compact.params,
+                               callback=callback)
+        except ValueError:
+            # Jumlah parameter berbeda (mis. artefak lama); mulai dari nilai bawaan statsmodels.
+            return fit_sarimax(y, tuple(spec["order"]), tuple(spec["seasonal_order"]), callback=callback)
+
+
+def _relative_diff(a, b):
+    a, b = forecast_frame(a, COMPARE_STEPS)["Pemasukan"].to_numpy(), forecast_frame(b, COMPARE_STEPS)["Pemasukan"].to_numpy()
+    rel = np.abs(a - b) / np.abs(b)
+    return float(np.max(rel)), float(np.mean(rel))
+
+
+def update_model(store, name, drift_threshold=DRIFT_THRESHOLD, max_updates=MAX_UPDATES,
+                 refit_after_days=REFIT_AFTER_DAYS, force_refit=False, compare_refit=False, should_cancel=None):
+    """Perbarui model `name` dengan periode baru di store; simpan hasilnya dan kembalikan `UpdateReport`.
+
+    Dengan `compare_refit=True`, model hasil perpanjangan dibandingkan dengan fit
+    penuh (tidak disimpan) pada forecast `COMPARE_STEPS` periode. `should_cancel`
+    (callable tanpa argumen) diperiksa setiap iterasi refit dan sebelum model
+    disimpan; bila bernilai benar, `TrainingCancelled` dilempar dan model lama tetap.
+    """
+    def check_cancel(params=None):
+        _check_cancel(should_cancel, name)
+
+    started = time.perf_counter()
+    model_path = store.resolve_model_path(name)
+    if model_path is None:
+        raise FileNotFoundError(f"Model '{name}' belum dilatih.")
+    compact = as_compact(load_model(model_path))
+    y = store.load(name)["Pemasukan"].to_numpy(dtype="float64")
+    n_new = max(len(y) - compact.nobs, 0)
+
+    reason = "dipaksa" if force_refit else refit_reason(compact, y, max_updates, refit_after_days)
+    max_abs_z = math.nan
+    if reason is None and n_new == 0:
+        return UpdateReport(name, UNCHANGED, 0, "tidak ada periode baru", max_abs_z, time.perf_counter() - started)
+
+    if reason is None:
+        extended, z = compact.extend(y[compact.nobs:], history_sha256=history_checksum(np.log1p(y)))
+        max_abs_z = float(np.nanmax(np.abs(z))) if np.isfinite(z).any() else 0.0
+        if max_abs_z > drift_threshold:
+            reason = f"drift: |z| maks {max_abs_z:.2f} > {drift_threshold}"
+
+    if reason is not None:
+        refitted = _refit(compact, y, callback=check_cancel)
+        check_cancel()
+        save_model(refitted, store.model_path(name))
+        report = UpdateReport(name, REFIT, n_new, reason, max_abs_z, time.perf_counter() - started)
+    else:
+        check_cancel()
+        save_model(extended, store.model_path(name))
+        report = UpdateReport(name, EXTENDED, n_new, "periode baru diperpanjang ke filter", max_abs_z,
+                              time.perf_counter() - started)
+        if compare_refit:
+            report.refit_max_rel_diff, report.refit_mean_rel_diff = _relative_diff(extended, _refit(compact, y))
+    return report
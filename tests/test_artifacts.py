@@ -0,0 +1,179 @@
+"""Uji artefak model ringkas dan update inkremental terhadap statsmodels sebagai acuan."""
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("statsmodels")
+
+from revflux.artifacts import (ArtifactError, CompactForecaster, _checksum, as_compact, history_checksum,  # noqa: E402
+                               load_compact)
+from revflux.jobs import TrainingCancelled  # noqa: E402
+from revflux.modeling import fit_sarimax, forecast_frame, load_model, save_model  # noqa: E402
+from revflux.storage import DatasetStore  # noqa: E402
+from revflux.updating import EXTENDED, REFIT, refit_reason, update_model  # noqa: E402
+
+N_FIT = 48
+N_TOTAL = 60
+STEPS = 24
+
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(0)
+    t = np.arange(N_TOTAL)
+    return 1e8 * (1 + 0.01 * t) * (1 + 0.2 * np.sin(2 * np.pi * t / 12)) * rng.lognormal(0, 0.03, N_TOTAL)
+
+
+@pytest.fixture(scope="module")
+def results(series):
+    return fit_sarimax(series[:N_FIT])
+
+
+def assert_forecasts_match(actual, expected):
+    for column in ("Pemasukan", "Batas Bawah", "Batas Atas"):
+        np.testing.assert_allclose(actual[column], expected[column], rtol=1e-8)
+
+
+def rewrite(path, header, arrays):
+    np.savez(path, header=np.array(json.dumps(header)), **arrays)
+
+
+def read(path):
+    with np.load(path) as data:
+        return json.loads(str(data["header"])), {name: data[name] for name in data.files if name != "header"}
+
+
+def test_compact_forecast_matches_statsmodels(results, tmp_path):
+    path = tmp_path / "model.npz"
+    save_model(results, path)
+
+    assert_forecasts_match(forecast_frame(load_model(path), STEPS), forecast_frame(results, STEPS))
+
+
+def test_tampered_array_is_rejected(results, tmp_path):
+    path = tmp_path / "model.npz"
+    save_model(results, path)
+    header, arrays = read(path)
+    arrays["state"] = arrays["state"] + 1.0
+    rewrite(path, header, arrays)
+
+    with pytest.raises(ArtifactError):
+        load_compact(path)
+
+
+def test_unknown_version_is_rejected(results, tmp_path):
+    path = tmp_path / "model.npz"
+    save_model(results, path)
+    header, arrays = read(path)
+    header["format_version"] = 99
+    header["checksum"] = _checksum(header, arrays)
+    rewrite(path, header, arrays)
+
+    with pytest.raises(ArtifactError):
+        load_compact(path)
+
+
+def test_truncated_file_is_rejected(results, tmp_path):
+    path = tmp_path / "model.npz"
+    save_model(results, path)
+    path.write_bytes(path.read_bytes()[:200])
+
+    with pytest.raises(ArtifactError):
+        load_model(path)
+
+
+def test_extend_matches_statsmodels_append(results, series):
+    y_new = series[N_FIT:]
+    extended, z = as_compact(results).extend(y_new)
+    appended = results.append(np.log1p(y_new), refit=False)
+
+    assert extended.nobs == N_TOTAL
+    assert extended.header["updates_since_fit"] == 1
+    assert_forecasts_match(forecast_frame(extended, STEPS), forecast_frame(appended, STEPS))
+    np.testing.assert_allclose(z, appended.filter_results.standardized_forecasts_error[0, N_FIT:], rtol=1e-8)
+
+
+def test_extend_in_steps_survives_save_and_load(results, series, tmp_path):
+    # Filter konvergen ke steady state di tengah periode baru; status itu harus ikut tersimpan
+    path = tmp_path / "model.npz"
+    save_model(as_compact(results).extend(series[N_FIT:N_FIT + 9])[0], path)
+    extended, _ = load_model(path).extend(series[N_FIT + 9:])
+    appended = results.append(np.log1p(series[N_FIT:]), refit=False)
+
+    assert appended.filter_results.converged
+    assert extended.converged is not None
+    assert_forecasts_match(forecast_frame(extended, STEPS), forecast_frame(appended, STEPS))
+
+
+def test_converged_results_round_trip(results, series, tmp_path):
+    appended = results.append(np.log1p(series[N_FIT:N_TOTAL - 1]), refit=False)
+    path = tmp_path / "model.npz"
+    save_model(appended, path)
+
+    assert_forecasts_match(forecast_frame(load_model(path), STEPS), forecast_frame(appended, STEPS))
+    extended, _ = load_model(path).extend(series[N_TOTAL - 1:])
+    assert_forecasts_match(forecast_frame(extended, STEPS),
+                           forecast_frame(appended.append(np.log1p(series[N_TOTAL - 1:]), refit=False), STEPS))
+
+
+def test_refit_reason_accepts_unchanged_history(results, series):
+    assert refit_reason(as_compact(results), series) is None
+
+
+def test_refit_reason_detects_changed_history(results, series):
+    changed = series.copy()
+    changed[3] *= 2
+
+    assert "riwayat" in refit_reason(as_compact(results), changed)
+    assert "riwayat" in refit_reason(as_compact(results), series[:N_FIT - 1])
+
+
+def test_refit_reason_schedule(results, series):
+    compact = as_compact(results)
+    history = history_checksum(np.log1p(series[:N_FIT + 1]))
+    extended, _ = compact.extend(series[N_FIT:N_FIT + 1], history_sha256=history)
+
+    assert refit_reason(extended, series, max_updates=2) is None
+    assert refit_reason(extended, series, max_updates=1).startswith("jadwal")
+
+    header = dict(compact.header, fitted_at=(datetime.now(timezone.utc) - timedelta(days=400)).isoformat())
+    stale = CompactForecaster(header, compact.arrays)
+    assert refit_reason(stale, series, refit_after_days=365).startswith("jadwal")
+
+
+@pytest.fixture
+def store_with_model(tmp_path, results, series):
+    store = DatasetStore(tmp_path)
+    periods = pd.date_range("2019-01-01", periods=N_TOTAL, freq="MS")
+    store.save("toko", pd.DataFrame({"Periode": periods[:N_FIT], "Pemasukan": series[:N_FIT]}))
+    save_model(results, store.model_path("toko"))
+    store.upsert("toko", pd.DataFrame({"Periode": periods[N_FIT:], "Pemasukan": series[N_FIT:]}))
+    return store
+
+
+def test_update_extends_below_drift_threshold(store_with_model):
+    report = update_model(store_with_model, "toko", drift_threshold=np.inf)
+
+    assert (report.mode, report.n_new) == (EXTENDED, N_TOTAL - N_FIT)
+    assert load_model(store_with_model.model_path("toko")).nobs == N_TOTAL
+
+
+def test_update_refits_above_drift_threshold(store_with_model):
+    report = update_model(store_with_model, "toko", drift_threshold=0.0)
+
+    assert report.mode == REFIT
+    assert report.reason.startswith("drift")
+    assert load_model(store_with_model.model_path("toko")).header["updates_since_fit"] == 0
+
+
+@pytest.mark.parametrize("drift_threshold", [np.inf, 0.0])
+def test_cancelled_update_keeps_previous_model(store_with_model, drift_threshold):
+    before = store_with_model.model_path("toko").read_bytes()
+
+    with pytest.raises(TrainingCancelled):
+        update_model(store_with_model, "toko", drift_threshold=drift_threshold, should_cancel=lambda: True)
+
+    assert store_with_model.model_path("toko").read_bytes() == before
@@ -0,0 +1,152 @@
+"""Uji ingest streaming: parsing periode, reduksi per potongan, dan pengisian periode kosong."""
+import io
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from revflux.batch import prepare_long_table
+from revflux.ingest import LATEST, SUM, reduce_chunks, stream_upload
+from revflux.instrumentation import stage, start_trace
+from revflux.preprocessing import MONTHLY, WEEKLY
+
+
+def csv_buffer(text, name="upload.csv"):
+    buffer = io.BytesIO(text.encode())
+    buffer.name = name
+    return buffer
+
+
+def periods(df):
+    return df["Periode"].dt.strftime("%Y-%m-%d").tolist()
+
+
+def test_sum_fills_weeks_without_transactions():
+    daily = pd.DataFrame({"Periode": ["2024-01-01", "2024-01-03", "2024-01-09", "2024-01-30"],
+                          "Pemasukan": [1, 2, 3, 4]})
+
+    data = reduce_chunks([daily], WEEKLY, SUM).data
+
+    assert periods(data) == ["2024-01-01", "2024-01-08", "2024-01-15", "2024-01-22", "2024-01-29"]
+    assert data["Pemasukan"].tolist() == [3, 3, 0, 0, 4]
+
+
+def test_latest_keeps_only_present_periods():
+    monthly = pd.DataFrame({"Periode": ["2024-01-01", "2024-03-01"], "Pemasukan": [1, 3]})
+
+    data = reduce_chunks([monthly], MONTHLY, LATEST).data
+
+    assert periods(data) == ["2024-01-01", "2024-03-01"]
+
+
+def test_prepare_long_table_sums_and_fills_per_series():
+    table = pd.DataFrame({"toko": ["a", "a", "a", "b", "b"],
+                          "Periode": ["2024-01-05", "2024-01-20", "2024-03-02", "2024-02-01", "2024-02-28"],
+                          "Pemasukan": [1, 2, 5, 7, 8]})
+
+    result = prepare_long_table(table, key="toko", freq=MONTHLY, combine=SUM)
+
+    assert result["toko"].tolist() == ["a", "a", "a", "b"]
+    assert periods(result) == ["2024-01-01", "2024-02-01", "2024-03-01", "2024-02-01"]
+    assert result["Pemasukan"].tolist() == [3, 0, 5, 15]
+
+
+def test_prepare_long_table_latest_is_last_write_wins():
+    table = pd.DataFrame({"series": ["a", "a"], "Periode": ["2024-01-05", "2024-01-20"], "Pemasukan": [1, 2]})
+
+    result = prepare_long_table(table)
+
+    assert result["Pemasukan"].tolist() == [2]
+
+
+def test_stream_upload_weekly_sum_from_csv():
+    upload = stream_upload(csv_buffer("Periode,Pemasukan\n2024-01-02,5\n2024-01-17,6\n"), WEEKLY, SUM, chunksize=1)
+
+    assert periods(upload.data) == ["2024-01-01", "2024-01-08", "2024-01-15"]
+    assert upload.data["Pemasukan"].tolist() == [5, 0, 6]
+
+
+def test_track_memory_measures_peak():
+    upload = stream_upload(csv_buffer("Periode,Pemasukan\n2024-01-01,5\n"), track_memory=True)
+
+    assert upload.peak_memory > 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_track_memory_leaves_trace_allocations_alone():
+    trace = start_trace("uji", track_allocations=True)
+    try:
+        with stage("luar"):
+            upload = stream_upload(csv_buffer("Periode,Pemasukan\n2024-01-01,5\n"), track_memory=True)
+            assert tracemalloc.is_tracing()
+    finally:
+        trace.finish()
+
+    assert upload.peak_memory is None
+    assert trace.stages["luar"].alloc_peak is not None
+    assert not tracemalloc.is_tracing()
+
+
+SPLIT_CSV = "Periode,Pemasukan\n2024-01-05,1\n2024-02-05,2\n2024-01-20,3\n2024-01-25,4\n"
+
+
+def test_period_split_across_chunks_latest():
+    upload = stream_upload(csv_buffer(SPLIT_CSV), MONTHLY, LATEST, chunksize=2)
+
+    assert upload.chunks == 2
+    assert periods(upload.data) == ["2024-01-01", "2024-02-01"]
+    assert upload.data["Pemasukan"].tolist() == [4, 2]
+
+
+def test_period_split_across_chunks_sum():
+    upload = stream_upload(csv_buffer(SPLIT_CSV), MONTHLY, SUM, chunksize=2)
+
+    assert upload.chunks == 2
+    assert upload.data["Pemasukan"].tolist() == [8, 2]
+    assert upload.period_formats == {"%Y-%m-%d": 4}
+
+
+def test_csv_counts_dropped_rows_and_ignores_other_columns():
+    text = "Toko,Periode,Catatan,Pemasukan\na,2024-01-05,x,1\na,bukan,y,2\na,2024-02-05,z,abc\n"
+
+    upload = stream_upload(csv_buffer(text), chunksize=2)
+
+    assert list(upload.data.columns) == ["Periode", "Pemasukan"]
+    assert (upload.rows_read, upload.rows_kept, upload.rows_dropped) == (3, 1, 2)
+
+
+def test_xlsx_with_extra_columns(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = tmp_path / "upload.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Toko", "Pemasukan", "Catatan", "Periode"])
+    sheet.append(["a", 10, "x", datetime(2024, 1, 5)])
+    sheet.append(["a", 20, "y", "2024-01-20"])
+    sheet.append(["a", 5, None, datetime(2024, 2, 1)])
+    sheet.append(["a"])  # baris tanpa Periode/Pemasukan: terbaca lalu dibuang
+    workbook.save(path)
+
+    upload = stream_upload(str(path), MONTHLY, SUM, chunksize=2)
+
+    assert (upload.rows_read, upload.rows_dropped) == (4, 1)
+    assert periods(upload.data) == ["2024-01-01", "2024-02-01"]
+    assert upload.data["Pemasukan"].tolist() == [30, 5]
+
+
+def test_missing_amount_column_raises_for_csv():
+    with pytest.raises(ValueError, match="Pemasukan"):
+        stream_upload(csv_buffer("Periode,Total\n2024-01-05,1\n"))
+
+
+def test_missing_amount_column_raises_for_xlsx(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = tmp_path / "upload.xlsx"
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["Periode", "Total"])
+    workbook.active.append([datetime(2024, 1, 5), 1])
+    workbook.save(path)
+
+    with pytest.raises(ValueError, match="Pemasukan"):
+        stream_upload(str(path))
@@ -0,0 +1,64 @@
+"""Uji parsing kolom 'Periode': deteksi format, baris tak terbaca, dan datetime ber-zona waktu."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from revflux.preprocessing import (MIXED_FORMAT, UNPARSED, WEEKLY, detect_period_formats, parse_periods,
+                                   preprocess_period_column)
+
+
+def dates(series):
+    return [None if pd.isna(v) else v.strftime("%Y-%m-%d") for v in series]
+
+
+def test_detect_period_formats_orders_by_hits():
+    values = ["2024-01-15", "2024-02-15", "2024-03", "15/04/2024"]
+
+    assert detect_period_formats(values) == ["%Y-%m-%d", "%Y-%m", "%d/%m/%Y"]
+
+
+def test_mixed_formats_are_counted_per_format():
+    values = ["2024-01-15", "2024-02-03", "2024-03", "15/04/2024", "2024-01-15", "Mei 2024x"]
+
+    parsed, counts = parse_periods(values)
+
+    assert dates(parsed) == ["2024-01-01", "2024-02-01", "2024-03-01", "2024-04-01", "2024-01-01", None]
+    assert counts == {"%Y-%m-%d": 3, "%Y-%m": 1, "%d/%m/%Y": 1, UNPARSED: 1}
+
+
+def test_fallback_parser_is_reported_as_mixed():
+    parsed, counts = parse_periods(["2024-01-15", "January 5, 2024"])
+
+    assert dates(parsed) == ["2024-01-01", "2024-01-01"]
+    assert counts == {"%Y-%m-%d": 1, MIXED_FORMAT: 1}
+
+
+def test_nan_and_unparseable_rows_are_dropped():
+    df = pd.DataFrame({"Periode": ["2024-01-10", None, "bukan tanggal", "2024-02-10", "2024-03-10"],
+                       "Pemasukan": [1, 2, 3, "abc", np.nan]})
+
+    result = preprocess_period_column(df)
+
+    assert dates(result["Periode"]) == ["2024-01-01"]
+    assert result["Pemasukan"].tolist() == [1]
+    assert result.attrs["period_formats"] == {"%Y-%m-%d": 3, UNPARSED: 2}
+
+
+def test_tz_aware_datetimes_keep_local_date():
+    values = pd.Series(pd.to_datetime(["2024-01-31 23:30", "2024-02-01 00:30", None]).tz_localize("Asia/Jakarta"))
+
+    parsed, counts = parse_periods(values)
+
+    assert dates(parsed) == ["2024-01-01", "2024-02-01", None]
+    assert counts == {"datetime64": 2, UNPARSED: 1}
+
+
+def test_weekly_periods_start_on_monday():
+    parsed, _ = parse_periods(["2024-01-07", "2024-01-08", "2024-01-14"], WEEKLY)
+
+    assert dates(parsed) == ["2024-01-01", "2024-01-08", "2024-01-08"]
+
+
+def test_missing_period_column_raises():
+    with pytest.raises(ValueError):
+        preprocess_period_column(pd.DataFrame({"Tanggal": ["2024-01-01"], "Pemasukan": [1]}))
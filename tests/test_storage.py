@@ -0,0 +1,170 @@
+"""Uji DatasetStore: upsert/akumulasi, versi data, pemangkasan snapshot, dan rollback."""
+import os
+
+import pandas as pd
+import pytest
+
+from revflux.preprocessing import MONTHLY
+from revflux.storage import DatasetStore
+
+
+def frame(periods, values):
+    return pd.DataFrame({"Periode": pd.to_datetime(periods), "Pemasukan": [float(v) for v in values]})
+
+
+def write_model(store, name, content):
+    """Tulis model seperti `save_model`: file sementara + `os.replace`, bukan menimpa hardlink snapshot."""
+    tmp_path = store.model_path(name).with_suffix(".tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, store.model_path(name))
+
+
+def values(store, name):
+    df = store.load(name)
+    return dict(zip(df["Periode"].dt.strftime("%Y-%m-%d"), df["Pemasukan"]))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DatasetStore(tmp_path)
+    store.save("toko", frame(["2023-11-01", "2023-12-01", "2024-01-01"], [10, 20, 30]))
+    return store
+
+
+def test_upsert_replaces_existing_periods_and_adds_new(store):
+    result = store.upsert("toko", frame(["2024-01-01", "2024-02-01"], [35, 40]))
+
+    assert (result.inserted, result.updated, result.partitions_written) == (1, 1, 1)
+    assert values(store, "toko") == {"2023-11-01": 10, "2023-12-01": 20, "2024-01-01": 35, "2024-02-01": 40}
+
+
+def test_upsert_accumulate_adds_to_existing_values(store):
+    result = store.upsert("toko", frame(["2023-12-01", "2024-01-01", "2024-02-01"], [5, 5, 7]), accumulate=True)
+
+    assert (result.inserted, result.updated, result.partitions_written) == (1, 2, 2)
+    assert values(store, "toko") == {"2023-11-01": 10, "2023-12-01": 25, "2024-01-01": 35, "2024-02-01": 7}
+
+
+def test_upsert_writes_only_touched_years(store):
+    before = store.data_path("toko")
+    store.upsert("toko", frame(["2024-01-01"], [31]))
+    after = store.data_path("toko")
+
+    assert after != before
+    assert (after / "2023.feather").stat().st_ino == (before / "2023.feather").stat().st_ino
+
+
+def test_noop_upsert_creates_no_version_or_snapshot(store):
+    version, snapshots = store.version("toko"), store.snapshots("toko")
+
+    result = store.upsert("toko", frame(["2023-12-01", "2024-01-01"], [20, 30]))
+
+    assert (result.inserted, result.updated, result.partitions_written) == (0, 0, 0)
+    assert store.version("toko") == version
+    assert store.snapshots("toko") == snapshots
+
+
+def test_empty_upload_is_rejected_before_registering(tmp_path):
+    store = DatasetStore(tmp_path)
+
+    with pytest.raises(ValueError):
+        store.upsert("kosong", frame([], []))
+    with pytest.raises(ValueError):
+        store.save("kosong", frame([], []))
+
+    assert store.registry.get("kosong") is None
+
+
+def test_empty_upload_keeps_existing_version(store):
+    version = store.version("toko")
+
+    with pytest.raises(ValueError):
+        store.upsert("toko", frame([], []))
+
+    assert store.version("toko") == version
+
+
+def test_versions_increase_and_snapshot_previous_version(store):
+    _, first = store.version("toko")
+    store.upsert("toko", frame(["2024-02-01"], [40]))
+    _, second = store.version("toko")
+
+    assert second > first
+    assert [s["data_version"] for s in store.snapshots("toko")] == [first]
+
+
+def test_prune_keeps_newest_snapshots_and_drops_unreferenced_versions(store):
+    versions = [store.version("toko")[1]]
+    for month in range(2, 7):
+        store.upsert("toko", frame([f"2024-{month:02d}-01"], [month]))
+        versions.append(store.version("toko")[1])
+    snapshots = store.snapshots("toko")
+    assert [s["data_version"] for s in snapshots] == versions[-2::-1]
+
+    store.prune("toko", keep=2)
+
+    assert store.snapshots("toko") == snapshots[:2]
+    remaining = sorted(int(p.name[1:]) for p in (store.dataset_dir("toko") / "data").glob("v*"))
+    assert remaining == sorted(versions[-3:])
+
+
+def test_rollback_round_trip(store):
+    original = values(store, "toko")
+    store.upsert("toko", frame(["2024-01-01"], [99]))
+    changed = values(store, "toko")
+
+    assert store.rollback("toko")
+    assert values(store, "toko") == original
+
+    # rollback juga di-snapshot, jadi bisa dibatalkan dengan rollback berikutnya
+    assert store.rollback("toko")
+    assert values(store, "toko") == changed
+
+
+def test_rollback_restores_model_file(store):
+    write_model(store, "toko", b"model lama")
+    store.upsert("toko", frame(["2024-02-01"], [40]))
+    write_model(store, "toko", b"model baru")
+
+    assert store.rollback("toko")
+    assert store.model_path("toko").read_bytes() == b"model lama"
+
+
+def test_reset_then_rollback_restores_data(store):
+    original = values(store, "toko")
+
+    store.reset("toko")
+    assert not store.exists("toko")
+
+    assert store.rollback("toko")
+    assert values(store, "toko") == original
+
+
+def test_rollback_without_snapshot_returns_false(tmp_path):
+    assert DatasetStore(tmp_path).rollback("tidak_ada") is False
+
+
+@pytest.mark.parametrize("name", ["", ".", "..", "a/b", "a\\b", "a\0b"])
+def test_unsafe_dataset_names_are_rejected(tmp_path, name):
+    store = DatasetStore(tmp_path)
+
+    with pytest.raises(ValueError):
+        store.upsert(name, frame(["2024-01-01"], [1]))
+    with pytest.raises(ValueError):
+        store.set_frequency(name, MONTHLY)
+
+    assert store.known_datasets() == []
+
+
+def test_delete_never_leaves_datasets_dir(store, tmp_path):
+    (tmp_path / "important.txt").write_text("jangan dihapus")
+    # baris registry lama dengan nama tidak valid, dibuat langsung lewat SQL
+    with store.registry.transaction() as conn:
+        conn.execute("INSERT INTO datasets (name, frequency, data_version, created_at, updated_at) "
+                     "VALUES ('..', 'M', 1, '', '')")
+
+    store.delete_all()
+
+    assert (tmp_path / "important.txt").exists()
+    assert (tmp_path / "registry.sqlite3").exists()
+    assert store.known_datasets() == []